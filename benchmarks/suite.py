@@ -0,0 +1,294 @@
+"""
+Benchmark suite for the numeric algorithms, parsers and formatters of the project.
+
+The suite times `utility.algorithm.lagrange()`, `utility.algorithm.neville()`,
+`utility.algorithm.neville_many()` (sweeping `SWEEP_POINTS` new points), `utility.algorithm.lagrange_coefficients()`, the parsers of `utility.parsers` and the formatters
+`utility.parsers.sci_str()` and `utility.parsers.prettify()`, and the float64 interval kernels of
+`utility.floatinterval` (``float_interval_all``), across node counts, arithmetic modes and
+working precisions. It never imports tkinter, so it runs headless.
+
+Usage::
+
+    python -m benchmarks.suite run -o results.json
+    python -m benchmarks.suite run --nodes 10 100 1000 5000 --modes real interval --precisions 64 256
+    python -m benchmarks.suite compare baseline.json results.json --threshold 0.2
+
+``compare`` prints the ratio of every benchmark present in both files and exits with code 1 if any
+of them got slower than the threshold allows.
+
+Functions
+---------
+
+    - ``make_dataset(nodes, mode)``
+        Builds the input strings of a deterministic dataset
+    - ``run_suite(nodes, modes, precisions, names, budget)``
+        Runs the benchmarks and returns their results
+    - ``compare(baseline, current, threshold)``
+        Compares two result sets and returns the regressions
+    - ``main(argv)``
+        Command line entry point
+"""
+
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+
+import mpmath
+
+from gui.arithmeticmodes import parser_modes_map
+from utility import algorithm, fastreal, floatinterval, parsers, precision
+
+
+DEFAULT_NODES = (10, 100, 1000)
+DEFAULT_MODES = ('real', 'interval', 'singleton')
+DEFAULT_PRECISIONS = (64, 256)
+
+# Benchmarks whose cost grows quadratically or worse, skipped above this many nodes unless asked for
+QUADRATIC_LIMIT = 1000
+
+# Number of new points of the neville_many benchmark
+SWEEP_POINTS = 100
+
+
+def make_dataset(nodes: int, mode: str) -> tuple:
+    """
+    Build the X, Y and Z input strings of a deterministic dataset in the format of the given mode.
+
+    The nodes are Chebyshev points on [-1, 1], which keeps the interpolation well-conditioned for
+    large node counts, the values are samples of ``exp(x) * sin(3x)``.
+
+    :return: Tuple of the X, Y and Z strings
+    """
+
+    xs = [math.cos(math.pi * (2 * i + 1) / (2 * nodes)) for i in range(nodes)]
+    ys = [math.exp(x) * math.sin(3 * x) for x in xs]
+    z = 0.123456789
+
+    if mode == 'interval':
+        def fmt(value):
+            return f'[{value!r};{value + 1e-12!r}]'
+    else:
+        fmt = repr
+
+    return (
+        ', '.join(fmt(x) for x in xs),
+        ', '.join(fmt(y) for y in ys),
+        fmt(z)
+    )
+
+
+def _time(func, budget: float) -> tuple:
+    """
+    Returns the best time of repeated calls of ``func`` and the number of calls, repeating the call
+    while the total time stays within ``budget`` seconds (at most 50 times, at least once).
+    """
+    best = math.inf
+    total = 0.0
+    repeats = 0
+    while repeats == 0 or (total < budget and repeats < 50):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        repeats += 1
+    return best, repeats
+
+
+def _cases(mode: str, texts: tuple) -> dict:
+    """
+    Returns the benchmarked callables of one dataset, keyed on their names.
+    """
+    parser = parser_modes_map[mode]
+    data_x, data_y, data_z = (parser(text) for text in texts)
+
+    if mode == 'fast_real':
+        return {
+            'lagrange': lambda: fastreal.lagrange(data_x, data_y, data_z),
+            'neville': lambda: fastreal.neville(data_x, data_y, data_z),
+            'lagrange_coefficients': lambda: fastreal.lagrange_coefficients(data_x, data_y),
+            'interpolate_all': lambda: fastreal.interpolate_all(data_x, data_y, data_z),
+            'parse': lambda: parser(texts[0]),
+            'prettify': lambda: parsers.prettify(data_x.tolist()),
+        }
+
+    # New points between the nodes
+    sweep = [(a + b) / 2 for a, b in zip(data_x, data_x[1:])][:SWEEP_POINTS]
+
+    cases = {
+        'lagrange': lambda: algorithm.lagrange(data_x, data_y, data_z),
+        'neville': lambda: algorithm.neville(data_x, data_y, data_z),
+        'neville_many': lambda: algorithm.neville_many(data_x, data_y, sweep),
+        'lagrange_coefficients': lambda: algorithm.lagrange_coefficients(data_x, data_y),
+        'interpolate_all': lambda: algorithm.interpolate_all(data_x, data_y, data_z),
+        'parse': lambda: parser(texts[0]),
+        'prettify': lambda: parsers.prettify(data_x),
+    }
+    if mode == 'real':
+        cases['sci_str'] = lambda: [parsers.sci_str(x) for x in data_x]
+    else:
+        cases['float_interval_all'] = lambda: floatinterval.interpolate_all(data_x, data_y, data_z)
+    return cases
+
+
+QUADRATIC_CASES = ('lagrange', 'neville', 'neville_many', 'lagrange_coefficients', 'interpolate_all',
+                   'float_interval_all')
+
+
+def run_suite(nodes=DEFAULT_NODES,
+              modes=DEFAULT_MODES,
+              precisions=DEFAULT_PRECISIONS,
+              names=None,
+              budget: float = 1.0,
+              quadratic_limit: int = QUADRATIC_LIMIT,
+              log=None) -> dict:
+    """
+    Run the benchmarks for every combination of node count, mode and precision.
+
+    :param nodes: Node counts
+    :param modes: Arithmetic mode names
+    :param precisions: Working precisions, in bits (ignored by the 'fast_real' mode)
+    :param names: Names of the benchmarks to run, all of them if not given
+    :param budget: Time spent repeating a single benchmark, in seconds
+    :param quadratic_limit: Node count above which the O(n^2) and slower algorithms are skipped
+    :param log: Optional writable text stream for progress messages
+    :return: Dictionary with the keys ``'meta'`` and ``'results'``
+    """
+
+    results = []
+    for mode in modes:
+        for bits in ((None,) if mode == 'fast_real' else precisions):
+            for count in nodes:
+                with precision.working_precision(bits or precision.DEFAULT_PRECISION):
+                    cases = _cases(mode, make_dataset(count, mode))
+                    for name, func in cases.items():
+                        if names and name not in names:
+                            continue
+                        if name in QUADRATIC_CASES and count > quadratic_limit:
+                            continue
+                        seconds, repeats = _time(func, budget)
+                        results.append({
+                            'name': name,
+                            'mode': mode,
+                            'nodes': count,
+                            'precision': bits,
+                            'seconds': seconds,
+                            'repeats': repeats,
+                        })
+                        if log is not None:
+                            log.write(f'{name:<22} {mode:<10} n={count:<6} prec={bits!s:<5} '
+                                      f'{seconds:.6f}s ({repeats}x)\n')
+                            log.flush()
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'mpmath': mpmath.__version__,
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def _key(result: dict) -> tuple:
+    return result['name'], result['mode'], result['nodes'], result['precision']
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2) -> list:
+    """
+    Compare the results of two runs.
+
+    :param baseline: Results of the reference run
+    :param current: Results of the new run
+    :param threshold: Allowed relative slowdown, 0.2 flags everything more than 20% slower
+    :return: List of ``(key, baseline_seconds, current_seconds, ratio, regressed)`` tuples
+        for every benchmark present in both runs
+    """
+
+    reference = {_key(result): result['seconds'] for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        key = _key(result)
+        if key not in reference:
+            continue
+        ratio = result['seconds'] / reference[key] if reference[key] > 0 else math.inf
+        rows.append((key, reference[key], result['seconds'], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.suite',
+        description='Benchmark the algorithms, parsers and formatters.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='run the benchmarks and save the results as JSON')
+    run_parser.add_argument('-o', '--output', default='-', help='output JSON file, standard output by default')
+    run_parser.add_argument('--nodes', type=int, nargs='+', default=list(DEFAULT_NODES))
+    run_parser.add_argument('--modes', nargs='+', default=list(DEFAULT_MODES),
+                            choices=sorted(parser_modes_map))
+    run_parser.add_argument('--precisions', type=int, nargs='+', default=list(DEFAULT_PRECISIONS))
+    run_parser.add_argument('--only', nargs='+', default=None, help='names of the benchmarks to run')
+    run_parser.add_argument('--budget', type=float, default=1.0,
+                            help='seconds spent repeating a single benchmark')
+    run_parser.add_argument('--quadratic-limit', type=int, default=QUADRATIC_LIMIT,
+                            help='largest node count for the O(n^2) and slower algorithms')
+
+    compare_parser = subparsers.add_parser('compare', help='flag regressions against a baseline')
+    compare_parser.add_argument('baseline', help='JSON results of the reference run')
+    compare_parser.add_argument('current', help='JSON results of the new run')
+    compare_parser.add_argument('--threshold', type=float, default=0.2,
+                                help='allowed relative slowdown, 0.2 by default')
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Command line entry point of the benchmark suite.
+
+    :return: Exit code, 1 if ``compare`` found any regression
+    """
+
+    args = build_argument_parser().parse_args(argv)
+
+    if args.command == 'run':
+        results = run_suite(
+            nodes=args.nodes,
+            modes=args.modes,
+            precisions=args.precisions,
+            names=args.only,
+            budget=args.budget,
+            quadratic_limit=args.quadratic_limit,
+            log=sys.stderr
+        )
+        text = json.dumps(results, indent=2)
+        if args.output == '-':
+            print(text)
+        else:
+            with open(args.output, 'w') as file:
+                file.write(text + '\n')
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+
+    rows = compare(baseline, current, args.threshold)
+    for (name, mode, nodes, bits), before, after, ratio, regressed in rows:
+        flag = 'REGRESSION' if regressed else ''
+        print(f'{name:<22} {mode:<10} n={nodes:<6} prec={bits!s:<5} '
+              f'{before:.6f}s -> {after:.6f}s  x{ratio:.2f} {flag}')
+    regressions = sum(row[-1] for row in rows)
+    print(f'{len(rows)} benchmarks compared, {regressions} regressions.')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
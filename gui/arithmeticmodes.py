@@ -3,8 +3,13 @@ Configuration maps for input parsing and placeholders.
 
 This module holds constants used to configure `gui.core.App`'s
 entry fields' parsers, placeholders and filter masks for all three
-arithmetic modes.
+arithmetic modes, as well as the opt-in NumPy float64 'fast_real' mode.
 
+``parser_modes_map`` is built on first access, so importing this module does not import the
+numeric stack (see `utility.startup`); ``MODES`` lists its keys.
+
+    - ``MODES``:
+        Names of the arithmetic modes
     - ``parser_modes_map``:
         Maps mode names to parsing functions
     - ``input_placeholder_text_map``:
@@ -13,29 +18,48 @@ arithmetic modes.
         Characters allowed inside input fields
     - ``input_new_point_placeholder_text_map``:
         Placeholder text for new point's input field
+    - ``node_order_options``, ``interval_backend_options``:
+        Choices of the node order and interval backend menus
 """
 
 
-from utility import parsers
+MODES: tuple = ('real', 'interval', 'singleton', 'fast_real')
+
+
+def __getattr__(name: str):
+    if name == 'parser_modes_map':
+        from utility import parsers, fastreal
+        global parser_modes_map
+        parser_modes_map = {
+            'real':         parsers.parse_real,
+            'interval':     parsers.parse_interval,
+            'singleton':    parsers.parse_singleton,
+            'fast_real':    fastreal.parse_fast_real
+        }
+        return parser_modes_map
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
-parser_modes_map: dict = {
-    'real':         parsers.parse_real,
-    'interval':     parsers.parse_interval,
-    'singleton':    parsers.parse_singleton
-}
 input_placeholder_text_map: dict = {
     'real':         '0,\n1,2, 3',
     'interval':     '[0;1],\n[2.34; 5], [6.7, 8]',
-    'singleton':    '0,\n1,2, 3'
+    'singleton':    '0,\n1,2, 3',
+    'fast_real':    '0,\n1,2, 3'
 }
 input_new_point_placeholder_text_map: dict = {
     'real':         '3.14159265359',
     'interval':     '[0;3.14159265359]',
-    'singleton':    '3.14159265359'
+    'singleton':    '3.14159265359',
+    'fast_real':    '3.14159265359'
 }
 input_allowed_chars_map: dict = {
     'real':         '-0.123,456;789 \n',
     'interval':     '-0.123,456;789[] \n',
-    'singleton':    '-0.123,456;789 \n'
+    'singleton':    '-0.123,456;789 \n',
+    'fast_real':    '-0.123,456;789 \n'
 }
+
+# Same as `utility.validation.NODE_ORDERS` and `utility.floatinterval.BACKENDS`, kept here so that neither
+# building the menus nor the batch mode's options imports the numeric stack
+node_order_options: tuple = ('input', 'sorted', 'leja')
+interval_backend_options: tuple = ('mpmath', 'float64')
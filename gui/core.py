@@ -3,6 +3,15 @@ Core application module for the GUI-based multiple-arithmetic interpolation proj
 
 This module defines the main App class that handles the GUI structure and properties, user input,
 arithmetic modes, and computation using interpolation algorithms. It also holds a utility function `make_focusable()`.
+The computations themselves are the jobs of `gui.jobs.Jobs`, which the App starts in its background workers.
+
+Datasets can be saved to and loaded from binary dataset files (`utility.datafile`), and their X and Y values
+can be imported from columns of CSV or NumPy files (`utility.columnfile`). A loaded dataset is shown
+as a read-only summary in the entry fields, and its values are used directly, without any parsing.
+
+The numeric stack (NumPy, ``mpmath`` and the `utility` modules built on them) is not imported with this module.
+The App refers to it through `utility.startup.LazyModule` proxies and preloads it in the background once its
+window is shown, see `App.display()`.
 
 Classes:
     App: Main project structure and event manager for inputs, computation and output.
@@ -12,11 +21,25 @@ Functions:
 """
 
 
+import os
 import tkinter as tk
+from tkinter import filedialog, simpledialog, ttk
+from gui import arithmeticmodes
+from gui.diagnostics import DiagnosticsWindow
 from gui.functional_gui import InputGUI
-from utility import algorithm
+from gui.jobs import Jobs
+from gui.outputview import OutputView, ResultRows
+from gui.plotview import PlotWindow
+from gui.worker import ComputationWorker
+from utility import startup
+from utility.startup import LazyModule
 from gui.arithmeticmodes import *
 
+columnfile = LazyModule('utility.columnfile')
+datafile = LazyModule('utility.datafile')
+instrumentation = LazyModule('utility.instrumentation')
+precision = LazyModule('utility.precision')
+
 
 def make_focusable(widget: tk.Widget) -> None:
     """
@@ -84,18 +107,20 @@ def allow_pasting_in(widget: InputGUI) -> None:
             allow_pasting_in().
 
             Pastes in (if possible) the contents of user's system clipboard,
-            and filters the data with the allowed_chars mask, if specified.
+            filtered with the widget's allowed_chars mask, see gui.functional_gui.InputGUI.paste().
         :param event: tk.Event
         :return: None
         """
         try:
             clipboard_content = widget.clipboard_get()
-            widget.input_field_entry.insert(tk.INSERT, clipboard_content)
-            widget.update_input_filter()
         except tk.TclError:
-            pass
+            return "break"
+        if str(widget.input_field_entry.cget('state')) == 'normal':
+            widget.paste(clipboard_content)
         return "break"
     widget.input_field_entry.bind("<Control-v>", pasting_func)
+    # Also covers the platform's other paste shortcuts, which would insert the clipboard unfiltered
+    widget.input_field_entry.bind("<<Paste>>", pasting_func)
 
 
 class App:
@@ -107,6 +132,9 @@ class App:
     manages writing outputs and handling user inputs such as button clicks and entry field interactions.
     """
 
+    # Time without edits after which the live recomputation starts, in milliseconds
+    LIVE_UPDATE_DELAY = 400
+
     def __init__(self, root_window: tk.Tk):
         """
         Initialize a core.App instance.
@@ -151,6 +179,82 @@ class App:
             value='singleton',
             command=self.update_mode
         )
+        self.mode_switch_D = tk.Radiobutton(
+            self.mode_switch_frame,
+            text='Fast Real Arithmetic (float64)',
+            variable=self.current_mode,
+            value='fast_real',
+            command=self.update_mode
+        )
+
+        self.adaptive_frame = tk.Frame(self.mode_switch_frame)
+        self.adaptive_precision = tk.BooleanVar(value=False)
+        self.adaptive_switch = tk.Checkbutton(
+            self.adaptive_frame,
+            text='Adaptive precision, tolerance:',
+            variable=self.adaptive_precision
+        )
+        self.adaptive_tolerance = tk.StringVar(value='1e-15')
+        self.adaptive_tolerance_entry = tk.Entry(
+            self.adaptive_frame,
+            textvariable=self.adaptive_tolerance,
+            width=8
+        )
+
+        self.live_mode = tk.BooleanVar(value=False)
+        self.live_switch = tk.Checkbutton(
+            self.mode_switch_frame,
+            text='Live recomputation',
+            variable=self.live_mode,
+            command=self.schedule_live_update
+        )
+
+        self.node_order_frame = tk.Frame(self.mode_switch_frame)
+        self.node_order_label = tk.Label(
+            self.node_order_frame,
+            text='Node order:'
+        )
+        self.node_order = tk.StringVar(value='input')
+        self.node_order_menu = tk.OptionMenu(
+            self.node_order_frame,
+            self.node_order,
+            *node_order_options,
+            command=lambda value: self.schedule_live_update()
+        )
+
+        self.interval_backend_frame = tk.Frame(self.mode_switch_frame)
+        self.interval_backend_label = tk.Label(
+            self.interval_backend_frame,
+            text='Interval endpoints:'
+        )
+        self.interval_backend = tk.StringVar(value='mpmath')
+        self.interval_backend_menu = tk.OptionMenu(
+            self.interval_backend_frame,
+            self.interval_backend,
+            *interval_backend_options,
+            command=lambda value: self.schedule_live_update()
+        )
+        self.tight_coefficients = tk.BooleanVar(value=False)
+        self.tight_coefficients_switch = tk.Checkbutton(
+            self.interval_backend_frame,
+            text='Tight coefficients',
+            variable=self.tight_coefficients,
+            command=self.schedule_live_update
+        )
+
+        self.processes_frame = tk.Frame(self.mode_switch_frame)
+        self.processes_label = tk.Label(
+            self.processes_frame,
+            text='Processes:'
+        )
+        self.processes = tk.StringVar(value='1')
+        self.processes_spinbox = tk.Spinbox(
+            self.processes_frame,
+            from_=1,
+            to=os.cpu_count() or 1,
+            textvariable=self.processes,
+            width=4
+        )
 
         self.input_frame = tk.Frame(self.mainframe)
         input_gui_x_y_width = 35
@@ -174,25 +278,122 @@ class App:
             command=self.calculate_button_func
         )
 
-        self.output_box = tk.Text(self.mainframe,
-                                  width=input_gui_x_y_width * 2 + 28,
-                                  height=10,
-                                  state='disabled')
+        self.cancel_button = tk.Button(
+            self.mode_switch_frame,
+            text='Cancel',
+            state='disabled',
+            command=self.cancel_button_func
+        )
+        self.progress_bar = ttk.Progressbar(
+            self.mode_switch_frame,
+            mode='determinate',
+            length=120,
+            maximum=100
+        )
+        self.progress_label = tk.Label(
+            self.mode_switch_frame,
+            text='',
+            font=('Courier', 8)
+        )
+        self.diagnostics_button = tk.Button(
+            self.mode_switch_frame,
+            text='Diagnostics',
+            command=self.diagnostics_button_func
+        )
+        self.plot_button = tk.Button(
+            self.mode_switch_frame,
+            text='Plot',
+            command=self.plot_button_func
+        )
+
+        self.file_frame = tk.Frame(self.mode_switch_frame)
+        self.load_button = tk.Button(
+            self.file_frame,
+            text='Load',
+            command=self.load_button_func
+        )
+        self.save_button = tk.Button(
+            self.file_frame,
+            text='Save',
+            command=self.save_button_func
+        )
+        self.import_button = tk.Button(
+            self.file_frame,
+            text='Import X/Y',
+            command=self.import_button_func
+        )
+        self.unload_button = tk.Button(
+            self.file_frame,
+            text='Unload',
+            state='disabled',
+            command=self.unload_dataset
+        )
+
+        # Only formats and renders the visible lines of large results
+        self.output_box = OutputView(self.mainframe,
+                                     width=input_gui_x_y_width * 2 + 28,
+                                     height=10)
 
         self.bottom_text = tk.Label(self.mainframe,
                                     text='Oto nowa ma wytyczna, analiza numeryczna!',
                                     font=('Courier', 8),
                                     fg='gray80')
 
-        # self.parser = lambda s: None
+        # Background computation, keeps the window responsive
+        self.worker = ComputationWorker(
+            self.root,
+            on_output=self.append_output,
+            on_progress=self.on_worker_progress,
+            on_finish=self.on_worker_finish
+        )
+
+        # Generators run by the workers, and the parsed fields, loaded values and fitted interpolants they share
+        self.jobs = Jobs()
+
+        # Live recomputation: fits interpolants into the cache in the background while the new points
+        # are not valid yet, and reuses the parsed values of the fields that have not changed
+        self.prefit_worker = ComputationWorker(
+            self.root,
+            on_finish=self.on_prefit_finish
+        )
+        self._live_after = None
+        self._live_pending = False
+        self._prefit_key = None
+
+        # Stage timings of the last computation, shown in the diagnostics window
+        self.last_profiler = None
+        self.diagnostics_window = None
+        self.count_operations = tk.BooleanVar(value=False)
+        self.track_allocations = tk.BooleanVar(value=False)
+
+        # Dense-grid plot of the current dataset's polynomial
+        self.plot_window = None
+
+        # Dataset loaded from a dataset file, and the summary text and values shown in every field it fills
+        self.loaded_dataset = None
+        self.file_worker = ComputationWorker(
+            self.root,
+            on_output=self.on_file_output,
+            on_progress=self.on_worker_progress,
+            on_finish=self.on_file_finish
+        )
+
         self.update_mode()
 
 
+    @property
+    def parser(self):
+        """
+        Parsing function of the current arithmetic mode, see `gui.arithmeticmodes.parser_modes_map`.
+        """
+        return arithmeticmodes.parser_modes_map[self.current_mode.get()]
+
+
     def update_mode(self):
         """
         Update the arithmetic mode for the program's computations.
 
-        This method updates the parser and modifies the input placeholders,
+        This method switches the parser (see `App.parser`) and modifies the input placeholders,
         as well as allowed character masks for all relevant input fields (X, Y, Z)
         according to the currently selected mode.
 
@@ -200,10 +401,12 @@ class App:
         :return: None
         """
 
-        if self.current_mode.get() not in parser_modes_map.keys():
+        if self.current_mode.get() not in MODES:
             raise Exception(f'Incorrect mode key request: {self.current_mode.get()}')
 
-        self.parser = parser_modes_map[self.current_mode.get()]
+        # The values of a loaded dataset only exist in the mode of its file
+        if self.loaded_dataset is not None and self.loaded_dataset.mode != self.current_mode.get():
+            self.unload_dataset()
 
         # Input X
         self.input_gui_x.update_input_placeholder(
@@ -230,122 +433,411 @@ class App:
         )
 
 
-    def write_output(self, output: str):
+    def append_output(self, output: str | ResultRows):
+        """
+        Append the given string, or lazily formatted result rows, to the end of the output widget.
+
+        :param output: The string or `gui.outputview.ResultRows` to append
+        :return: None
         """
-        Overwrite all contents of the output text widget with the given string.
 
-        This method clears any existing text in `self.output_box` and inserts
-        the new content. The widget is temporarily set to editable and then
-        returned to the disabled state to prevent user interaction.
+        self.output_box.append(output)
+
+
+    def write_output(self, output: str | ResultRows):
+        """
+        Overwrite all contents of the output widget with the given string, or lazily formatted result rows.
 
-        :param output: The string to display in the output text widget
-        :type output: str
+        :param output: The string or `gui.outputview.ResultRows` to display in the output widget
         :return: None
         """
 
-        self.output_box.config(state='normal')
-        self.output_box.delete("1.0", "end")
-        self.output_box.insert("1.0", output)
-        self.output_box.config(state='disabled')
+        self.output_box.clear()
+        self.output_box.append(output)
 
 
     def calculate_button_func(self) -> None:
         """
-        Process input data from entry fields, perform interpolation algorithms, and display results.
+        Read the entry fields and start the computation in the background worker.
 
-        This method:
-            1. Retrieves values from X, Y and Z entry fields.
-            2. Validates that all fields are filled and correctly formatted.
-            3. Checks that X and Y lists have the same length and that X contains no duplicate values.
-            4. Performs Lagrange and Neville interpolations and calculates Lagrange polynomial coefficients.
-            5. Outputs the results using `self.write_output()`.
+        The contents of the X, Y and Z entry fields are read here, on the Tk main thread, and handed over to
+        `gui.jobs.Jobs.calculate_job()`, which runs in `self.worker`. Its outputs are appended to the output widget
+        as soon as each stage finishes. While the computation runs, the Calculate button is disabled and
+        the Cancel button enabled.
 
         :return: None
-        :raises Exception: If the input data cannot be parsed correctly.
-        :side effects: Updates the contents of the output text widget (`self.output_box`).
+        :side effects: Clears the output widget, updates the button states and the progress indicator.
         """
 
+        if self.worker.running:
+            return
+
         data_x = self.input_gui_x.input_field_entry.get("1.0", "end-1c")
         data_y = self.input_gui_y.input_field_entry.get("1.0", "end-1c")
         data_z = self.input_gui_z.input_field_entry.get("1.0", "end-1c")
 
-        # [Error] Empty field
-        if '' in (data_x, data_y, data_z):
-            output = 'Not all fields have been filled.'
-            self.write_output(output)
+        # [Error] Incorrect tolerance of the adaptive precision
+        tolerance = None
+        if self.adaptive_precision.get():
+            try:
+                tolerance = float(self.adaptive_tolerance.get())
+            except ValueError:
+                self.write_output('Incorrect adaptive precision tolerance:\n'
+                                  f'\'{self.adaptive_tolerance.get()}\'')
+                return
+
+        # [Error] Incorrect number of processes
+        try:
+            workers = int(self.processes.get())
+            if workers < 1:
+                raise ValueError
+        except ValueError:
+            self.write_output(f'Incorrect number of processes:\n\'{self.processes.get()}\'')
             return
 
-        # [Error] Incorrect format
-        data_x = parsers.safe_parse(
-            parser_func=self.parser,
-            data_str=data_x,
-            error_command=self.write_output,
-            error_message='Incorrect data format in field \'X values\':\n{}'
+        # The adaptive precision waits for the background fit to finish before changing the precision
+        if tolerance is not None and self.prefit_worker.running:
+            self.prefit_worker.cancel()
+
+        self.write_output('')
+        self.calculate_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
+        self.progress_label.config(text='')
+        self.progress_bar.config(value=0)
+
+        mode = self.current_mode.get()
+        parser = self.parser
+        node_order = self.node_order.get()
+        backend = self.interval_backend.get()
+        tight = self.tight_coefficients.get()
+        profiler = instrumentation.Profiler(
+            count_operations=self.count_operations.get(),
+            track_allocations=self.track_allocations.get()
         )
-
-        # [Error] Incorrect format
-        data_y = parsers.safe_parse(
-            parser_func=self.parser,
-            data_str=data_y,
-            error_command=self.write_output,
-            error_message='Incorrect data format in field \'Y values\':\n{}'
+        self.last_profiler = profiler
+        self.worker.start(
+            lambda progress: self.jobs.profiled_job(
+                profiler,
+                self.jobs.calculate_job(
+                    mode, parser, data_x, data_y, data_z, progress, tolerance, node_order, workers, backend, tight
+                )
+            )
         )
 
-        # [Error] Incorrect format
-        data_z = parsers.safe_parse(
-            parser_func=self.parser,
-            data_str=data_z,
-            error_command=self.write_output,
-            error_message='Incorrect data format in field \'New Point x\':\n{}'
-        )
 
-        # [Error] Incorrect format (Message already displayed in parsers.safe_parse())
-        if None in (data_x, data_y, data_z):
+    def cancel_button_func(self) -> None:
+        """
+        Request the running computation to stop.
+
+        :return: None
+        """
+
+        self.worker.cancel()
+        self.cancel_button.config(state='disabled')
+
+
+    def on_worker_progress(self, fraction: float, label: str) -> None:
+        """
+        Update the progress indicator with the worker's current stage.
+
+        :return: None
+        """
+
+        self.progress_label.config(text=label)
+        self.progress_bar.config(value=fraction * 100)
+
+
+    def on_worker_finish(self, status: str, error: Exception | None) -> None:
+        """
+        Restore the buttons and the progress indicator after the worker has finished.
+
+        :param status: 'done', 'cancelled' or 'error'
+        :param error: The exception that stopped the computation, if any
+        :return: None
+        """
+
+        self.calculate_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
+        self.progress_bar.config(value=0)
+        self.progress_label.config(text='')
+
+        if status == 'cancelled':
+            self.append_output('\nComputation cancelled.')
+        elif status == 'error':
+            self.append_output(f'\nComputation failed:\n{error}')
+
+        if self.diagnostics_window is not None:
+            self.diagnostics_window.refresh()
+
+        # The fields were edited while the previous live computation was running
+        if self._live_pending:
+            self._live_pending = False
+            self.live_update()
+
+
+    def on_field_modified(self, event) -> None:
+        """
+        Restart the debounce timer of the live recomputation after an edit of an entry field.
+
+        :param event: The ``<<Modified>>`` event of the field's text widget
+        :return: None
+        """
+
+        widget = event.widget
+        # Resetting the modified flag below triggers the event again
+        if not widget.edit_modified():
             return
+        widget.edit_modified(False)
+        self.schedule_live_update()
+
+
+    def schedule_live_update(self) -> None:
+        """
+        (Re)start the timer of `self.live_update()`, if the live recomputation is on.
 
-        # [Error] Dataset sizes mismatch
-        if len(data_x) != len(data_y):
-            self.write_output('The number of X values does not match that of the Y values.\n'
-                              f'x.size() = {len(data_x)}, y.size() = {len(data_y)}')
+        :return: None
+        """
+
+        if self._live_after is not None:
+            self.root.after_cancel(self._live_after)
+            self._live_after = None
+        if self.live_mode.get():
+            self._live_after = self.root.after(self.LIVE_UPDATE_DELAY, self.live_update)
+
+
+    def live_update(self) -> None:
+        """
+        Recompute the results once the fields have stopped changing.
+
+        If all fields hold a valid dataset, the whole computation is started as if Calculate was pressed.
+        If only the X and Y values are valid so far, their interpolant is fitted into the interpolant cache
+        in the background, so the computation is quick once the new points are filled in.
+        A computation still running for older contents of the fields is cancelled first.
+
+        :return: None
+        """
+
+        self._live_after = None
+        if not self.live_mode.get():
+            return
+        if self.worker.running:
+            self._live_pending = True
+            self.worker.cancel()
             return
 
-        # size assertion (is sure to be true btw but it's there for convention's sake)
-        assert len(data_x) > 0
-        assert len(data_y) > 0
-        assert len(data_z) > 0
+        mode = self.current_mode.get()
+        texts = tuple(
+            input_gui.input_field_entry.get("1.0", "end-1c")
+            for input_gui in (self.input_gui_x, self.input_gui_y, self.input_gui_z)
+        )
+        plan = self.jobs.live_update(mode, self.parser, texts, self.node_order.get(), self.interval_backend.get())
+        if plan is None:
+            return
+        if plan == 'calculate':
+            self.calculate_button_func()
+            return
 
-        # Duplicate check
-        # [Error] X dataset contains duplicates
-        if len(set(data_x)) < len(data_x):
-            self.write_output('The X values contain duplicates, which is forbidden.')
+        # Only the new points are missing, fit the interpolant ahead of time
+        data_x, data_y = plan
+        key = self.jobs.interpolant_cache.make_key(mode, data_x, data_y)
+        if self.prefit_worker.running:
+            if key != self._prefit_key:
+                self._live_pending = True
+                self.prefit_worker.cancel()
+            return
+        if self.jobs.interpolant_cache.contains(mode, data_x, data_y):
             return
 
-        # print('x', data_x)
-        # print('y', data_y)
-        # print('z', data_z)
+        self._prefit_key = key
+        self.prefit_worker.start(
+            lambda progress: self.jobs.prefit_job(mode, data_x, data_y, progress)
+        )
+
+
+    def on_prefit_finish(self, status: str, error: Exception | None) -> None:
+        """
+        Start the next live update if the fields changed while the interpolant was being fitted.
+
+        :return: None
+        """
+
+        self._prefit_key = None
+        if self._live_pending and not self.worker.running:
+            self._live_pending = False
+            self.live_update()
+
+
+    def diagnostics_button_func(self) -> None:
+        """
+        Open the diagnostics window, or bring it to the front if it is already open.
+
+        :return: None
+        """
+
+        if self.diagnostics_window is None:
+            self.diagnostics_window = DiagnosticsWindow(self)
+        else:
+            self.diagnostics_window.lift()
+
+
+    def plot_button_func(self) -> None:
+        """
+        Open the plot window and plot the current dataset, or bring the window to the front and plot it again.
+
+        :return: None
+        """
+
+        if self.plot_window is None:
+            self.plot_window = PlotWindow(self)
+        else:
+            self.plot_window.lift()
+        self.plot_window.plot()
+
+
+    def load_button_func(self) -> None:
+        """
+        Ask for a dataset file and load it in the background, see `gui.jobs.Jobs.load_job()`.
+
+        :return: None
+        """
 
-        output1 = algorithm.lagrange(
-            data_x,
-            data_y,
-            data_z
+        if self.file_worker.running:
+            return
+        path = filedialog.askopenfilename(
+            filetypes=[('Datasets', f'*{datafile.EXTENSION}'), ('All files', '*.*')]
         )
-        output2 = algorithm.neville(
-            data_x,
-            data_y,
-            data_z
+        if not path:
+            return
+        self.load_button.config(state='disabled')
+        self.save_button.config(state='disabled')
+        self.file_worker.start(lambda progress: self.jobs.load_job(path, progress))
+
+
+    def import_button_func(self) -> None:
+        """
+        Ask for a CSV or NumPy file and the columns holding the X and Y values, and import them in the background
+        into the current mode, see `gui.jobs.Jobs.import_job()`.
+
+        :return: None
+        """
+
+        if self.file_worker.running:
+            return
+        path = filedialog.askopenfilename(
+            filetypes=[('CSV or NumPy files', ' '.join(f'*{extension}' for extension in columnfile.EXTENSIONS)),
+                       ('All files', '*.*')]
         )
-        output3 = algorithm.lagrange_coefficients(
-            data_x,
-            data_y
+        if not path:
+            return
+        columns = simpledialog.askstring(
+            'Import X/Y',
+            'Columns of the X and Y values, by index (from 0) or header name,\n'
+            'e.g. "0 1" or "time value" (interval endpoints as "low:high"):',
+            initialvalue='0 1',
+            parent=self.root
         )
-        # sgn, man, exp, bic = output._mpf_
-        # print(sgn, bin(man)[2:], exp, bic)
+        if columns is None:
+            return
+        if len(columns.split()) != 2:
+            self.write_output(f'Expected two columns, got: {columns}')
+            return
+        x_column, y_column = map(columnfile.parse_column, columns.split())
+
+        mode = self.current_mode.get()
+        self.load_button.config(state='disabled')
+        self.save_button.config(state='disabled')
+        self.import_button.config(state='disabled')
+        self.file_worker.start(lambda progress: self.jobs.import_job(path, mode, x_column, y_column, progress))
+
+
+    def show_dataset(self, dataset: 'datafile.Dataset', name: str, summaries: dict) -> None:
+        """
+        Switch to the mode of a loaded dataset and show its summary in the entry fields it fills.
+
+        Fields left empty by the dataset (usually the new points) stay editable.
+
+        :param dataset: The loaded dataset
+        :param name: Name of the dataset's file
+        :param summaries: Summary of every field filled by the dataset, see `gui.jobs.Jobs.describe_fields()`
+        :return: None
+        """
+
+        self.unload_dataset()
+        self.current_mode.set(dataset.mode)
+        self.update_mode()
 
-        self.write_output(
-            f'Lagrange Interpolation: \n{parsers.prettify(output1)}\n'
-            f'Neville Interpolation: \n{parsers.prettify(output2)}\n'
-            f'Lagrange Polynomial Coefficients: \n{parsers.prettify(output3)}'
+        self.loaded_dataset = dataset
+        for field, input_gui in (('x', self.input_gui_x), ('y', self.input_gui_y), ('z', self.input_gui_z)):
+            if field not in summaries:
+                continue
+            text = f'{name} (loaded): {summaries[field]}'
+            input_gui.show_loaded(text)
+            self.jobs.loaded_fields[field] = (text, getattr(dataset, field))
+        self.unload_button.config(state='normal')
+        output = f'Loaded {name}:\n{dataset.summary()}'
+        if dataset.mode != 'fast_real' and dataset.precision != precision.get_precision():
+            output += (f'\nThe values are exact, but they are computed at the working precision of '
+                       f'{precision.get_precision()} bits.')
+        self.write_output(output)
+
+
+    def unload_dataset(self) -> None:
+        """
+        Remove the loaded dataset and make its entry fields editable again.
+
+        :return: None
+        """
+
+        for field, input_gui in (('x', self.input_gui_x), ('y', self.input_gui_y), ('z', self.input_gui_z)):
+            if field in self.jobs.loaded_fields:
+                input_gui.clear_loaded()
+        self.loaded_dataset = None
+        self.jobs.loaded_fields = {}
+        self.unload_button.config(state='disabled')
+
+
+    def save_button_func(self) -> None:
+        """
+        Ask for a file name and save the current dataset in the background, see `gui.jobs.Jobs.save_job()`.
+
+        :return: None
+        """
+
+        if self.file_worker.running:
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=datafile.EXTENSION,
+            filetypes=[('Datasets', f'*{datafile.EXTENSION}'), ('All files', '*.*')]
         )
+        if not path:
+            return
+
+        texts = tuple(
+            input_gui.input_field_entry.get("1.0", "end-1c")
+            for input_gui in (self.input_gui_x, self.input_gui_y, self.input_gui_z)
+        )
+        mode = self.current_mode.get()
+        parser = self.parser
+        self.load_button.config(state='disabled')
+        self.save_button.config(state='disabled')
+        self.file_worker.start(lambda progress: self.jobs.save_job(mode, parser, texts, path, progress))
+
+
+    def on_file_output(self, output) -> None:
+        if isinstance(output, str):
+            self.write_output(output)
+        else:
+            self.show_dataset(*output)
+
+
+    def on_file_finish(self, status: str, error: Exception | None) -> None:
+        self.load_button.config(state='normal')
+        self.save_button.config(state='normal')
+        self.import_button.config(state='normal')
+        self.progress_bar.config(value=0)
+        self.progress_label.config(text='')
+        if status == 'error':
+            self.write_output(f'Could not read or write the file:\n{error}')
 
 
     def build(self):
@@ -362,6 +854,12 @@ class App:
         make_focusable(self.mode_switch_A)
         make_focusable(self.mode_switch_B)
         make_focusable(self.mode_switch_C)
+        make_focusable(self.mode_switch_D)
+        make_focusable(self.adaptive_frame)
+        make_focusable(self.node_order_frame)
+        make_focusable(self.interval_backend_frame)
+        make_focusable(self.processes_frame)
+        make_focusable(self.file_frame)
         make_focusable(self.input_frame)
         allow_copying_contents(self.input_gui_x.input_field_entry)
         allow_copying_contents(self.input_gui_y.input_field_entry)
@@ -369,6 +867,8 @@ class App:
         allow_pasting_in(self.input_gui_x)
         allow_pasting_in(self.input_gui_y)
         allow_pasting_in(self.input_gui_z)
+        for input_gui in (self.input_gui_x, self.input_gui_y, self.input_gui_z):
+            input_gui.input_field_entry.bind('<<Modified>>', self.on_field_modified, add='+')
 
         self.title_label.grid(
             row=0, column=0, sticky='ew'
@@ -386,6 +886,9 @@ class App:
         self.mode_switch_C.grid(
             row=2, column=0, sticky='w'
         )
+        self.mode_switch_D.grid(
+            row=3, column=0, sticky='w'
+        )
 
         self.input_frame.grid(
             row=0, column=1
@@ -414,11 +917,88 @@ class App:
         )
         self.input_gui_z.build()
 
+        self.adaptive_frame.grid(
+            row=4, column=0, sticky='w'
+        )
+        self.adaptive_switch.grid(
+            row=0, column=0, sticky='w'
+        )
+        self.adaptive_tolerance_entry.grid(
+            row=0, column=1, sticky='w'
+        )
+
+        self.live_switch.grid(
+            row=5, column=0, sticky='w'
+        )
+
+        self.node_order_frame.grid(
+            row=6, column=0, sticky='w'
+        )
+        self.node_order_label.grid(
+            row=0, column=0, sticky='w'
+        )
+        self.node_order_menu.grid(
+            row=0, column=1, sticky='w'
+        )
+
+        self.interval_backend_frame.grid(
+            row=7, column=0, sticky='w'
+        )
+        self.interval_backend_label.grid(
+            row=0, column=0, sticky='w'
+        )
+        self.interval_backend_menu.grid(
+            row=0, column=1, sticky='w'
+        )
+        self.tight_coefficients_switch.grid(
+            row=0, column=2, sticky='w'
+        )
+
+        self.processes_frame.grid(
+            row=8, column=0, sticky='w'
+        )
+        self.processes_label.grid(
+            row=0, column=0, sticky='w'
+        )
+        self.processes_spinbox.grid(
+            row=0, column=1, sticky='w'
+        )
+
         self.calculate_button_spacer.grid(
-            row=3, column=0
+            row=9, column=0
         )
         self.calculate_button.grid(
-            row=4, column=0, columnspan=1, pady=0, sticky='n'
+            row=10, column=0, columnspan=1, pady=0, sticky='n'
+        )
+        self.cancel_button.grid(
+            row=11, column=0, columnspan=1, pady=2, sticky='n'
+        )
+        self.progress_bar.grid(
+            row=12, column=0, pady=2, sticky='n'
+        )
+        self.progress_label.grid(
+            row=13, column=0, sticky='n'
+        )
+        self.diagnostics_button.grid(
+            row=14, column=0, pady=2, sticky='n'
+        )
+        self.plot_button.grid(
+            row=15, column=0, pady=2, sticky='n'
+        )
+        self.file_frame.grid(
+            row=16, column=0, pady=2, sticky='n'
+        )
+        self.load_button.grid(
+            row=0, column=0
+        )
+        self.save_button.grid(
+            row=0, column=1
+        )
+        self.import_button.grid(
+            row=0, column=2
+        )
+        self.unload_button.grid(
+            row=0, column=3
         )
 
         self.output_box.grid(
@@ -430,15 +1010,20 @@ class App:
         )
 
 
-    def display(self):
+    def display(self, on_preloaded=None):
         """
         Place all the app's elements in the root window and run the window.
 
+        Once the window is shown, the numeric stack is imported in the background (`utility.startup.preload()`),
+        so that the first computation does not wait for it.
+
+        :param on_preloaded: Optional callable, called from the preloading thread once the numeric stack is imported
         :return: None
         """
 
         self.title_label.pack(fill='both', expand=True)
         self.mainframe.pack(fill='both', expand=True)
+        self.root.after_idle(lambda: startup.preload(on_done=on_preloaded))
         self.root.mainloop()
 
 
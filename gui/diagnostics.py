@@ -0,0 +1,151 @@
+"""
+Diagnostics window module showing where the time of the last computation went.
+
+This module defines the `DiagnosticsWindow` class, a separate window listing the stages recorded by the
+`utility.instrumentation.Profiler` of the last Calculate run (parsing, validation, the three algorithms with
+their kernels, and formatting) with their wall time and, if enabled, their operation counts and allocations.
+The recorded stages can be exported as a JSON file.
+"""
+
+
+import tkinter as tk
+from tkinter import filedialog, ttk
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """
+    Window listing the recorded stages of the last computation of a `gui.core.App`.
+
+    The options enabling operation counting and allocation tracking are the App's own variables,
+    so they apply to the next Calculate run.
+    """
+
+    COLUMNS = (
+        ('seconds', 'Time [s]', 100),
+        ('operations', 'Operations', 100),
+        ('allocated', 'Allocated [B]', 110),
+        ('peak', 'Peak [B]', 100),
+    )
+
+    def __init__(self, app):
+        """
+        Initialize a gui.diagnostics.DiagnosticsWindow instance.
+
+        :param app: The gui.core.App instance whose computations are shown
+        """
+
+        super().__init__(app.root)
+        self.app = app
+        self.title('Diagnostics')
+
+        self.options_frame = tk.Frame(self)
+        self.operations_switch = tk.Checkbutton(
+            self.options_frame,
+            text='Count operations (slower)',
+            variable=app.count_operations
+        )
+        self.allocations_switch = tk.Checkbutton(
+            self.options_frame,
+            text='Track allocations (much slower)',
+            variable=app.track_allocations
+        )
+        self.export_button = tk.Button(
+            self.options_frame,
+            text='Export JSON...',
+            command=self.export
+        )
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=[column for column, _, _ in self.COLUMNS],
+            height=14
+        )
+        self.tree.heading('#0', text='Stage')
+        self.tree.column('#0', width=260)
+        for column, title, width in self.COLUMNS:
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, anchor='e')
+
+        self.total_label = tk.Label(self, text='', anchor='w')
+
+        self.protocol('WM_DELETE_WINDOW', self.close)
+        self.build()
+        self.refresh()
+
+
+    def build(self):
+        self.options_frame.grid(
+            row=0, column=0, sticky='w'
+        )
+        self.operations_switch.grid(
+            row=0, column=0, sticky='w'
+        )
+        self.allocations_switch.grid(
+            row=0, column=1, sticky='w'
+        )
+        self.export_button.grid(
+            row=0, column=2, padx=10
+        )
+        self.tree.grid(
+            row=1, column=0, sticky='nsew'
+        )
+        self.total_label.grid(
+            row=2, column=0, sticky='w'
+        )
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+
+    def refresh(self) -> None:
+        """
+        Show the stages recorded during the App's last computation.
+
+        :return: None
+        """
+
+        self.tree.delete(*self.tree.get_children())
+        profiler = self.app.last_profiler
+        if profiler is None:
+            self.total_label.config(text='No computation has been run yet.')
+            return
+
+        # Parent item of every nesting depth
+        parents = ['']
+        for record in profiler.records:
+            del parents[record['depth'] + 1:]
+            values = []
+            for column, _, _ in self.COLUMNS:
+                value = record.get(column)
+                if value is None:
+                    values.append('-')
+                elif column == 'seconds':
+                    values.append(f'{value:.6f}')
+                else:
+                    values.append(f'{value:,}')
+            item = self.tree.insert(parents[-1], 'end', text=record['stage'], values=values, open=True)
+            parents.append(item)
+
+        self.total_label.config(text=f'Total: {profiler.total_seconds():.6f} s')
+
+
+    def export(self) -> None:
+        """
+        Ask for a file name and save the recorded stages as JSON.
+
+        :return: None
+        """
+
+        if self.app.last_profiler is None:
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension='.json',
+            filetypes=[('JSON', '*.json'), ('All files', '*.*')]
+        )
+        if path:
+            self.app.last_profiler.export(path)
+
+
+    def close(self) -> None:
+        self.app.diagnostics_window = None
+        self.destroy()
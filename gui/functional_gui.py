@@ -3,6 +3,9 @@ from utility import entry_bindings
 
 
 class InputGUI(tk.Frame):
+    # Pasted text is inserted in chunks of this many characters, one per event loop turn
+    PASTE_CHUNK_SIZE = 1 << 16
+
     def __init__(self,
                  app_core,
                  root_frame: tk.Frame,
@@ -28,6 +31,7 @@ class InputGUI(tk.Frame):
 
         self.input_field_entry_placeholder = ''
         self.input_field_entry_allowed_chars = '0.123,456;789\n'
+        self._paste_job = None
 
         self.input_field_entry.bind(
             "<FocusIn>",
@@ -41,6 +45,14 @@ class InputGUI(tk.Frame):
                 event=event
             )
         )
+        # Reads the current mask on every key press, so switching modes does not need to rebind it
+        self.input_field_entry.bind(
+            "<KeyPress>",
+            lambda event: entry_bindings.input_filter(
+                event=event,
+                allowed_chars=self.input_field_entry_allowed_chars
+            )
+        )
 
         self.update_input_filter()
 
@@ -59,22 +71,51 @@ class InputGUI(tk.Frame):
         else:
             self.input_field_entry_allowed_chars = allowed_chars
 
+        # Only rewrites the field if the new mask removes anything from it
         content = self.input_field_entry.get("1.0", "end-1c")
-        filtered_content = content.translate(
-            str.maketrans('', '', ''.join(
-                set(content) - set(allowed_chars)
-            ))
-        )
+        if entry_bindings.is_filtered(content, allowed_chars):
+            return
         self.input_field_entry.delete("1.0", "end")
-        self.input_field_entry.insert("1.0", filtered_content)
-
-        self.input_field_entry.bind(
-            "<KeyPress>",
-            lambda event: entry_bindings.input_filter(
-                event=event,
-                allowed_chars=allowed_chars
-            )
+        self.input_field_entry.insert("1.0", entry_bindings.filter_text(content, allowed_chars))
+
+
+    def paste(self, text: str):
+        """
+        Insert the text at the cursor, replacing the selection, without the characters the current mask does
+        not allow. Long texts are filtered and inserted one chunk at a time from the event loop, so pasting
+        megabytes of data does not freeze the window. Pasting again cancels the rest of an unfinished paste.
+        """
+        self.cancel_paste()
+        entry = self.input_field_entry
+        if entry.tag_ranges("sel"):
+            entry.delete("sel.first", "sel.last")
+        # Right gravity keeps the mark after every inserted chunk
+        entry.mark_set("paste", "insert")
+        entry.mark_gravity("paste", "right")
+        self._paste_chunk(text, 0)
+
+
+    def _paste_chunk(self, text: str, start: int):
+        stop = start + self.PASTE_CHUNK_SIZE
+        self.input_field_entry.insert(
+            "paste",
+            entry_bindings.filter_text(text[start:stop], self.input_field_entry_allowed_chars)
         )
+        if stop < len(text):
+            self._paste_job = self.after(1, self._paste_chunk, text, stop)
+        else:
+            self._paste_job = None
+            self.input_field_entry.mark_set("insert", "paste")
+            self.input_field_entry.see("insert")
+
+
+    def cancel_paste(self):
+        """
+        Stop inserting the rest of an unfinished paste.
+        """
+        if self._paste_job is not None:
+            self.after_cancel(self._paste_job)
+            self._paste_job = None
 
 
     def update_input_placeholder(self, text: str):
@@ -86,6 +127,30 @@ class InputGUI(tk.Frame):
         )
 
 
+    def show_loaded(self, text: str):
+        """
+        Replace the contents of the entry field with the summary of a loaded dataset and make it read-only.
+        """
+        self.cancel_paste()
+        self.input_field_entry.config(state='normal')
+        self.input_field_entry.delete("1.0", "end")
+        self.input_field_entry.insert("1.0", text)
+        self.input_field_entry.config(state='disabled', fg='gray40')
+
+
+    def clear_loaded(self):
+        """
+        Remove the summary of a loaded dataset and make the entry field editable again.
+        """
+        self.cancel_paste()
+        self.input_field_entry.config(state='normal', fg='black')
+        self.input_field_entry.delete("1.0", "end")
+        entry_bindings.add_hint(
+            self.input_field_entry,
+            hint_text=self.input_field_entry_placeholder
+        )
+
+
     def build(self):
         self.input_field_title.grid(
             row=0, column=0, sticky='w'
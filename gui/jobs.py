@@ -0,0 +1,579 @@
+"""
+Background jobs module of the GUI, holding everything the App's workers compute.
+
+This module defines the `Jobs` class, whose generators are run by the `gui.worker.ComputationWorker` instances
+of `gui.core.App`: the whole computation (`Jobs.calculate_job()`, with its adaptive precision and float64 paths),
+the background fit of the live recomputation, and loading, importing and saving datasets. It also holds the state
+these jobs share between runs, i.e. the parsed contents of the entry fields, the values of a loaded dataset
+and the cache of fitted interpolants. The jobs never touch any widgets, the App only reads the entry fields,
+starts the workers and shows their outputs.
+
+Like `gui.core`, this module does not import the numeric stack, it refers to it through
+`utility.startup.LazyModule` proxies.
+
+Classes
+-------
+
+    - ``Jobs``
+        Background jobs of the App, and the parsed and loaded values they share
+"""
+
+
+import os
+import threading
+
+from gui.outputview import ResultRows
+from utility.startup import LazyModule
+
+mpmath = LazyModule('mpmath')
+algorithm = LazyModule('utility.algorithm')
+cache = LazyModule('utility.cache')
+columnfile = LazyModule('utility.columnfile')
+datafile = LazyModule('utility.datafile')
+fastreal = LazyModule('utility.fastreal')
+floatinterval = LazyModule('utility.floatinterval')
+instrumentation = LazyModule('utility.instrumentation')
+parsers = LazyModule('utility.parsers')
+precision = LazyModule('utility.precision')
+validation = LazyModule('utility.validation')
+
+
+class Jobs:
+    """
+    Background jobs of a `gui.core.App`, and the values they share between runs.
+
+    All methods may be called from the worker threads, except where stated otherwise.
+    """
+
+    def __init__(self):
+        """
+        Initialize a gui.jobs.Jobs instance.
+        """
+
+        # Parsed contents of the entry fields, reused while a field's text stays the same
+        self.parsed_fields = {}
+        # Summary text and values of every entry field filled by a loaded dataset, set by the App
+        self.loaded_fields = {}
+
+        # Fitted interpolants, reused while the X and Y data stay the same (created on first use)
+        self._interpolant_cache = None
+        self._cache_lock = threading.Lock()
+
+
+    @property
+    def interpolant_cache(self) -> 'cache.InterpolantCache':
+        """
+        Cache of the fitted interpolants, created on first use by any of the workers.
+        """
+        with self._cache_lock:
+            if self._interpolant_cache is None:
+                self._interpolant_cache = cache.InterpolantCache()
+            return self._interpolant_cache
+
+
+    @staticmethod
+    def result_output(title: str, result) -> str | ResultRows:
+        """
+        Returns the output of a single titled result.
+
+        Single values are formatted right away, lists of values are returned as `gui.outputview.ResultRows`,
+        which only format the rows the output widget displays.
+
+        :param title: Title of the result, e.g. 'Lagrange Interpolation'
+        :param result: A single value, or a list of values
+        :return: Output ready for `gui.core.App.append_output()`
+        """
+
+        if isinstance(result, list):
+            return ResultRows(f'{title}: ', result)
+        return f'{title}: \n{parsers.prettify(result)}\n'
+
+
+    @staticmethod
+    def profiled_job(profiler: 'instrumentation.Profiler', outputs):
+        """
+        Yield the outputs of a job with the profiler active, so the stages of the job are recorded in it.
+
+        The profiler is activated only once iterating starts, i.e. in the worker thread running the job.
+
+        :param profiler: The profiler recording the stages
+        :param outputs: Generator of output strings, e.g. from `self.calculate_job()`
+        :return: Generator of output strings
+        """
+
+        with profiler:
+            yield from outputs
+
+
+    def calculate_job(self, mode: str, parser, data_x: str, data_y: str, data_z: str, progress,
+                      tolerance: float = None, node_order: str = 'input', workers: int = 1,
+                      backend: str = 'mpmath', tight: bool = False):
+        """
+        Process input data, perform interpolation algorithms and yield the formatted results stage by stage.
+
+        This generator runs in the background worker thread and must not touch any widgets. It:
+            1. Validates that all fields are filled and correctly formatted. Fields whose text has not changed
+               since the previous computation are not parsed again, see `self.parse_field()`.
+            2. Checks that X and Y lists have the same length and that X contains no duplicate values
+               (or overlapping intervals), warns about too close X values, and reorders the nodes,
+               see `utility.validation`.
+            3. Performs Lagrange and Neville interpolations and calculates Lagrange polynomial coefficients.
+               The Lagrange polynomial is evaluated through `algorithm.BarycentricInterpolant`
+               at every point given in the Z field. Fitted interpolants (weights and coefficients)
+               are kept in `self.interpolant_cache`, so repeated X and Y data are not fitted again.
+            4. Yields the output text of every stage as soon as the stage finishes.
+
+        Every stage is recorded in the active `utility.instrumentation.Profiler`, if there is one.
+
+        :param mode: Arithmetic mode name
+        :param parser: Parsing function of the mode
+        :param data_x: Contents of the X entry field
+        :param data_y: Contents of the Y entry field
+        :param data_z: Contents of the Z entry field
+        :param progress: Progress callback of `gui.worker.ComputationWorker`
+        :param tolerance: Tolerance of the adaptive precision, fixed precision is used if not given
+        :param node_order: Order of the nodes, one of `utility.validation.NODE_ORDERS`
+        :param workers: Number of processes sharing large computations, see `utility.parallel`
+        :param backend: Interval backend of the interval modes, one of `utility.floatinterval.BACKENDS`
+        :param tight: Whether the interval modes compute the narrower coefficients of
+                      `utility.algorithm.product_coefficients()` in O(n^3)
+        :return: Generator of output strings
+        """
+
+        # [Error] Empty field
+        if '' in (data_x, data_y, data_z):
+            yield 'Not all fields have been filled.'
+            return
+        texts = (data_x, data_y, data_z)
+
+        # [Error] Incorrect format
+        errors = []
+        with instrumentation.stage('parse'):
+            data_x = parsers.safe_parse(
+                parser_func=lambda text: self.parse_field('x', parser, text),
+                data_str=data_x,
+                error_command=errors.append,
+                error_message='Incorrect data format in field \'X values\':\n{}'
+            )
+
+            # [Error] Incorrect format
+            data_y = parsers.safe_parse(
+                parser_func=lambda text: self.parse_field('y', parser, text),
+                data_str=data_y,
+                error_command=errors.append,
+                error_message='Incorrect data format in field \'Y values\':\n{}'
+            )
+
+            # [Error] Incorrect format
+            data_z = parsers.safe_parse(
+                parser_func=lambda text: self.parse_field('z', parser, text),
+                data_str=data_z,
+                error_command=errors.append,
+                error_message='Incorrect data format in field \'New Point x\':\n{}'
+            )
+
+        # [Error] Incorrect format (Messages collected in parsers.safe_parse())
+        if errors:
+            yield '\n'.join(errors)
+            return
+
+        # [Error] Dataset sizes mismatch, empty dataset, duplicates or overlapping intervals in X
+        warnings = []
+        with instrumentation.stage('validate'):
+            error = validation.validate_dataset(data_x, data_y, data_z, warnings)
+        if error is not None:
+            yield error
+            return
+        if warnings:
+            yield '\n'.join(warnings) + '\n'
+
+        with instrumentation.stage('reorder'):
+            indices = validation.node_order(data_x, node_order)
+            data_x = validation.reorder(data_x, indices)
+            data_y = validation.reorder(data_y, indices)
+
+        # NumPy float64 fast path
+        if mode == 'fast_real':
+            progress(0, 'Fast real')
+            with instrumentation.stage('fast_real'):
+                outputs = self.fast_real_output(data_x, data_y, data_z)
+            yield from outputs
+            return
+
+        # NumPy float64 interval backend
+        if backend == 'float64' and mode in ('interval', 'singleton'):
+            if tolerance is not None:
+                yield 'Adaptive precision is not available with float64 interval endpoints.\n'
+            progress(0, 'Float64 intervals')
+            with instrumentation.stage('float_interval'):
+                outputs = self.float_interval_output(data_x, data_y, data_z)
+            yield from outputs
+            return
+
+        if tolerance is not None:
+            yield from self.adaptive_job(mode, parser, texts, tolerance, progress, indices, workers, tight)
+            return
+
+        with instrumentation.stage('lagrange'):
+            interpolant = self.interpolant_cache.get_or_fit(
+                mode,
+                data_x,
+                data_y,
+                fit=lambda x, y: algorithm.BarycentricInterpolant(
+                    x, y, progress=lambda f: progress(f, 'Lagrange weights'), workers=workers
+                ),
+                wait=lambda: progress(0, 'Lagrange weights')
+            )
+            output1 = interpolant.evaluate_many(
+                data_z,
+                progress=lambda f: progress(f, 'Lagrange'),
+                workers=workers
+            )
+        if len(output1) == 1:
+            output1 = output1[0]
+        with instrumentation.stage('prettify'):
+            output1 = self.result_output('Lagrange Interpolation', output1)
+        yield output1
+
+        with instrumentation.stage('neville'):
+            output2 = interpolant.neville_many(
+                data_z,
+                progress=lambda f: progress(f, 'Neville'),
+                workers=workers
+            )
+        if len(output2) == 1:
+            output2 = output2[0]
+        with instrumentation.stage('prettify'):
+            output2 = self.result_output('Neville Interpolation', output2)
+        yield output2
+
+        with instrumentation.stage('coefficients'):
+            output3 = interpolant.coefficients(
+                progress=lambda f: progress(f, 'Coefficients'),
+                workers=workers,
+                tight=tight and mode != 'real'
+            )
+            self.interpolant_cache.refresh_size(
+                mode,
+                data_x,
+                data_y
+            )
+        with instrumentation.stage('prettify'):
+            output3 = self.result_output('Lagrange Polynomial Coefficients', output3)
+        yield output3
+
+
+    def parse_field(self, field: str, parser, text: str):
+        """
+        Parse the contents of an entry field, reusing the previous result of the field while its text,
+        the parser and the working precision stay the same.
+
+        May be called from the worker thread. Parsing errors are raised, and never cached.
+
+        :param field: 'x', 'y' or 'z'
+        :param parser: Parsing function of the mode
+        :param text: Contents of the entry field
+        :return: Parsed values
+        """
+
+        key = (parser, precision.get_precision(), text)
+        cached = self.parsed_fields.get(field)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        data = self.read_field(field, parser, text)
+        self.parsed_fields[field] = (key, data)
+        return data
+
+
+    def read_field(self, field: str, parser, text: str):
+        """
+        Returns the values of the dataset loaded into an entry field while the field shows its summary,
+        or parses the contents of the field otherwise.
+
+        :param field: 'x', 'y' or 'z'
+        :param parser: Parsing function of the mode
+        :param text: Contents of the entry field
+        :return: Parsed or loaded values
+        """
+
+        loaded = self.loaded_fields.get(field)
+        if loaded is not None and loaded[0] == text:
+            return loaded[1]
+        return parser(text)
+
+
+    def adaptive_job(self, mode: str, parser, texts: tuple, tolerance: float, progress, indices: list = None,
+                     workers: int = 1, tight: bool = False):
+        """
+        Perform the interpolation algorithms with adaptive precision, yielding the results stage by stage.
+
+        Every stage parses the entry fields' contents again at each precision tried by
+        `utility.precision.adaptive()`, and reports the precision it finally used. The exact values
+        of a loaded dataset are used at every precision.
+
+        :param mode: Arithmetic mode name
+        :param parser: Parsing function of the mode
+        :param texts: Contents of the X, Y and Z entry fields, already validated
+        :param tolerance: Largest acceptable interval width (or real-mode error estimate)
+        :param progress: Progress callback of `gui.worker.ComputationWorker`
+        :param indices: Order of the nodes, see `utility.validation.node_order()`
+        :param workers: Number of processes sharing large computations, see `utility.parallel`
+        :param tight: Whether the interval modes compute the coefficients of `utility.algorithm.product_coefficients()`
+        :return: Generator of output strings
+        """
+
+        def stage_progress(label):
+            return lambda f: progress(f, f'{label}, {precision.get_precision()} bits')
+
+        def fitted():
+            data_x, data_y, data_z = (self.read_field(field, parser, text) for field, text in zip('xyz', texts))
+            data_x = validation.reorder(data_x, indices)
+            data_y = validation.reorder(data_y, indices)
+            interpolant = self.interpolant_cache.get_or_fit(
+                mode,
+                data_x,
+                data_y,
+                fit=lambda x, y: algorithm.BarycentricInterpolant(
+                    x, y, progress=stage_progress('Lagrange weights'), workers=workers
+                )
+            )
+            return interpolant, data_x, data_y, data_z
+
+        def lagrange():
+            interpolant, _, _, data_z = fitted()
+            return interpolant.evaluate_many(data_z, progress=stage_progress('Lagrange'), workers=workers)
+
+        def neville():
+            interpolant, _, _, data_z = fitted()
+            return interpolant.neville_many(data_z, progress=stage_progress('Neville'), workers=workers)
+
+        def coefficients():
+            interpolant = fitted()[0]
+            return interpolant.coefficients(
+                progress=stage_progress('Coefficients'), workers=workers, tight=tight and mode != 'real'
+            )
+
+        for title, compute, single in (('Lagrange Interpolation', lagrange, True),
+                                       ('Neville Interpolation', neville, True),
+                                       ('Lagrange Polynomial Coefficients', coefficients, False)):
+            with instrumentation.stage(compute.__name__):
+                outcome = precision.adaptive(
+                    compute, tolerance, wait=lambda: progress(0, 'Waiting for the background jobs')
+                )
+            output = outcome.result
+            if single and len(output) == 1:
+                output = output[0]
+
+            status = '' if outcome.converged else ', tolerance not met'
+            with instrumentation.stage('prettify'):
+                output = self.result_output(
+                    f'{title} (precision: {outcome.precision} bits, '
+                    f'error estimate: {mpmath.nstr(outcome.error, 5)}{status})',
+                    output
+                )
+            yield output
+
+
+    def fast_real_output(self, data_x, data_y, data_z) -> list:
+        """
+        Perform all three algorithms with the NumPy float64 kernels of `utility.fastreal`
+        and format their results along with a comparison against the mpmath algorithms.
+
+        The comparison is skipped for datasets larger than `fastreal.COMPARE_MAX_NODES`,
+        as the mpmath reference would take away the point of the fast path.
+
+        :return: List of outputs ready for `gui.core.App.append_output()`
+        """
+
+        output1, output2, output3 = (
+            result.tolist() for result in fastreal.interpolate_all(data_x, data_y, data_z)
+        )
+        if len(data_z) == 1:
+            output1, output2 = output1[0], output2[0]
+
+        outputs = [
+            self.result_output('Lagrange Interpolation', output1),
+            self.result_output('Neville Interpolation', output2),
+            self.result_output('Lagrange Polynomial Coefficients', output3),
+        ]
+
+        if len(data_x) > fastreal.COMPARE_MAX_NODES:
+            return outputs + [f'Comparison with mpmath skipped '
+                              f'(more than {fastreal.COMPARE_MAX_NODES} nodes).']
+
+        report = fastreal.compare_with_mpmath(data_x, data_y, data_z)
+        return outputs + [
+            f'Comparison with mpmath: \n'
+            f' speedup: {report["speedup"]:.1f}x '
+            f'({report["fast_time"]:.6f}s vs {report["mpmath_time"]:.6f}s)\n'
+            f' max deviation: lagrange={report["lagrange_deviation"]:.3e}, '
+            f'neville={report["neville_deviation"]:.3e}, '
+            f'coefficients={report["coefficients_deviation"]:.3e}'
+        ]
+
+
+    def float_interval_output(self, data_x, data_y, data_z) -> list:
+        """
+        Perform all three algorithms with the NumPy float64 interval kernels of `utility.floatinterval`
+        and format their results.
+
+        :return: List of outputs ready for `gui.core.App.append_output()`
+        """
+
+        output1, output2, output3 = (
+            result.to_intervals() for result in floatinterval.interpolate_all(data_x, data_y, data_z)
+        )
+        if len(data_z) == 1:
+            output1, output2 = output1[0], output2[0]
+
+        return [
+            self.result_output('Lagrange Interpolation (float64 endpoints)', output1),
+            self.result_output('Neville Interpolation (float64 endpoints)', output2),
+            self.result_output('Lagrange Polynomial Coefficients (float64 endpoints)', output3),
+        ]
+
+
+    def live_update(self, mode: str, parser, texts: tuple, node_order: str = 'input', backend: str = 'mpmath'):
+        """
+        Parse the entry fields for the live recomputation and decide what it starts, see `gui.core.App.live_update()`.
+
+        Runs in the GUI thread. Fields that cannot be parsed (yet) count as empty.
+
+        :param mode: Arithmetic mode name
+        :param parser: Parsing function of the mode
+        :param texts: Contents of the X, Y and Z entry fields
+        :param node_order: Order of the nodes, one of `utility.validation.NODE_ORDERS`
+        :param backend: Interval backend of the interval modes, one of `utility.floatinterval.BACKENDS`
+        :return: 'calculate' if all fields hold a valid dataset, the reordered X and Y values if only the new points
+                 are missing and their interpolant can be fitted ahead of time, None otherwise
+        """
+
+        parsed = {}
+        for field, text in zip('xyz', texts):
+            try:
+                parsed[field] = self.parse_field(field, parser, text) if text else None
+            except Exception:
+                parsed[field] = None
+
+        data_x, data_y, data_z = parsed['x'], parsed['y'], parsed['z']
+        if data_x is None or data_y is None:
+            return None
+        if data_z is not None and validation.validate_dataset(data_x, data_y, data_z) is None:
+            return 'calculate'
+
+        # Only the new points are missing, the interpolant can be fitted ahead of time
+        if mode == 'fast_real' or (mode != 'real' and backend == 'float64'):
+            return None
+        if validation.validate_dataset(data_x, data_y, data_x[:1]) is not None:
+            return None
+        indices = validation.node_order(data_x, node_order)
+        return validation.reorder(data_x, indices), validation.reorder(data_y, indices)
+
+
+    def prefit_job(self, mode: str, data_x, data_y, progress) -> tuple:
+        """
+        Fit the interpolant of the dataset into `self.interpolant_cache`. Runs in the App's `prefit_worker`.
+
+        :return: No outputs
+        """
+
+        self.interpolant_cache.get_or_fit(
+            mode,
+            data_x,
+            data_y,
+            fit=lambda x, y: algorithm.BarycentricInterpolant(
+                x, y, progress=lambda f: progress(f, 'Lagrange weights')
+            ),
+            wait=lambda: progress(0, 'Lagrange weights')
+        )
+        return ()
+
+
+    @staticmethod
+    def load_job(path: str, progress):
+        """
+        Read a dataset file. Runs in the App's `file_worker`.
+
+        :return: Generator yielding the loaded `utility.datafile.Dataset`, the name of its file
+                 and the summaries of its fields
+        """
+
+        progress(0, 'Loading')
+        dataset = datafile.load(path)
+        yield dataset, os.path.basename(path), Jobs.describe_fields(dataset)
+
+
+    @staticmethod
+    def import_job(path: str, mode: str, x_column, y_column, progress):
+        """
+        Read the X and Y values of a dataset from two columns of a CSV or NumPy file. Runs in the App's `file_worker`.
+
+        :return: Generator yielding the imported `utility.datafile.Dataset`, the name of its file
+                 and the summaries of its fields
+        """
+
+        progress(0, 'Importing')
+        # Converted at the current precision, which an adaptive computation must not change meanwhile
+        with precision.stable_precision(wait=lambda: progress(0, 'Importing')):
+            dataset = columnfile.load(path, mode, x_column, y_column, progress)
+        yield dataset, os.path.basename(path), Jobs.describe_fields(dataset)
+
+
+    @staticmethod
+    def describe_fields(dataset: 'datafile.Dataset') -> dict:
+        """
+        Returns the summaries shown in the entry fields filled by a loaded dataset, see `gui.core.App.show_dataset()`.
+        """
+        return {field: dataset.describe(field) for field in 'xyz' if len(getattr(dataset, field))}
+
+
+    def save_job(self, mode: str, parser, texts: tuple, path: str, progress):
+        """
+        Parse the entry fields and write them to a dataset file. Runs in the App's `file_worker`.
+
+        The new points may be left empty.
+
+        :param mode: Arithmetic mode name
+        :param parser: Parsing function of the mode
+        :param texts: Contents of the X, Y and Z entry fields
+        :param path: Path of the dataset file
+        :param progress: Progress callback of `gui.worker.ComputationWorker`
+        :return: Generator of output strings
+        """
+
+        # [Error] Empty field
+        if '' in texts[:2]:
+            yield 'The X and Y values must be filled to save the dataset.'
+            return
+
+        progress(0, 'Saving')
+        with precision.stable_precision(wait=lambda: progress(0, 'Saving')):
+            errors = []
+            data = []
+            for field, title, text in zip('xyz', ('X values', 'Y values', 'New Point x'), texts):
+                if not text:
+                    data.append([])
+                    continue
+                data.append(parsers.safe_parse(
+                    parser_func=lambda text: self.parse_field(field, parser, text),
+                    data_str=text,
+                    error_command=errors.append,
+                    error_message=f'Incorrect data format in field \'{title}\':\n{{}}'
+                ))
+
+            # [Error] Incorrect format (Messages collected in parsers.safe_parse())
+            if errors:
+                yield '\n'.join(errors)
+                return
+
+            # [Error] Dataset sizes mismatch
+            data_x, data_y, data_z = data
+            if len(data_x) != len(data_y):
+                yield ('The number of X values does not match that of the Y values.\n'
+                       f'x.size() = {len(data_x)}, y.size() = {len(data_y)}')
+                return
+
+            datafile.save(path, mode, data_x, data_y, data_z)
+            dataset = datafile.Dataset(mode, precision.get_precision(), data_x, data_y, data_z)
+            yield f'Saved {os.path.basename(path)}:\n{dataset.summary()}'
@@ -0,0 +1,382 @@
+"""
+Virtualized output view module keeping large results cheap to display.
+
+This module defines the `OutputView` widget, which replaces a plain ``tk.Text`` output box. The view holds
+the whole output as a list of segments, either plain text or `ResultRows` (a titled list of values), but
+only formats and inserts the lines currently visible in its text widget. Scrolling re-renders the visible
+window, so displaying and scrolling through thousands of coefficients costs as much as a single screen of them.
+
+The full output can be saved to a file, which formats and writes it line by line without rendering it,
+in a `gui.worker.ComputationWorker` background thread, so saving large results keeps the window responsive.
+
+Classes
+-------
+
+    - ``ResultRows(title, values, format_value)``
+        Titled list of values, formatted one row at a time
+    - ``OutputView(master, width, height)``
+        Scrollable output widget rendering only its visible lines
+"""
+
+
+import bisect
+import itertools
+import tkinter as tk
+from tkinter import filedialog, messagebox
+
+from gui.worker import ComputationWorker
+
+from utility.startup import LazyModule
+
+parsers = LazyModule('utility.parsers')
+
+
+class ResultRows:
+    """
+    Titled list of values, laid out like `utility.parsers.prettify()` lays out lists::
+
+        Title:
+        [
+         value,
+         value
+        ]
+
+    The values are only formatted once their rows are displayed or saved.
+    """
+
+    __slots__ = ('title', 'values', 'format_value')
+
+    def __init__(self, title: str, values, format_value=None):
+        """
+        Initialize a gui.outputview.ResultRows instance.
+
+        :param title: First line of the segment
+        :param values: Sequence of values, e.g. the coefficients of the polynomial
+        :param format_value: Function converting a single value to its text, `utility.parsers.prettify()`
+                             if not given
+        """
+
+        self.title = title
+        self.values = values
+        self.format_value = format_value if format_value is not None else parsers.prettify
+
+
+    def __len__(self) -> int:
+        return len(self.values) + 3
+
+
+    def line(self, index: int) -> str:
+        """
+        Returns the text of the given line of the segment.
+        """
+
+        if index == 0:
+            return self.title
+        if index == 1:
+            return '['
+        if index == len(self.values) + 2:
+            return ']'
+        k = index - 2
+        separator = ',' if k < len(self.values) - 1 else ''
+        return f' {self.format_value(self.values[k])}{separator}'
+
+
+    def iter_lines(self):
+        yield self.title
+        yield '['
+        last = len(self.values) - 1
+        for k, value in enumerate(self.values):
+            yield f' {self.format_value(value)}{"," if k < last else ""}'
+        yield ']'
+
+
+class _TextLines:
+    """
+    Plain text segment, its last line stays open for further appended text.
+    """
+
+    __slots__ = ('lines',)
+
+    def __init__(self, text: str):
+        self.lines = text.split('\n')
+
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+
+    def line(self, index: int) -> str:
+        return self.lines[index]
+
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+    def copy(self) -> '_TextLines':
+        segment = _TextLines('')
+        segment.lines = list(self.lines)
+        return segment
+
+
+# Number of lines written between two progress reports of `OutputView.save()`
+SAVE_PROGRESS_LINES = 1000
+
+
+class OutputView(tk.Frame):
+    """
+    Read-only output widget rendering only the visible window of a possibly huge output.
+
+    Text and `ResultRows` are added with `OutputView.append()`. The vertical scrollbar covers the whole
+    output, while the text widget only ever holds the lines currently on screen.
+    """
+
+    def __init__(self, master: tk.Misc, width: int = 80, height: int = 10):
+        """
+        Initialize a gui.outputview.OutputView instance.
+
+        :param master: Parent widget
+        :param width: Width of the text widget, in characters
+        :type width: int
+        :param height: Number of visible lines
+        :type height: int
+        """
+
+        super().__init__(master)
+
+        self.segments = []
+        self._starts = []
+        self.line_count = 0
+        self.top = 0
+        self.visible_lines = height
+
+        self.text = tk.Text(self, width=width, height=height, wrap='none', state='disabled')
+        self.y_scrollbar = tk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.x_scrollbar = tk.Scrollbar(self, orient='horizontal', command=self.text.xview)
+        self.text.config(xscrollcommand=self.x_scrollbar.set)
+        self.save_button = tk.Button(
+            self,
+            text='Save full result...',
+            command=self.save_dialog
+        )
+        self.save_worker = ComputationWorker(
+            self,
+            on_progress=self.on_save_progress,
+            on_finish=self.on_save_finish
+        )
+
+        self.text.bind('<MouseWheel>', lambda event: self.scroll(-1 if event.delta > 0 else 1, 'units', 3))
+        self.text.bind('<Button-4>', lambda event: self.scroll(-1, 'units', 3))
+        self.text.bind('<Button-5>', lambda event: self.scroll(1, 'units', 3))
+        self.text.bind('<Prior>', lambda event: self.scroll(-1, 'pages'))
+        self.text.bind('<Next>', lambda event: self.scroll(1, 'pages'))
+        self.text.bind('<Configure>', self._on_configure)
+
+        self.build()
+
+
+    def build(self):
+        self.text.grid(
+            row=0, column=0, sticky='nsew'
+        )
+        self.y_scrollbar.grid(
+            row=0, column=1, sticky='ns'
+        )
+        self.x_scrollbar.grid(
+            row=1, column=0, sticky='ew'
+        )
+        self.save_button.grid(
+            row=2, column=0, columnspan=2, sticky='e'
+        )
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+
+    def clear(self) -> None:
+        """
+        Remove the whole output.
+
+        :return: None
+        """
+
+        self.segments = []
+        self._starts = []
+        self.line_count = 0
+        self.top = 0
+        self.render()
+
+
+    def append(self, output) -> None:
+        """
+        Append text or a `ResultRows` segment to the end of the output.
+
+        Text continues the last line of a preceding text segment, like ``tk.Text.insert('end', ...)`` would,
+        while `ResultRows` always start and end on lines of their own.
+
+        :param output: String or `ResultRows`
+        :return: None
+        """
+
+        if isinstance(output, str):
+            if self.segments and isinstance(self.segments[-1], _TextLines):
+                last = self.segments[-1]
+                first, *rest = output.split('\n')
+                last.lines[-1] += first
+                last.lines.extend(rest)
+                self.line_count += len(rest)
+                self.render()
+                return
+            output = _TextLines(output)
+        elif self.segments and isinstance(self.segments[-1], _TextLines) and self.segments[-1].lines[-1] == '':
+            # The empty open line after a trailing newline is taken by the rows instead
+            self.segments[-1].lines.pop()
+            self.line_count -= 1
+            if not self.segments[-1].lines:
+                self.segments.pop()
+                self._starts.pop()
+
+        self._starts.append(self.line_count)
+        self.segments.append(output)
+        self.line_count += len(output)
+        self.render()
+
+
+    def line(self, index: int) -> str:
+        """
+        Returns the text of the given line of the whole output.
+        """
+
+        k = bisect.bisect_right(self._starts, index) - 1
+        return self.segments[k].line(index - self._starts[k])
+
+
+    def iter_lines(self):
+        for segment in self.segments:
+            yield from segment.iter_lines()
+
+
+    def render(self) -> None:
+        """
+        Insert the currently visible window of lines into the text widget and update the scrollbar.
+
+        :return: None
+        """
+
+        self.top = max(0, min(self.top, self.line_count - self.visible_lines))
+        bottom = min(self.line_count, self.top + self.visible_lines)
+
+        self.text.config(state='normal')
+        self.text.delete('1.0', 'end')
+        self.text.insert('1.0', '\n'.join(self.line(i) for i in range(self.top, bottom)))
+        self.text.config(state='disabled')
+
+        if self.line_count:
+            self.y_scrollbar.set(self.top / self.line_count, bottom / self.line_count)
+        else:
+            self.y_scrollbar.set(0, 1)
+
+
+    def scroll(self, number: int, what: str = 'units', step: int = 1) -> str:
+        """
+        Scroll the visible window by a number of lines or pages.
+
+        :return: ``'break'``, so the text widget does not scroll its own contents
+        """
+
+        if what == 'pages':
+            step = max(1, self.visible_lines - 1)
+        self.top += number * step
+        self.render()
+        return 'break'
+
+
+    def yview(self, *args) -> None:
+        """
+        Scrollbar command, accepts the same arguments as ``tk.Text.yview()``.
+        """
+
+        if args[0] == 'moveto':
+            self.top = round(float(args[1]) * self.line_count)
+            self.render()
+        elif args[0] == 'scroll':
+            self.scroll(int(args[1]), args[2])
+
+
+    def _on_configure(self, event=None) -> None:
+        linespace = self.text.tk.call('font', 'metrics', self.text.cget('font'), '-linespace')
+        visible_lines = max(1, self.text.winfo_height() // max(1, int(linespace)))
+        if visible_lines != self.visible_lines:
+            self.visible_lines = visible_lines
+            self.render()
+
+
+    def snapshot(self) -> list:
+        """
+        Returns a copy of the segments, which later appended text does not change.
+        """
+
+        return [segment.copy() if isinstance(segment, _TextLines) else segment for segment in self.segments]
+
+
+    def save(self, path: str, progress=None, segments: list = None) -> None:
+        """
+        Write the whole output to a file, formatting and writing it line by line.
+
+        :param path: Path of the output file
+        :param progress: Optional ``progress(fraction, label)`` callback, called every `SAVE_PROGRESS_LINES` lines
+        :param segments: Segments to write, e.g. from `self.snapshot()`, the current ones by default
+        :return: None
+        """
+
+        if segments is None:
+            segments = self.segments
+        total = sum(len(segment) for segment in segments)
+        lines = itertools.chain.from_iterable(segment.iter_lines() for segment in segments)
+        with open(path, 'w') as file:
+            for k, line in enumerate(lines):
+                if k:
+                    file.write('\n')
+                    if progress is not None and k % SAVE_PROGRESS_LINES == 0:
+                        progress(k / total, 'Saving')
+                file.write(line)
+
+
+    def save_job(self, path: str, segments: list, progress) -> tuple:
+        """
+        Write the segments to a file, see `self.save()`. Runs in `self.save_worker`.
+
+        :return: No outputs
+        """
+
+        self.save(path, progress, segments)
+        return ()
+
+
+    def save_dialog(self) -> None:
+        """
+        Ask for a file name and save the whole output there, in `self.save_worker`. The output is written
+        as it stood when the file was chosen, even if more is appended while it is being saved.
+
+        :return: None
+        """
+
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension='.txt',
+            filetypes=[('Text', '*.txt'), ('All files', '*.*')]
+        )
+        if not path or self.save_worker.running:
+            return
+        segments = self.snapshot()
+        self.save_button.config(state='disabled')
+        self.save_worker.start(lambda progress: self.save_job(path, segments, progress))
+
+
+    def on_save_progress(self, fraction: float, label: str) -> None:
+        self.save_button.config(text=f'{label}... {fraction:.0%}')
+
+
+    def on_save_finish(self, status: str, error: Exception | None) -> None:
+        self.save_button.config(state='normal', text='Save full result...')
+        if status == 'error':
+            messagebox.showerror('Save full result', f'Could not write the file:\n{error}', parent=self)
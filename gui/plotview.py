@@ -0,0 +1,349 @@
+"""
+Plot window module drawing the interpolation polynomial over the whole range of the nodes.
+
+This module defines the `PlotWindow` class, a separate window which samples the polynomial of the App's
+current dataset on a dense grid (`utility.sampling`) in a background `gui.worker.ComputationWorker`,
+reusing the fitted interpolant from the `utility.cache.InterpolantCache` of the App's `gui.jobs.Jobs`.
+In the interval modes, it also draws the envelope enclosing the polynomial.
+
+The samples are reduced to the extremes of every pixel column before drawing, so the canvas only ever
+holds a few thousand points, whatever the size of the grid. Resizing the window redraws the kept samples
+without evaluating them again.
+
+Classes
+-------
+
+    - ``PlotWindow(app)``
+        Window sampling and drawing the polynomial of the App's dataset
+"""
+
+
+import tkinter as tk
+
+from gui.worker import ComputationWorker
+from utility.startup import LazyModule
+
+np = LazyModule('numpy')
+algorithm = LazyModule('utility.algorithm')
+parsers = LazyModule('utility.parsers')
+precision = LazyModule('utility.precision')
+sampling = LazyModule('utility.sampling')
+validation = LazyModule('utility.validation')
+
+
+class PlotWindow(tk.Toplevel):
+    """
+    Window sampling the polynomial of the current dataset of a `gui.core.App` on a dense grid and drawing it.
+    """
+
+    CANVAS_SIZE = (720, 400)
+    MARGIN = 40
+    NODE_RADIUS = 3
+    # Largest number of nodes still marked on the plot
+    MAX_DRAWN_NODES = 1000
+
+    def __init__(self, app):
+        """
+        Initialize a gui.plotview.PlotWindow instance.
+
+        :param app: The gui.core.App instance whose dataset is plotted
+        """
+
+        super().__init__(app.root)
+        self.app = app
+        self.title('Plot')
+
+        self.samples = None
+        self.nodes = None
+
+        self.options_frame = tk.Frame(self)
+        self.points_label = tk.Label(self.options_frame, text='Grid points:')
+        self.points = tk.StringVar(value=str(sampling.DEFAULT_POINTS))
+        self.points_entry = tk.Entry(self.options_frame, textvariable=self.points, width=9)
+        self.range_label = tk.Label(self.options_frame, text='Range (empty: nodes):')
+        self.start = tk.StringVar(value='')
+        self.start_entry = tk.Entry(self.options_frame, textvariable=self.start, width=9)
+        self.stop = tk.StringVar(value='')
+        self.stop_entry = tk.Entry(self.options_frame, textvariable=self.stop, width=9)
+        self.plot_button = tk.Button(
+            self.options_frame,
+            text='Plot',
+            command=self.plot
+        )
+
+        self.canvas = tk.Canvas(
+            self,
+            width=self.CANVAS_SIZE[0],
+            height=self.CANVAS_SIZE[1],
+            background='white'
+        )
+        self.canvas.bind('<Configure>', lambda event: self.draw())
+
+        self.status_label = tk.Label(self, text='', anchor='w', font=('Courier', 8))
+
+        self.worker = ComputationWorker(
+            self,
+            on_output=self.on_output,
+            on_progress=self.on_progress,
+            on_finish=self.on_finish
+        )
+
+        self.protocol('WM_DELETE_WINDOW', self.close)
+        self.build()
+
+
+    def build(self):
+        self.options_frame.grid(
+            row=0, column=0, sticky='w'
+        )
+        self.points_label.grid(
+            row=0, column=0, sticky='w'
+        )
+        self.points_entry.grid(
+            row=0, column=1, sticky='w'
+        )
+        self.range_label.grid(
+            row=0, column=2, sticky='w', padx=(10, 0)
+        )
+        self.start_entry.grid(
+            row=0, column=3, sticky='w'
+        )
+        self.stop_entry.grid(
+            row=0, column=4, sticky='w'
+        )
+        self.plot_button.grid(
+            row=0, column=5, padx=10
+        )
+        self.canvas.grid(
+            row=1, column=0, sticky='nsew'
+        )
+        self.status_label.grid(
+            row=2, column=0, sticky='w'
+        )
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+
+    def plot(self) -> None:
+        """
+        Read the App's entry fields and the plot options and start sampling in the background.
+
+        :return: None
+        """
+
+        if self.worker.running:
+            return
+
+        # [Error] Incorrect plot options
+        try:
+            points = int(self.points.get())
+            start = float(self.start.get()) if self.start.get().strip() else None
+            stop = float(self.stop.get()) if self.stop.get().strip() else None
+        except ValueError:
+            self.status_label.config(text='Incorrect number of grid points or range.')
+            return
+
+        app = self.app
+        mode = app.current_mode.get()
+        parser = app.parser
+        node_order = app.node_order.get()
+        data_x = app.input_gui_x.input_field_entry.get("1.0", "end-1c")
+        data_y = app.input_gui_y.input_field_entry.get("1.0", "end-1c")
+
+        self.plot_button.config(state='disabled')
+        self.status_label.config(text='Sampling...')
+        self.worker.start(
+            lambda progress: self.sample_job(mode, parser, data_x, data_y, points, start, stop, node_order, progress)
+        )
+
+
+    def sample_job(self, mode: str, parser, data_x: str, data_y: str, points: int, start: float | None,
+                   stop: float | None, node_order: str, progress):
+        """
+        Parse the dataset and sample its polynomial. Runs in `self.worker`.
+
+        :return: Generator yielding an error message, or a tuple of the samples and the nodes as float arrays
+        """
+
+        # [Error] Empty field
+        if '' in (data_x, data_y):
+            yield 'The X and Y values must be filled to plot the polynomial.'
+            return
+
+        # Parsed and fitted at the current precision, which an adaptive computation must not change meanwhile
+        with precision.stable_precision(wait=lambda: progress(0, 'Sampling')):
+            errors = []
+            data_x = parsers.safe_parse(
+                parser_func=lambda text: self.app.jobs.parse_field('x', parser, text),
+                data_str=data_x,
+                error_command=errors.append,
+                error_message='Incorrect data format in field \'X values\': {}'
+            )
+            data_y = parsers.safe_parse(
+                parser_func=lambda text: self.app.jobs.parse_field('y', parser, text),
+                data_str=data_y,
+                error_command=errors.append,
+                error_message='Incorrect data format in field \'Y values\': {}'
+            )
+            if errors:
+                yield ' '.join(errors)
+                return
+
+            # [Error] Dataset sizes mismatch, duplicates or overlapping intervals in X
+            error = validation.validate_dataset(data_x, data_y, data_x[:1])
+            if error is not None:
+                yield error
+                return
+
+            indices = validation.node_order(data_x, node_order)
+            data_x = validation.reorder(data_x, indices)
+            data_y = validation.reorder(data_y, indices)
+
+            if mode == 'fast_real':
+                node_x, node_y = data_x, data_y
+            else:
+                interpolant = self.app.jobs.interpolant_cache.get_or_fit(
+                    mode,
+                    data_x,
+                    data_y,
+                    fit=lambda x, y: algorithm.BarycentricInterpolant(
+                        x, y, progress=lambda f: progress(f, 'Lagrange weights')
+                    ),
+                    wait=lambda: progress(0, 'Lagrange weights')
+                )
+                node_x, _, node_y = (np.array(data) for data in interpolant.float_data())
+
+            if start is None:
+                start = float(node_x.min())
+            if stop is None:
+                stop = float(node_x.max())
+
+            # [Error] Incorrect grid (raised by utility.sampling)
+            try:
+                if mode == 'fast_real':
+                    samples = sampling.sample_fast_real(node_x, node_y, start, stop, points)
+                else:
+                    progress(0, 'Envelope')
+                    samples = sampling.sample_interpolant(
+                        interpolant, start, stop, points,
+                        progress=lambda f: progress(f, 'Envelope')
+                    )
+            except ValueError as error:
+                yield str(error)
+                return
+
+            yield samples, node_x, node_y
+
+
+    def on_output(self, output) -> None:
+        if isinstance(output, str):
+            self.status_label.config(text=output)
+            return
+        self.samples, *self.nodes = output
+        self.draw()
+
+
+    def on_progress(self, fraction: float, label: str) -> None:
+        self.status_label.config(text=f'{label}: {fraction:.0%}')
+
+
+    def on_finish(self, status: str, error: Exception | None) -> None:
+        self.plot_button.config(state='normal')
+        if status == 'error':
+            self.status_label.config(text=f'Plotting failed: {error}')
+
+
+    def _value_range(self, lows: 'np.ndarray', highs: 'np.ndarray') -> tuple:
+        """
+        Returns the range of the vertical axis, covering the finite values of the curve and the nodes
+        within the plotted range. The envelope is clipped to it, as it may be much wider than the curve.
+        """
+
+        values = np.concatenate([lows, highs])
+        node_x, node_y = self.nodes
+        inside = (node_x >= self.samples.start) & (node_x <= self.samples.stop)
+        values = np.concatenate([values, node_y[inside]])
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return -1.0, 1.0
+
+        bottom, top = float(values.min()), float(values.max())
+        if bottom == top:
+            return bottom - 1, top + 1
+        padding = (top - bottom) * 0.05
+        return bottom - padding, top + padding
+
+
+    def draw(self) -> None:
+        """
+        Draw the kept samples, decimated to the current width of the canvas.
+
+        :return: None
+        """
+
+        self.canvas.delete('all')
+        samples = self.samples
+        if samples is None:
+            return
+
+        width = max(self.canvas.winfo_width(), self.CANVAS_SIZE[0] // 4)
+        height = max(self.canvas.winfo_height(), self.CANVAS_SIZE[1] // 4)
+        columns = max(1, width - 2 * self.MARGIN)
+        rows = max(1, height - 2 * self.MARGIN)
+
+        curve_columns, lows, highs = sampling.decimate(
+            samples.grid, samples.values, samples.values, samples.start, samples.stop, columns
+        )
+        bottom, top = self._value_range(lows, highs)
+
+        def to_y(values):
+            # Clipping keeps infinite and huge values of the envelope on the canvas
+            scaled = (top - np.nan_to_num(values, nan=bottom)) * (rows / (top - bottom))
+            return self.MARGIN + np.clip(scaled, -self.MARGIN, rows + self.MARGIN)
+
+        if samples.has_envelope:
+            envelope_columns, lower, upper = sampling.decimate(
+                samples.envelope_grid, samples.lower, samples.upper, samples.start, samples.stop, columns
+            )
+            x = self.MARGIN + envelope_columns
+            outline = np.concatenate([
+                np.column_stack([x, to_y(upper)]).ravel(),
+                np.column_stack([x[::-1], to_y(lower)[::-1]]).ravel()
+            ])
+            if len(x) > 1:
+                self.canvas.create_polygon(*outline.tolist(), fill='#cfe2f3', outline='#9fc5e8')
+
+        # Vertical stroke from the minimum to the maximum of every column, joined into one line
+        x = np.repeat(self.MARGIN + curve_columns, 2)
+        y = np.column_stack([to_y(lows), to_y(highs)]).ravel()
+        if len(x) > 1:
+            self.canvas.create_line(*np.column_stack([x, y]).ravel().tolist(), fill='#1c4587')
+
+        node_x, node_y = self.nodes
+        inside = (node_x >= samples.start) & (node_x <= samples.stop)
+        if np.count_nonzero(inside) <= self.MAX_DRAWN_NODES:
+            span = samples.stop - samples.start
+            for x_, y_ in zip((node_x[inside] - samples.start) * (columns / span) + self.MARGIN,
+                              to_y(node_y[inside])):
+                r = self.NODE_RADIUS
+                self.canvas.create_oval(x_ - r, y_ - r, x_ + r, y_ + r, fill='#cc0000', outline='')
+
+        self.canvas.create_rectangle(self.MARGIN, self.MARGIN, self.MARGIN + columns, self.MARGIN + rows,
+                                     outline='gray60')
+        for text, x_, y_, anchor in ((f'{samples.start:.6g}', self.MARGIN, self.MARGIN + rows + 4, 'nw'),
+                                     (f'{samples.stop:.6g}', self.MARGIN + columns, self.MARGIN + rows + 4, 'ne'),
+                                     (f'{top:.6g}', self.MARGIN + 4, self.MARGIN + 4, 'nw'),
+                                     (f'{bottom:.6g}', self.MARGIN + 4, self.MARGIN + rows - 4, 'sw')):
+            self.canvas.create_text(x_, y_, text=text, anchor=anchor, font=('Courier', 8))
+
+        envelope = (f', envelope: {len(samples.envelope_grid):,} points'
+                    if samples.has_envelope else '')
+        self.status_label.config(
+            text=f'{len(samples.grid):,} points drawn as {len(curve_columns):,} columns{envelope}'
+        )
+
+
+    def close(self) -> None:
+        self.worker.cancel()
+        self.app.plot_window = None
+        self.destroy()
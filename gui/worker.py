@@ -0,0 +1,140 @@
+"""
+Background computation module keeping the GUI responsive during long computations.
+
+This module defines the `ComputationWorker` class, which runs a job in a background thread and hands its
+outputs and progress over to the Tk main thread, as well as the `ComputationCancelled` exception used
+to abort a running job.
+
+A job is a callable taking a single ``progress(fraction, label)`` callback and returning an iterable of outputs.
+Every output is delivered to the main thread as soon as the job yields it, so the results of consecutive
+stages can be displayed one by one. The ``progress`` callback may be passed down into the numeric kernels
+of `utility.algorithm`, as it raises `ComputationCancelled` once the job has been cancelled.
+"""
+
+
+import queue
+import threading
+import tkinter as tk
+
+
+class ComputationCancelled(Exception):
+    """
+    Raised inside a running job once `ComputationWorker.cancel()` has been called.
+    """
+
+
+class ComputationWorker:
+    """
+    Runs one job at a time in a background thread and reports back to the Tk main thread.
+
+    All callbacks are called from the Tk main thread, by polling a queue with ``root.after()``,
+    so they may safely update widgets.
+    """
+
+    def __init__(self,
+                 root: tk.Misc,
+                 on_output = lambda output: None,
+                 on_progress = lambda fraction, label: None,
+                 on_finish = lambda status, error: None,
+                 poll_interval: int = 50):
+        """
+        Initialize a gui.worker.ComputationWorker instance.
+
+        :param root: Any tkinter widget, used for scheduling the polling on the main thread
+        :param on_output: Called with every output yielded by the job
+        :param on_progress: Called with the fraction (0 to 1) and the label of the job's current stage
+        :param on_finish: Called with the status ('done', 'cancelled' or 'error') and the exception, if any
+        :param poll_interval: Time between queue polls, in milliseconds
+        :type poll_interval: int
+        """
+
+        self.root = root
+        self.on_output = on_output
+        self.on_progress = on_progress
+        self.on_finish = on_finish
+        self.poll_interval = poll_interval
+
+        self._queue = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+
+    def start(self, job) -> None:
+        """
+        Start running the job in a background thread.
+
+        :param job: Callable taking a ``progress(fraction, label)`` callback and returning an iterable of outputs
+        :raises RuntimeError: If another job is still running.
+        :return: None
+        """
+
+        if self.running:
+            raise RuntimeError('A computation is already running.')
+
+        self._cancel_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(job,), daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_interval, self._poll)
+
+
+    def cancel(self) -> None:
+        """
+        Request the running job to stop. The job stops at its next progress report or output.
+
+        :return: None
+        """
+
+        self._cancel_event.set()
+
+
+    def _progress(self, fraction: float, label: str = '') -> None:
+        if self._cancel_event.is_set():
+            raise ComputationCancelled()
+        self._queue.put(('progress', (fraction, label)))
+
+
+    def _run(self, job) -> None:
+        try:
+            for output in job(self._progress):
+                if self._cancel_event.is_set():
+                    raise ComputationCancelled()
+                self._queue.put(('output', output))
+        except ComputationCancelled:
+            self._queue.put(('finish', ('cancelled', None)))
+        except Exception as e:
+            self._queue.put(('finish', ('error', e)))
+        else:
+            self._queue.put(('finish', ('done', None)))
+
+
+    def _poll(self) -> None:
+        # Only the latest progress report matters, older ones are skipped
+        progress = None
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'progress':
+                progress = payload
+                continue
+            if progress is not None:
+                self.on_progress(*progress)
+                progress = None
+
+            if kind == 'output':
+                self.on_output(payload)
+            elif kind == 'finish':
+                self._thread = None
+                self.on_finish(*payload)
+                return
+
+        if progress is not None:
+            self.on_progress(*progress)
+        self.root.after(self.poll_interval, self._poll)
@@ -3,22 +3,86 @@ Main running file of the app.
 
 Contains the definition of the app's root window and initialization of core.App, that further handles
 all application processes.
+
+Running ``python main.py batch <input>`` starts the headless batch mode (`utility.batch`) instead,
+which never imports tkinter.
+
+The window is shown before the numeric stack is imported, see `utility.startup`. Running
+``python main.py --profile-startup`` prints where the cold start's time went to stderr, once the window is
+shown and the numeric stack is loaded.
 """
 
 
-from gui.core import App
-import tkinter as tk
+import time
+
+START_TIME = time.perf_counter()
+
+import argparse
 import ctypes
 import platform
+import sys
+
+from utility import batch
+
+
+def parse_arguments(argv=None) -> argparse.Namespace:
+    """
+    Parse the command line arguments. Without any subcommand the GUI is started.
+
+    :param argv: Command line arguments, ``sys.argv[1:]`` if not given
+    :return: Parsed arguments
+    """
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description='EAN-NevLag25 interpolation app.')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='print the time of every startup phase and the slowest imports to stderr')
+    subparsers = parser.add_subparsers(dest='command')
+
+    # Building the batch options does not import the numeric stack, only running the batch mode does
+    batch.build_argument_parser(subparsers.add_parser('batch', help='run many datasets without the GUI'))
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Run the subcommand given on the command line, or start the GUI if there is none.
 
+    :param argv: Command line arguments, ``sys.argv[1:]`` if not given
+    :return: Exit code
+    """
+
+    args = parse_arguments(argv)
+    if args.command == 'batch':
+        return batch.run(args)
+
+    if args.profile_startup:
+        profile_gui()
+    else:
+        run_gui()
+    return 0
 
-def main():
+
+def run_gui(phase=None, on_preloaded=None):
     """
     Initialize the root window and gui.App, build the App and display inside the window.
 
+    :param phase: Optional callable, called with the name of every startup phase once it is done
+    :param on_preloaded: Optional callable, called once the numeric stack is imported in the background
     :return: None
     """
 
+    if phase is None:
+        phase = lambda name: None
+
+    import tkinter as tk
+    phase('tkinter imported')
+    from gui.core import App
+    phase('gui.core imported')
+
     # Set the windows taskbar icon
     if platform.system() == 'Windows':
         myappid = "favkescompany.favkesapp.v1"
@@ -37,13 +101,39 @@ def main():
     # Set the window bar icon
     if platform.system() == 'Windows':
         root.iconbitmap("gui/icon.ico")
+    phase('root window created')
 
     # Initialize app
     app = App(root)
     app.build()
+    phase('app built')
     # app.debug_mode()
-    app.display()
+    root.after_idle(lambda: phase('window shown'))
+    app.display(on_preloaded=on_preloaded)
+
+
+def profile_gui():
+    """
+    Start the GUI while recording the time of every import and startup phase, and print the report to stderr
+    once the numeric stack is preloaded.
+
+    :return: None
+    """
+
+    from utility import startup
+
+    phases = [('arguments parsed', time.perf_counter() - START_TIME)]
+
+    def phase(name):
+        phases.append((name, time.perf_counter() - START_TIME))
+
+    def on_preloaded():
+        phase('numeric stack preloaded')
+        print(startup.report(profiler, phases), file=sys.stderr, flush=True)
+
+    with startup.ImportProfiler() as profiler:
+        run_gui(phase, on_preloaded)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
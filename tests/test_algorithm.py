@@ -0,0 +1,224 @@
+import random
+
+import numpy as np
+import pytest
+from mpmath import iv, mp
+
+from utility import algorithm, fastreal, floatinterval, precision
+from utility.intervalvector import IntervalVector
+
+
+NODES = [mp.mpf(k) / 4 - 2 for k in range(17)]
+VALUES = [mp.sin(x) + x ** 3 / 7 for x in NODES]
+POINTS = [mp.mpf('-1.9'), mp.mpf('-0.3'), mp.mpf('0.25'), mp.mpf('1.7'), NODES[5]]
+
+# Largest relative deviation accepted between two real evaluations at the default 64-bit precision
+TOLERANCE = mp.mpf(2) ** -50
+
+
+def reference_neville(arr_x, arr_y, z):
+    """
+    The textbook form of Neville's algorithm, without any shared differences.
+    """
+    y_ = list(arr_y)
+    n = len(arr_x)
+    for i in range(1, n):
+        for j in range(n - i):
+            y_[j] = ((z - arr_x[i + j]) * y_[j] + (arr_x[j] - z) * y_[j + 1]) / (arr_x[j] - arr_x[i + j])
+    return y_[0]
+
+
+def reference_coefficients(arr_x, arr_y):
+    """
+    The original O(n^3) coefficients, multiplying out every basis polynomial on its own.
+    """
+    dtype = type(arr_x[0])
+    out = [dtype(0)] * len(arr_x)
+    for i in range(len(arr_x)):
+        coeffs = [dtype(1)]
+        denominator = dtype(1)
+        for j in range(len(arr_x)):
+            if i == j: continue
+            coeffs_tmp = [dtype(0)] * (len(coeffs) + 1)
+            for k in range(len(coeffs)):
+                coeffs_tmp[k] -= coeffs[k] * arr_x[j]
+                coeffs_tmp[k + 1] += coeffs[k]
+            coeffs = coeffs_tmp
+            denominator *= arr_x[i] - arr_x[j]
+        scale = arr_y[i] / denominator
+        for j in range(len(coeffs)):
+            out[j] += coeffs[j] * scale
+    return out
+
+
+def assert_close(values, expected):
+    for value, reference in zip(values, expected, strict=True):
+        assert abs(value - reference) <= TOLERANCE * max(1, abs(reference))
+
+
+def as_intervals(values, radius=0):
+    return [iv.mpf([value - radius, value + radius]) for value in values]
+
+
+def enclose(intervals, values) -> bool:
+    return all(interval.a <= value <= interval.b for interval, value in zip(intervals, values, strict=True))
+
+
+def test_barycentric_matches_baseline_lagrange():
+    interpolant = algorithm.BarycentricInterpolant(NODES, VALUES)
+    expected = [algorithm.lagrange(NODES, VALUES, [z]) for z in POINTS]
+
+    assert_close(interpolant.evaluate_many(POINTS), expected)
+    assert_close([interpolant(z) for z in POINTS], expected)
+
+
+def test_neville_matches_baseline():
+    expected = [reference_neville(NODES, VALUES, z) for z in POINTS]
+
+    assert_close(algorithm.neville_many(NODES, VALUES, POINTS), expected)
+    assert_close([algorithm.neville(NODES, VALUES, [z]) for z in POINTS], expected)
+    assert_close(algorithm.BarycentricInterpolant(NODES, VALUES).neville_many(POINTS), expected)
+
+
+def test_neville_without_difference_table(monkeypatch):
+    monkeypatch.setattr(algorithm, 'NEVILLE_TABLE_MAX_NODES', 0)
+    expected = [reference_neville(NODES, VALUES, z) for z in POINTS]
+
+    assert_close(algorithm.neville_many(NODES, VALUES, POINTS), expected)
+
+
+def test_neville_tableau_ends_with_the_value():
+    values, tableaus = algorithm.neville_many(NODES, VALUES, POINTS[:2], tableau=True)
+
+    assert [tableau[-1][0] for tableau in tableaus] == values
+    assert tableaus[0][0] == VALUES
+
+
+def test_weights_from_differences_are_identical():
+    differences = algorithm.neville_differences(NODES)
+
+    assert algorithm.weights_from_differences(NODES, differences) == algorithm.barycentric_weights(NODES)
+
+
+def test_coefficients_reproduce_the_values():
+    coefficients = algorithm.lagrange_coefficients(NODES, VALUES)
+    expected = [algorithm.lagrange(NODES, VALUES, [z]) for z in POINTS]
+
+    assert_close([algorithm.horner(coefficients, z) for z in POINTS], expected)
+
+
+@pytest.mark.parametrize('interval', [False, True])
+def test_tight_coefficients_match_the_baseline(interval):
+    arr_x, arr_y = (as_intervals(NODES), as_intervals(VALUES)) if interval else (NODES, VALUES)
+    expected = reference_coefficients(arr_x, arr_y)
+
+    assert algorithm.lagrange_coefficients(arr_x, arr_y, tight=True) == expected
+    assert algorithm.BarycentricInterpolant(arr_x, arr_y).coefficients(tight=True) == expected
+    assert algorithm.IncrementalInterpolant(arr_x, arr_y).coefficients(tight=True) == expected
+
+
+def test_interval_coefficients_stay_close_to_the_baseline_width():
+    arr_x = as_intervals(NODES)
+    arr_y = [iv.sin(x) + x ** 3 / 7 for x in arr_x]
+    pairs = list(zip(algorithm.lagrange_coefficients(arr_x, arr_y), reference_coefficients(arr_x, arr_y)))
+    # The constant coefficient is the exact value at the node 0 in both
+    ratios = [mp.mpf(fast.delta) / mp.mpf(tight.delta) for fast, tight in pairs[1:]]
+
+    assert max(ratios) < 2 and sum(ratios) / len(ratios) < 1.5
+
+
+def test_incremental_interpolant_matches_a_new_fit():
+    interpolant = algorithm.IncrementalInterpolant(NODES[:-1], VALUES[:-1])
+    interpolant.insert(NODES[-1], VALUES[-1])
+    interpolant.remove(3)
+    nodes, values = NODES[:3] + NODES[4:], VALUES[:3] + VALUES[4:]
+
+    assert_close(interpolant.evaluate_many(POINTS), [algorithm.lagrange(nodes, values, [z]) for z in POINTS])
+    assert_close(interpolant.coefficients(), algorithm.lagrange_coefficients(nodes, values))
+
+
+def test_incremental_interpolant_rejects_duplicate_nodes():
+    interpolant = algorithm.IncrementalInterpolant(NODES[:4], VALUES[:4])
+    with pytest.raises(ValueError, match='#3'):
+        interpolant.insert(NODES[2], VALUES[0])
+
+    intervals = algorithm.IncrementalInterpolant(as_intervals(NODES[:4], mp.mpf('0.01')), as_intervals(VALUES[:4]))
+    with pytest.raises(ValueError, match='#2'):
+        intervals.insert(iv.mpf([NODES[1] + mp.mpf('0.005'), 10]), iv.mpf(0))
+
+    # Nothing was changed by the rejected nodes, and workers are accepted like by a new fit
+    assert len(interpolant) == len(intervals) == 4
+    assert interpolant.coefficients(workers=2) == interpolant.coefficients()
+
+
+def test_interpolate_all_has_the_same_signature_in_every_backend():
+    interpolant = algorithm.BarycentricInterpolant(NODES, VALUES)
+    expected = (interpolant.evaluate_many(POINTS), interpolant.neville_many(POINTS), interpolant.coefficients())
+    floats = [np.array([float(value) for value in data]) for data in (NODES, VALUES, POINTS)]
+    intervals = [as_intervals(data) for data in (NODES, VALUES, POINTS)]
+
+    for module, data in ((algorithm, (NODES, VALUES, POINTS)), (fastreal, floats), (floatinterval, intervals)):
+        fractions = []
+        results = module.interpolate_all(*data, progress=fractions.append, workers=2)
+        assert len(results) == 3 and fractions and fractions == sorted(fractions), module.__name__
+        for result, reference in zip(results, expected, strict=True):
+            assert len(result) == len(reference)
+    assert algorithm.interpolate_all(NODES, VALUES, POINTS) == expected
+
+
+def test_fast_real_matches_baseline():
+    arr_x, arr_y, arr_z = (np.array([float(value) for value in data]) for data in (NODES, VALUES, POINTS))
+    expected = np.array([float(algorithm.lagrange(NODES, VALUES, [z])) for z in POINTS])
+
+    np.testing.assert_allclose(fastreal.lagrange(arr_x, arr_y, arr_z), expected, rtol=1e-12)
+    np.testing.assert_allclose(fastreal.neville(arr_x, arr_y, arr_z), expected, rtol=1e-12)
+
+
+def test_fast_real_coefficients_stay_finite():
+    wide = np.linspace(-1000, 1000, 120)
+    coefficients = fastreal.lagrange_coefficients(wide, np.cos(wide / 300))
+    with precision.working_precision(2000):
+        exact = algorithm.lagrange_coefficients([mp.mpf(x) for x in wide], [mp.mpf(y) for y in np.cos(wide / 300)])
+    # Deflating the master polynomial both ways keeps the coefficients accurate, not just finite
+    assert np.isfinite(coefficients).all()
+    assert np.abs(coefficients - np.array(exact, dtype=float)).max() < 1e-12
+
+    # The powers of a tiny spread are not flushed to zero either
+    narrow = np.linspace(-1e-3, 1e-3, 8)
+    coefficients = fastreal.lagrange_coefficients(narrow, narrow ** 3)
+    assert coefficients[3] == pytest.approx(1, rel=1e-6) and np.isfinite(coefficients).all()
+
+
+@pytest.mark.parametrize('radius', [0, mp.mpf('1e-6')])
+def test_vector_lagrange_matches_the_scalar_intervals(radius):
+    arr_x, arr_y = as_intervals(NODES), as_intervals(VALUES, radius)
+    vector = IntervalVector.from_intervals(arr_x)
+
+    for z in as_intervals(POINTS):
+        assert algorithm.lagrange(vector, arr_y, [z]) == algorithm.lagrange(arr_x, arr_y, [z])
+
+
+@pytest.mark.parametrize('radius', [0, mp.mpf('1e-6')])
+def test_interval_results_enclose_the_exact_ones(radius):
+    arr_x, arr_y, arr_z = as_intervals(NODES), as_intervals(VALUES, radius), as_intervals(POINTS)
+    interpolant = algorithm.BarycentricInterpolant(arr_x, arr_y)
+    results = {
+        'lagrange': [algorithm.lagrange(arr_x, arr_y, [z]) for z in arr_z],
+        'neville': algorithm.neville_many(arr_x, arr_y, arr_z),
+        'vector neville': algorithm.neville_many(IntervalVector.from_intervals(arr_x), arr_y, arr_z),
+        'vector lagrange': [algorithm.lagrange(IntervalVector.from_intervals(arr_x), arr_y, [z]) for z in arr_z],
+        'evaluate_many': interpolant.evaluate_many(arr_z),
+    }
+    coefficients = algorithm.lagrange_coefficients(arr_x, arr_y)
+
+    # Exact results for values anywhere in the intervals, computed at a much higher precision
+    generator = random.Random(0)
+    for _ in range(3):
+        with precision.working_precision(256):
+            values = [value + radius * mp.mpf(generator.uniform(-1, 1)) for value in VALUES]
+            exact = [algorithm.lagrange(NODES, values, [z]) for z in POINTS]
+            exact_coefficients = algorithm.lagrange_coefficients(NODES, values)
+
+            for name, result in results.items():
+                assert enclose(result, exact), name
+            assert enclose(coefficients, exact_coefficients)
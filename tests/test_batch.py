@@ -0,0 +1,114 @@
+import io
+import json
+
+import pytest
+from mpmath import mp
+
+from utility import batch, datafile, parsers, precision
+
+
+ROWS = [
+    {'x': '1, 2, 3', 'y': '1, 4, 9', 'z': '1.5, 4'},
+    {'x': [[0, 0], [1, 1]], 'y': [[1, 2], [3, 4]], 'z': [[0.5, 0.5]], 'mode': 'interval'},
+    {'x': '1, 2, 3', 'y': '1, 4', 'z': '1'},
+    {'x': '0, 1, 2', 'y': '1, 2, 5', 'z': '3', 'mode': 'fast_real'},
+    {'x': '1, 2, 3', 'y': '1, 4, 9', 'z': '0.5', 'tolerance': 1e-20},
+    {'x': '1, 2, 3', 'y': '1, 4, 9', 'z': '0.5', 'tolerance': 'small'},
+]
+
+
+def run(path, workers: int = 1, **options) -> tuple:
+    output = io.StringIO()
+    failed = batch.run_batch(batch.read_datasets(str(path), **options), output, workers=workers)
+    return failed, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def write_jsonl(tmp_path, lines) -> str:
+    path = tmp_path / 'datasets.jsonl'
+    path.write_text('\n'.join(line if isinstance(line, str) else json.dumps(line) for line in lines) + '\n')
+    return str(path)
+
+
+def test_jsonl_results_in_input_order(tmp_path):
+    failed, results = run(write_jsonl(tmp_path, ROWS))
+
+    assert [result['index'] for result in results] == list(range(len(ROWS)))
+    assert failed == 2
+
+    real = results[0]
+    assert real['mode'] == 'real'
+    assert [mp.mpf(value) for value in real['lagrange']] == [mp.mpf('2.25'), mp.mpf(16)]
+    assert [mp.mpf(value) for value in real['neville']] == [mp.mpf('2.25'), mp.mpf(16)]
+    assert [mp.mpf(value) for value in real['coefficients']] == [0, 0, 1]
+
+    assert results[1]['mode'] == 'interval' and len(results[1]['lagrange']) == 1
+    assert 'error' in results[2]
+    assert results[3]['lagrange'] == pytest.approx([10.0])
+    assert results[4]['converged'] and results[4]['precision'] >= 64
+    assert 'tolerance' in results[5]['error']
+
+
+def test_malformed_rows_do_not_abort_the_batch(tmp_path):
+    path = write_jsonl(tmp_path, [ROWS[0], '{"x": "1, 2"', '[1, 2]', ROWS[0]])
+    failed, results = run(path)
+
+    assert failed == 2
+    assert [('error' in result) for result in results] == [False, True, True, False]
+    assert results[1]['error'].startswith('Incorrect dataset row')
+
+
+def test_process_pool_keeps_the_order(tmp_path):
+    rows = [{'x': '1, 2, 3', 'y': f'1, {k}, 9', 'z': '2'} for k in range(12)]
+    failed, results = run(write_jsonl(tmp_path, rows), workers=2)
+
+    assert failed == 0
+    assert [mp.mpf(result['lagrange'][0]) for result in results] == list(range(12))
+
+
+def test_csv_input(tmp_path):
+    path = tmp_path / 'datasets.csv'
+    path.write_text('x,y,z,mode\n"1,2,3","1,4,9",2.5,real\n"[1;1],[2;2]","[0;1],[1;2]","[1.5;1.5]",interval\n')
+    failed, results = run(path)
+
+    assert failed == 0
+    assert mp.mpf(results[0]['lagrange'][0]) == mp.mpf('6.25')
+    assert results[1]['mode'] == 'interval'
+
+
+def test_dataset_and_column_files(tmp_path):
+    path = str(tmp_path / f'data{datafile.EXTENSION}')
+    datafile.save(path, 'real', parsers.parse_real('0, 1, 2'), parsers.parse_real('0, 1, 4'), parsers.parse_real('3'))
+
+    assert run(path)[1][0]['lagrange'] == ['9.0']
+    assert run(write_jsonl(tmp_path, [{'dataset': path, 'z': '5'}]))[1][0]['lagrange'] == ['9.0']
+
+    # The values and the remaining fields are computed at the precision stored in the file
+    with precision.working_precision(200):
+        data_x = parsers.parse_real('0, 1, 2')
+        datafile.save(path, 'real', data_x, [x ** 2 / 3 for x in data_x], [], precision=200)
+        expected = str(mp.mpf(1) / 12)
+    result = run(write_jsonl(tmp_path, [{'dataset': path, 'z': '0.5'}]))[1][0]
+    assert result['precision'] == 200 and result['lagrange'] == [expected] and len(expected) > 50
+
+    columns = tmp_path / 'columns.csv'
+    columns.write_text('t,value\n0,0\n1,1\n2,4\n')
+    records = list(batch.read_datasets(str(columns), 'columns', ('t', 'value')))
+    records[0].update(mode='real', z='3')
+    output = io.StringIO()
+    assert batch.run_batch(records, output, workers=1) == 0
+    assert json.loads(output.getvalue())['lagrange'] == ['9.0']
+
+def test_unexpected_errors_stay_with_their_dataset(tmp_path, monkeypatch):
+    run_dataset = batch.run_dataset
+
+    def failing(record):
+        if record['z'] == '0':
+            raise ZeroDivisionError('boom')
+        return run_dataset(record)
+
+    monkeypatch.setattr(batch, 'run_dataset', failing)
+    failed, results = run(write_jsonl(tmp_path, [ROWS[0], {**ROWS[0], 'z': '0'}, ROWS[0]]))
+
+    assert failed == 1
+    assert results[1]['error'] == 'Unexpected error: ZeroDivisionError: boom'
+    assert results[2]['lagrange'] == results[0]['lagrange']
@@ -0,0 +1,41 @@
+import json
+
+from benchmarks import suite
+from gui.arithmeticmodes import parser_modes_map
+
+
+def test_datasets_parse_in_every_mode():
+    for mode in ('real', 'interval', 'singleton'):
+        data_x, data_y, data_z = (parser_modes_map[mode](text) for text in suite.make_dataset(7, mode))
+        assert len(data_x) == len(data_y) == 7 and len(data_z) == 1
+
+
+def test_run_suite():
+    results = suite.run_suite(nodes=(5, 20), modes=('real', 'interval'), precisions=(64,), budget=0,
+                              quadratic_limit=10)
+
+    cases = {(result['name'], result['mode'], result['nodes']) for result in results['results']}
+    assert ('lagrange', 'real', 5) in cases and ('sci_str', 'real', 20) in cases
+    assert ('lagrange', 'real', 20) not in cases and ('parse', 'interval', 20) in cases
+    assert all(result['repeats'] == 1 and result['seconds'] >= 0 for result in results['results'])
+    assert set(results['meta']) == {'python', 'mpmath', 'platform', 'timestamp'}
+
+
+def test_compare_flags_regressions():
+    def run(*seconds):
+        return {'results': [{'name': name, 'mode': 'real', 'nodes': 10, 'precision': 64, 'seconds': value}
+                            for name, value in zip(('a', 'b', 'c'), seconds)]}
+
+    rows = suite.compare(run(1.0, 1.0), run(1.1, 1.5, 9.0), threshold=0.2)
+
+    assert [(key[0], regressed) for key, _, _, _, regressed in rows] == [('a', False), ('b', True)]
+
+
+def test_command_line(tmp_path, capsys):
+    output = tmp_path / 'results.json'
+    assert suite.main(['run', '-o', str(output), '--nodes', '5', '--modes', 'real', '--precisions', '64',
+                       '--only', 'lagrange', '--budget', '0']) == 0
+    assert [result['name'] for result in json.loads(output.read_text())['results']] == ['lagrange']
+
+    assert suite.main(['compare', str(output), str(output)]) == 0
+    assert '1 benchmarks compared, 0 regressions.' in capsys.readouterr().out
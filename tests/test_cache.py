@@ -0,0 +1,186 @@
+import threading
+
+import pytest
+from mpmath import mp
+
+from utility import algorithm, precision
+from utility.cache import InterpolantCache, approximate_nbytes, dataset_digest
+
+
+def dataset(k: int, n: int = 3) -> tuple:
+    return [mp.mpf(j) for j in range(n)], [mp.mpf(k + j) for j in range(n)]
+
+
+def fit_all(cache, keys, **kwargs) -> list:
+    return [cache.get_or_fit('real', *dataset(k, **kwargs)) for k in keys]
+
+
+def cached(cache, k: int, n: int = 3) -> bool:
+    return cache.contains('real', *dataset(k, n))
+
+
+def test_hits_and_misses():
+    cache = InterpolantCache()
+    first = cache.get_or_fit('real', *dataset(0))
+
+    assert cache.get_or_fit('real', *dataset(0)) is first
+    assert cache.get_or_fit('interval', *dataset(0)) is not first
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 2, 0)
+    assert cache.stats()['entries'] == len(cache) == 2
+
+
+def test_digest_depends_on_the_exact_values():
+    x, y = dataset(1)
+
+    assert dataset_digest(x, y) == dataset_digest(list(x), list(y))
+    assert dataset_digest(x, y) != dataset_digest(y, x)
+    assert dataset_digest(x, y) != dataset_digest(x, y[:-1] + [y[-1] + mp.mpf(2) ** -60])
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = InterpolantCache(max_entries=2)
+    first, second = fit_all(cache, [0, 1])
+    # Using the first entry makes the second one the least recently used
+    assert cache.get_or_fit('real', *dataset(0)) is first
+    fit_all(cache, [2])
+
+    assert len(cache) == 2 and cache.evictions == 1
+    assert cached(cache, 0) and cached(cache, 2)
+    assert not cached(cache, 1)
+
+
+def test_eviction_by_size():
+    sizes = [approximate_nbytes(interpolant) for interpolant in fit_all(InterpolantCache(), [0, 1])]
+    cache = InterpolantCache(max_bytes=sum(sizes) - 1)
+    fit_all(cache, [0, 1])
+
+    assert len(cache) == 1 and cache.evictions == 1
+    assert cache.stats()['bytes'] == sizes[1]
+
+    # The most recently stored entry is kept even if it alone exceeds the limit
+    cache.max_bytes = 1
+    fit_all(cache, [2])
+    assert len(cache) == 1 and cached(cache, 2)
+
+
+def test_refresh_size_accounts_for_lazily_computed_values():
+    cache = InterpolantCache()
+    interpolant, = fit_all(cache, [0], n=20)
+    before = cache.stats()['bytes']
+    interpolant.coefficients()
+
+    assert cache.stats()['bytes'] == before
+    cache.refresh_size('real', *dataset(0, n=20))
+    assert cache.stats()['bytes'] == approximate_nbytes(interpolant) > before
+
+    # Unknown datasets are ignored
+    cache.refresh_size('real', *dataset(1))
+    assert len(cache) == 1
+
+
+def test_refresh_size_evicts():
+    cache = InterpolantCache()
+    _, interpolant = fit_all(cache, [0, 1], n=20)
+    cache.max_bytes = cache.stats()['bytes']
+    interpolant.coefficients()
+    cache.refresh_size('real', *dataset(1, n=20))
+
+    assert cache.evictions == 1
+    assert cached(cache, 1, 20) and not cached(cache, 0, 20)
+
+
+def start_blocked_fit(cache, fails: bool = False) -> tuple:
+    """
+    Starts fitting dataset 0 in another thread, blocked until the returned event is set.
+    """
+    started, release = threading.Event(), threading.Event()
+
+    def fit(arr_x, arr_y):
+        started.set()
+        release.wait(5)
+        if fails:
+            raise RuntimeError('fit failed')
+        return algorithm.BarycentricInterpolant(arr_x, arr_y)
+
+    results = []
+
+    def run():
+        try:
+            results.append(cache.get_or_fit('real', *dataset(0), fit=fit))
+        except RuntimeError as error:
+            results.append(error)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    started.wait(5)
+    return thread, release, results
+
+
+def test_waits_for_a_pending_fit():
+    cache = InterpolantCache()
+    thread, release, results = start_blocked_fit(cache)
+    waits = []
+
+    def wait():
+        waits.append(None)
+        release.set()
+
+    interpolant = cache.get_or_fit('real', *dataset(0), fit=pytest.fail, wait=wait)
+    thread.join()
+
+    assert waits and results == [interpolant]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_fits_again_after_a_failed_pending_fit():
+    cache = InterpolantCache()
+    thread, release, results = start_blocked_fit(cache, fails=True)
+    threading.Timer(0.1, release.set).start()
+
+    interpolant = cache.get_or_fit('real', *dataset(0))
+    thread.join()
+
+    assert isinstance(results[0], RuntimeError)
+    assert cache.contains('real', *dataset(0)) and cache.get_or_fit('real', *dataset(0)) is interpolant
+    assert cache.misses == 2
+
+
+def test_clear_keeps_the_counters_and_pending_fits():
+    cache = InterpolantCache()
+    fit_all(cache, [1, 1])
+    thread, release, results = start_blocked_fit(cache)
+    cache.clear()
+
+    assert len(cache) == 0 and cache.stats()['bytes'] == 0
+    assert (cache.hits, cache.misses) == (1, 2)
+    release.set()
+    thread.join()
+    assert cache.contains('real', *dataset(0)) and cache.get_or_fit('real', *dataset(0)) is results[0]
+
+
+def test_waiting_can_be_stopped():
+    cache = InterpolantCache()
+    thread, release, _ = start_blocked_fit(cache)
+
+    def stop():
+        raise KeyboardInterrupt
+
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            cache.get_or_fit('real', *dataset(0), fit=pytest.fail, wait=stop)
+    finally:
+        release.set()
+        thread.join()
+    assert cache.contains('real', *dataset(0))
+
+
+def test_cache_keys_hold_the_fitting_precision():
+    cache = InterpolantCache()
+    arr_x, arr_y = [mp.mpf(1), mp.mpf(2)], [mp.mpf(3), mp.mpf(5)]
+    with precision.working_precision(256):
+        cache.get_or_fit('real', arr_x, arr_y, fit=algorithm.BarycentricInterpolant)
+
+    assert not cache.contains('real', arr_x, arr_y)
+    assert cache.make_key('real', arr_x, arr_y, 256) != cache.make_key('real', arr_x, arr_y)
+    with precision.working_precision(256):
+        assert cache.contains('real', arr_x, arr_y)
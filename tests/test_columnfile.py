@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+from mpmath import iv, mp
+
+from utility import columnfile, parsers
+from utility.columnfile import ColumnFileError
+
+
+X = ['0.1', '0.2', '0.35', '1e-3', '-4.5']
+Y = ['1', '-2.25', '3.125', '7e10', '0.3']
+
+
+def write_csv(tmp_path, delimiter=',', header=True) -> str:
+    path = tmp_path / 'data.csv'
+    lines = [delimiter.join(['t', 'value', 'low', 'high'])] if header else []
+    lines += [delimiter.join([x, y, y, str(float(y) + 1)]) for x, y in zip(X, Y)]
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+@pytest.mark.parametrize('delimiter', [',', ';', '\t'])
+def test_csv_columns_by_name_and_index(tmp_path, delimiter):
+    path = write_csv(tmp_path, delimiter)
+
+    by_name = columnfile.load(path, 'real', 't', 'value')
+    by_index = columnfile.load(path, 'real', 0, 1)
+
+    assert by_name.x == by_index.x == parsers.parse_real(','.join(X))
+    assert by_name.y == by_index.y == parsers.parse_real(','.join(Y))
+    assert len(by_name.z) == 0
+
+
+def test_csv_without_header(tmp_path):
+    path = write_csv(tmp_path, header=False)
+
+    assert columnfile.load(path, 'real', 1, 0).x == parsers.parse_real(','.join(Y))
+    with pytest.raises(ColumnFileError):
+        columnfile.load(path, 'real', 't', 'value')
+
+
+def test_csv_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnfile, 'CHUNK_ROWS', 2)
+    fractions = []
+
+    dataset = columnfile.load(
+        write_csv(tmp_path), 'fast_real', progress=lambda fraction, label: fractions.append(fraction)
+    )
+
+    np.testing.assert_array_equal(dataset.x, [float(x) for x in X])
+    assert len(fractions) == 3 and fractions[-1] == 1.0
+
+
+def test_csv_interval_endpoint_columns(tmp_path):
+    dataset = columnfile.load(write_csv(tmp_path), 'interval', 't', ('low', 'high'))
+
+    assert dataset.x == [iv.mpf([mp.mpf(x), mp.mpf(x)]) for x in X]
+    assert dataset.y == parsers.parse_interval(','.join(f'[{y};{float(y) + 1}]' for y in Y))
+
+
+def test_csv_errors_report_the_line(tmp_path):
+    path = tmp_path / 'bad.csv'
+    path.write_text('x,y\n1,2\n3,4\n5,oops\n7,8\n')
+    with pytest.raises(ColumnFileError, match='line 4'):
+        columnfile.load(str(path), 'real')
+
+    path.write_text('x,y\n1,2\n3\n')
+    with pytest.raises(ColumnFileError, match='line 3: missing Y column'):
+        columnfile.load(str(path), 'real')
+
+    with pytest.raises(ColumnFileError):
+        columnfile.load(write_csv(tmp_path), 'real', 't', 'missing')
+    with pytest.raises(ColumnFileError):
+        columnfile.load(write_csv(tmp_path), 'real', 't', ('low', 'high'))
+
+
+def test_npy_columns(tmp_path):
+    path = str(tmp_path / 'data.npy')
+    array = np.array([[float(x), float(y)] for x, y in zip(X, Y)])
+    np.save(path, array)
+
+    real = columnfile.load(path, 'real')
+    interval = columnfile.load(path, 'interval', 1, 0)
+    fast = columnfile.load(path, 'fast_real')
+
+    # Float64 values are binary numbers, converted exactly
+    assert real.x == [mp.mpf(value) for value in array[:, 0].tolist()]
+    assert interval.x == [iv.mpf([value, value]) for value in array[:, 1].tolist()]
+    np.testing.assert_array_equal(fast.y, array[:, 1])
+
+
+def test_npy_structured_array(tmp_path):
+    path = str(tmp_path / 'data.npy')
+    array = np.zeros(len(X), dtype=[('t', '<f8'), ('low', '<f4'), ('high', '<i8')])
+    array['t'] = [float(x) for x in X]
+    array['low'] = np.arange(len(X))
+    array['high'] = np.arange(len(X)) + 1
+    np.save(path, array)
+
+    dataset = columnfile.load(path, 'interval', 't', ('high', 'low'))
+
+    assert dataset.y == [iv.mpf([k, k + 1]) for k in range(len(X))]
+    with pytest.raises(ColumnFileError):
+        columnfile.load(path, 'real', 't', 'missing')
+
+
+def test_npy_errors(tmp_path):
+    path = str(tmp_path / 'data.npy')
+    np.save(path, np.array([[1.0, np.nan], [2.0, 3.0]]))
+    with pytest.raises(ColumnFileError, match='NaN'):
+        columnfile.load(path, 'real')
+
+    np.save(path, np.arange(4.0))
+    with pytest.raises(ColumnFileError):
+        columnfile.load(path, 'real')
+
+
+def test_parse_column():
+    assert columnfile.parse_column('3') == 3
+    assert columnfile.parse_column('time') == 'time'
+    assert columnfile.parse_column('0:low') == (0, 'low')
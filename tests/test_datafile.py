@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from mpmath import iv, mp
+
+from utility import datafile, precision
+from utility.datafile import DatasetFileError
+
+
+def raws(values) -> list:
+    return [value._mpi_ if hasattr(value, '_mpi_') else value._mpf_ for value in values]
+
+
+def make_dataset(mode: str) -> tuple:
+    if mode == 'fast_real':
+        return np.linspace(-1, 1, 9), np.exp(np.linspace(-1, 1, 9)), np.array([0.1, -1e-300, np.inf])
+    # Values of all kinds: tiny and huge exponents, zero, infinities and mantissas of several words
+    with precision.working_precision(200):
+        real = [mp.mpf(1) / 3, -mp.pi, mp.mpf(0), mp.mpf('1e-1000'), mp.mpf('-7e5000'), mp.mpf(2) ** 100]
+        special = [mp.inf, -mp.inf]
+        if mode == 'real':
+            return real, [value * 2 for value in real], special
+        if mode == 'singleton':
+            return [iv.mpf(value) for value in real], [iv.mpf([value, value]) for value in real], []
+        data_x = [iv.mpf([value - 1, value + mp.mpf(1) / 7]) for value in real]
+        data_y = [iv.mpf(sorted([0, value])) for value in real]
+        return data_x, data_y, [iv.mpf([-mp.inf, 1]), iv.mpf(['-0.1', '0.1'])]
+
+
+@pytest.mark.parametrize('mode', datafile.MODES)
+def test_round_trip_is_exact(tmp_path, mode):
+    path = str(tmp_path / f'{mode}{datafile.EXTENSION}')
+    data = make_dataset(mode)
+    datafile.save(path, mode, *data, precision=200)
+    dataset = datafile.load(path)
+
+    assert datafile.is_dataset_file(path)
+    assert (dataset.mode, dataset.precision) == (mode, 200)
+    for loaded, saved in zip((dataset.x, dataset.y, dataset.z), data):
+        if mode == 'fast_real':
+            np.testing.assert_array_equal(loaded, saved)
+        else:
+            assert raws(loaded) == raws(saved)
+
+
+@pytest.mark.parametrize('mode', datafile.MODES)
+def test_empty_new_points(tmp_path, mode):
+    path = str(tmp_path / f'{mode}{datafile.EXTENSION}')
+    data_x, data_y, _ = make_dataset(mode)
+    datafile.save(path, mode, data_x, data_y, np.empty(0) if mode == 'fast_real' else [])
+
+    dataset = datafile.load(path)
+    assert len(dataset.z) == 0
+    assert dataset.precision == precision.get_precision()
+
+
+def test_fast_real_arrays_are_read_only(tmp_path):
+    path = str(tmp_path / f'fast{datafile.EXTENSION}')
+    datafile.save(path, 'fast_real', *make_dataset('fast_real'))
+
+    with pytest.raises(ValueError):
+        datafile.load(path).x[0] = 0
+
+
+def test_invalid_files(tmp_path):
+    path = tmp_path / f'data{datafile.EXTENSION}'
+    path.write_bytes(b'not a dataset file, but long enough to hold a whole header of 64 bytes')
+    with pytest.raises(DatasetFileError):
+        datafile.load(str(path))
+    assert not datafile.is_dataset_file(str(path))
+
+    datafile.save(str(path), 'real', *make_dataset('real'))
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(DatasetFileError):
+        datafile.load(str(path))
+
+    with pytest.raises(DatasetFileError):
+        datafile.save(str(path), 'complex', [], [], [])
+
+
+@pytest.mark.parametrize('mode', datafile.MODES)
+def test_stored_precision_must_match_the_records(tmp_path, mode):
+    path = tmp_path / f'{mode}{datafile.EXTENSION}'
+    datafile.save(str(path), mode, *make_dataset(mode), precision=200)
+    data = path.read_bytes()
+    offset = datafile.HEADER.fields['precision'][1]
+
+    # More bits than the mantissa records hold, or no precision at all
+    for bits in (0, 5000) if mode != 'fast_real' else (0,):
+        path.write_bytes(data[:offset] + np.array([bits], dtype='<u4').tobytes() + data[offset + 4:])
+        with pytest.raises(DatasetFileError):
+            datafile.load(str(path))
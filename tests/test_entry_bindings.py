@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+
+from utility import entry_bindings
+
+
+def test_filter_text():
+    assert entry_bindings.filter_text('1, 2a\t3\n[4; 5]') == '1,23\n[4;5]'
+    assert entry_bindings.filter_text('x-y', allowed_chars='-') == '-'
+    assert entry_bindings.filter_text('') == ''
+
+
+def test_is_filtered():
+    assert entry_bindings.is_filtered('1.5,[2;3]\n')
+    assert not entry_bindings.is_filtered('1 2')
+    assert entry_bindings.is_filtered('abc', allowed_chars='cba')
+
+
+def test_input_filter():
+    def key(char, keysym=''):
+        return SimpleNamespace(char=char, keysym=keysym or char)
+
+    assert entry_bindings.input_filter(key('7')) is None
+    assert entry_bindings.input_filter(key('a')) == 'break'
+    assert entry_bindings.input_filter(key('\x08', 'BackSpace')) is None
+    assert entry_bindings.input_filter(key('\r', 'Return')) is None
+    # Keys without a character (arrows, modifiers) are let through
+    assert entry_bindings.input_filter(key('', 'Left')) is None
@@ -0,0 +1,105 @@
+import random
+
+import numpy as np
+import pytest
+from mpmath import iv, mp
+
+from utility import algorithm, fastreal, floatinterval, precision
+from utility.floatinterval import FloatIntervalArray
+
+
+# Decimal nodes and values, which are not float64 numbers, so their enclosures have a nonzero width
+NODES = [f'{k / 10 - 1:.1f}' for k in range(15)]
+VALUES = [f'{(k * 7 % 11) / 3:.6f}' for k in range(15)]
+POINTS = ['-0.95', '-0.33', '0.07', '0.41']
+
+
+def enclose(array: FloatIntervalArray, values) -> bool:
+    lower, upper = array.lower.tolist(), array.upper.tolist()
+    return all(a <= value <= b for a, b, value in zip(lower, upper, values, strict=True))
+
+
+def exact(text: str):
+    return mp.mpf(text)
+
+
+@pytest.mark.parametrize('operation', ['__add__', '__sub__', '__mul__', '__truediv__'])
+def test_operations_enclose_the_exact_results(operation):
+    generator = np.random.default_rng(0)
+    left, right = generator.normal(size=(2, 1000)) * np.logspace(-20, 20, 1000)
+    result = getattr(FloatIntervalArray(left, left), operation)(FloatIntervalArray(right, right))
+
+    with precision.working_precision(256):
+        expected = [getattr(mp.mpf(a), operation)(mp.mpf(b)) for a, b in zip(left.tolist(), right.tolist())]
+        assert enclose(result, expected)
+
+
+def test_division_by_an_interval_containing_zero_is_unbounded():
+    result = FloatIntervalArray([1.0], [2.0]) / FloatIntervalArray([-1.0], [1.0])
+
+    assert result.lower[0] == -np.inf and result.upper[0] == np.inf
+
+
+def test_conversion_rounds_outward():
+    # Endpoints beyond the float64 range are rounded outward as well
+    intervals = [iv.mpf('0.1'), iv.mpf(['-1e-400', '3']), iv.mpf(2), iv.mpf(['1e400', '1e401'])]
+    array = FloatIntervalArray.from_intervals(intervals)
+
+    assert enclose(array, [mp.mpf(interval.a) for interval in intervals])
+    assert enclose(array, [mp.mpf(interval.b) for interval in intervals])
+    assert array.to_intervals()[2] == iv.mpf(2)
+
+
+@pytest.mark.parametrize('radius', [0, 1e-6])
+def test_kernels_enclose_the_exact_results(radius):
+    arr_x = [iv.mpf(x) for x in NODES]
+    arr_y = [iv.mpf(y) + iv.mpf([-radius, radius]) for y in VALUES]
+    arr_z = [iv.mpf(z) for z in POINTS]
+    lagrange, neville, coefficients = floatinterval.interpolate_all(arr_x, arr_y, arr_z)
+    results = {
+        'lagrange': lagrange,
+        'neville': neville,
+        'separate lagrange': floatinterval.lagrange(arr_x, arr_y, arr_z),
+        'separate neville': floatinterval.neville(arr_x, arr_y, arr_z),
+    }
+
+    # Exact results for values anywhere in the intervals, computed at a much higher precision
+    generator = random.Random(0)
+    for _ in range(3):
+        with precision.working_precision(256):
+            nodes = [exact(x) for x in NODES]
+            values = [exact(y) + radius * mp.mpf(generator.uniform(-1, 1)) for y in VALUES]
+            expected = [algorithm.lagrange(nodes, values, [exact(z)]) for z in POINTS]
+            expected_coefficients = algorithm.lagrange_coefficients(nodes, values)
+
+            for name, result in results.items():
+                assert enclose(result, expected), name
+            assert enclose(coefficients, expected_coefficients)
+            assert enclose(floatinterval.lagrange_coefficients(arr_x, arr_y), expected_coefficients)
+
+
+def test_results_agree_with_the_mpmath_backend():
+    arr_x, arr_y, arr_z = ([iv.mpf(text) for text in data] for data in (NODES, VALUES, POINTS))
+    expected = algorithm.neville_many(arr_x, arr_y, arr_z)
+
+    for result in floatinterval.interpolate_all(arr_x, arr_y, arr_z)[:2]:
+        for interval, reference in zip(result.to_intervals(), expected, strict=True):
+            # Both are narrow enclosures of the same values, so they overlap and have similar midpoints
+            assert interval.a <= reference.b and reference.a <= interval.b
+            assert abs(interval.mid - reference.mid) < 1e-9
+
+
+@pytest.mark.parametrize('count', [40, 120])
+def test_coefficients_of_a_wide_spread_stay_finite_and_narrow(count):
+    nodes = np.linspace(-1000, 1000, count)
+    values = np.cos(nodes / 300)
+    coefficients = floatinterval.lagrange_coefficients(
+        [iv.mpf(x) for x in nodes.tolist()], [iv.mpf(y) for y in values.tolist()]
+    )
+    with precision.working_precision(2000):
+        expected = algorithm.lagrange_coefficients([mp.mpf(x) for x in nodes], [mp.mpf(y) for y in values])
+
+    assert np.isfinite(coefficients.lower).all() and np.isfinite(coefficients.upper).all()
+    assert (coefficients.upper - coefficients.lower).max() < 1e-11
+    assert enclose(coefficients, expected)
+    assert enclose(coefficients, fastreal.lagrange_coefficients(nodes, values).tolist())
@@ -0,0 +1,149 @@
+import json
+import threading
+
+from mpmath import iv, mp
+
+from utility import algorithm, instrumentation
+from utility.instrumentation import Profiler, instrumented, stage
+from utility.intervalvector import IntervalVector
+
+
+def arithmetic_methods() -> dict:
+    names = instrumentation._MPF_OPERATIONS + instrumentation._VECTOR_OPERATIONS
+    return {(cls, name): cls.__dict__.get(name) for cls in (mp.mpf, iv.mpf, IntervalVector) for name in names}
+
+
+@instrumented('kernel')
+def kernel(a, b, c):
+    return a + b * c - a / c
+
+
+def test_stages_nest():
+    with Profiler() as profiler:
+        with stage('outer'):
+            kernel(mp.mpf(1), mp.mpf(2), mp.mpf(3))
+        stage('second').__enter__()
+
+    assert [(record['stage'], record['depth']) for record in profiler.records] == \
+        [('outer', 0), ('kernel', 1), ('second', 0)]
+    assert profiler.records[0]['seconds'] >= profiler.records[1]['seconds'] >= 0
+    assert 'operations' not in profiler.records[0]
+    # Without an active profiler nothing is recorded
+    assert instrumentation.current() is None
+    kernel(mp.mpf(1), mp.mpf(2), mp.mpf(3))
+
+
+def test_operation_totals():
+    vector = IntervalVector.from_intervals([iv.mpf([k, k + 1]) for k in range(5)])
+    with Profiler(count_operations=True) as profiler:
+        with stage('scalars'):
+            kernel(mp.mpf(1), mp.mpf(2), mp.mpf(3))
+            kernel(iv.mpf(1), iv.mpf(2), iv.mpf(3))
+        with stage('vectors'):
+            (vector + vector) * vector - 1
+            vector.add(vector)
+        with stage('raw'):
+            instrumentation.add_operations(7)
+
+    operations = {record['stage']: record['operations'] for record in profiler.records}
+    assert operations == {'scalars': 8, 'kernel': 4, 'vectors': 20, 'raw': 7}
+    # Outside of a counting profiler, raw operations are ignored
+    count = instrumentation._operation_counter.count
+    instrumentation.add_operations(7)
+    assert instrumentation._operation_counter.count == count
+
+
+def test_threads_count_their_own_operations():
+    barrier = threading.Barrier(3)
+    operations = {}
+
+    def count(name, repeats):
+        with Profiler(count_operations=True) as profiler:
+            barrier.wait(5)
+            with stage(name):
+                for _ in range(repeats):
+                    kernel(mp.mpf(1), mp.mpf(2), mp.mpf(3))
+        operations[name] = profiler.records[0]['operations']
+
+    def uncounted():
+        barrier.wait(5)
+        for _ in range(5000):
+            mp.mpf(1) + mp.mpf(2)
+
+    threads = [
+        threading.Thread(target=count, args=('first', 2000)),
+        threading.Thread(target=count, args=('second', 3000)),
+        threading.Thread(target=uncounted)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert operations == {'first': 2000 * 4, 'second': 3000 * 4}
+
+
+def test_real_and_interval_kernels_count_alike():
+    nodes = [mp.mpf(k) / 3 for k in range(12)]
+    values, points = [mp.cos(x) for x in nodes], [mp.mpf(k) / 7 for k in range(5)]
+    datasets = {'real': (nodes, values, points),
+                'interval': tuple([iv.mpf(value) for value in data] for data in (nodes, values, points))}
+
+    with Profiler(count_operations=True) as profiler:
+        for mode, (arr_x, arr_y, arr_z) in datasets.items():
+            with stage(f'{mode} neville'):
+                algorithm.neville_many(arr_x, arr_y, arr_z)
+            differences = algorithm.neville_differences(arr_x)
+            with stage(f'{mode} weights'):
+                algorithm.weights_from_differences(arr_x, differences)
+
+    operations = {record['stage']: record['operations'] for record in profiler.records if record['depth'] == 0}
+    assert operations['real neville'] == operations['interval neville'] > 0
+    # n (n - 1) products, the negations of every other node and n divisions
+    assert operations['real weights'] == operations['interval weights'] == 12 * 11 + 6 + 12
+
+
+def test_uninstall_restores_the_original_methods():
+    before = arithmetic_methods()
+    aliases = {name: IntervalVector.__dict__[name] for name in ('__add__', '__rsub__', '__truediv__', '__neg__')}
+
+    with Profiler(count_operations=True):
+        assert IntervalVector.__add__ is not aliases['__add__']
+        with Profiler(count_operations=True):
+            pass
+        # The inner profiler does not remove the wrappers of the outer one
+        assert IntervalVector.__add__ is not aliases['__add__']
+
+    assert arithmetic_methods() == before
+    assert all(IntervalVector.__dict__[name] is method for name, method in aliases.items())
+    assert IntervalVector.__add__ is IntervalVector.add
+
+
+def test_nested_profilers_restore_the_active_one():
+    with Profiler() as outer:
+        with Profiler(count_operations=True) as inner:
+            assert instrumentation.current() is inner
+            with stage('inner'):
+                mp.mpf(1) + 1
+        assert instrumentation.current() is outer
+
+    assert [record['stage'] for record in inner.records] == ['inner'] and outer.records == []
+
+
+def test_allocations_and_export(tmp_path):
+    with Profiler(track_allocations=True) as profiler:
+        with stage('allocate'):
+            data = [bytearray(1000) for _ in range(100)]
+            with stage('nested'):
+                more = bytearray(200_000)
+            del more
+
+    record = profiler.records[0]
+    assert record['allocated'] >= 100_000 and record['peak'] >= 200_000
+    assert profiler.records[1]['peak'] >= 200_000
+    assert data and 'allocate' in profiler.report()
+
+    path = tmp_path / 'profile.json'
+    profiler.export(str(path))
+    exported = json.loads(path.read_text())
+    assert exported['track_allocations'] and [stage['stage'] for stage in exported['stages']] == ['allocate', 'nested']
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+from mpmath import iv, mp
+
+from utility import precision
+from utility.intervalvector import IntervalVector
+
+
+def random_intervals(seed: int, count: int = 200) -> list:
+    generator = random.Random(seed)
+    intervals = []
+    for _ in range(count):
+        center = mp.mpf(generator.uniform(-1, 1)) * mp.mpf(10) ** generator.randint(-30, 30)
+        radius = abs(center) * mp.mpf(generator.choice([0, 1e-10, 0.5]))
+        intervals.append(iv.mpf([center - radius, center + radius]))
+    return intervals
+
+
+def endpoints(interval) -> tuple:
+    return mp.make_mpf(interval._mpi_[0]), mp.make_mpf(interval._mpi_[1])
+
+
+def contains(outer, inner) -> bool:
+    (a, b), (c, d) = endpoints(outer), endpoints(inner)
+    return a <= c and d <= b
+
+
+@pytest.mark.parametrize('operation', ['__add__', '__sub__', '__mul__', '__truediv__'])
+def test_operations_round_outward(operation):
+    left, right = random_intervals(0), random_intervals(1)
+    result = getattr(IntervalVector.from_intervals(left), operation)(IntervalVector.from_intervals(right))
+
+    # The exact results of the endpoint combinations, computed at a much higher precision
+    with precision.working_precision(1024):
+        for interval, a, b in zip(result, left, right, strict=True):
+            products = [getattr(x, operation)(y) for x in endpoints(a) for y in endpoints(b)]
+            exact = iv.mpf([min(products), max(products)])
+            assert contains(interval, exact)
+
+
+@pytest.mark.parametrize('operation', ['__add__', '__sub__', '__mul__', '__truediv__'])
+def test_operations_round_like_iv(operation):
+    left, right = random_intervals(2), random_intervals(3)
+    result = getattr(IntervalVector.from_intervals(left), operation)(IntervalVector.from_intervals(right))
+
+    assert result.tolist() == [getattr(a, operation)(b) for a, b in zip(left, right)]
+
+
+def test_reflected_operations_and_broadcasting():
+    values = random_intervals(4, 20)
+    vector = IntervalVector.from_intervals(values)
+    scalar = iv.mpf(['0.1', '0.3'])
+
+    # iv.mpf raises instead of deferring to the reflected operators, so those are called by name
+    assert vector.rsub(scalar).tolist() == [scalar - v for v in values]
+    assert vector.rdiv(scalar).tolist() == [scalar / v for v in values]
+    assert (vector * scalar).tolist() == [v * scalar for v in values]
+    assert (vector - 1).tolist() == [v - 1 for v in values]
+    assert (-vector).tolist() == [-v for v in values]
+
+
+def test_division_by_an_interval_containing_zero_is_unbounded():
+    result = IntervalVector.from_intervals([iv.mpf([1, 2]), iv.mpf([1, 2])]) / IntervalVector.from_intervals(
+        [iv.mpf([-1, 1]), iv.mpf([0, 1])]
+    )
+
+    assert result[0] == iv.mpf([-mp.inf, mp.inf])
+    assert endpoints(result[1])[1] == mp.inf
+
+
+def test_conversion_round_trip():
+    values = random_intervals(5, 50) + [iv.mpf([-mp.inf, 1]), iv.mpf(0)]
+    vector = IntervalVector.from_intervals(values)
+
+    assert vector.tolist() == list(vector) == values
+    assert [vector[k] for k in range(len(vector))] == values
+    assert vector[3:7].tolist() == values[3:7]
+
+    copy = vector.copy()
+    copy[0] = iv.mpf(5)
+    assert vector[0] == values[0] and copy[0] == iv.mpf(5)
+    assert IntervalVector.filled(iv.mpf(2), 3).tolist() == [iv.mpf(2)] * 3
+
+
+def test_sum_and_product_enclose_the_scalar_results():
+    values = random_intervals(6, 30)
+    vector = IntervalVector.from_intervals(values)
+    total, product = iv.mpf(0), iv.mpf(1)
+    for value in values:
+        total += value
+    for value in values[:4] + values[5:]:
+        product *= value
+
+    assert contains(vector.sum(), total) or vector.sum() == total
+    assert vector.prod(skip=4) == product
+
+    # Multiplied onto a starting factor, the product is rounded exactly like the scalar loop
+    start = iv.mpf(['0.1', '0.3'])
+    product = start
+    for value in values[:4] + values[5:]:
+        product *= value
+    assert vector.prod(skip=4, start=start) == product
+
+
+def test_lengths_must_match():
+    with pytest.raises(ValueError):
+        IntervalVector.filled(iv.mpf(1), 3) + IntervalVector.filled(iv.mpf(1), 2)
@@ -0,0 +1,46 @@
+from mpmath import mp
+
+from gui.jobs import Jobs
+from gui.outputview import ResultRows
+from utility import parsers
+
+
+def text(output) -> str:
+    return '\n'.join(output.iter_lines()) if isinstance(output, ResultRows) else output
+
+
+def test_calculate_job_reuses_the_parsed_fields_and_the_fit():
+    jobs = Jobs()
+    progress = lambda fraction, label: None
+    outputs = list(jobs.calculate_job('real', parsers.parse_real, '0, 1, 2', '0, 1, 4', '3', progress))
+
+    assert [text(output).split(':')[0] for output in outputs] == [
+        'Lagrange Interpolation', 'Neville Interpolation', 'Lagrange Polynomial Coefficients'
+    ]
+    assert parsers.sci_str(mp.mpf(9)) in outputs[0]
+    assert jobs.interpolant_cache.contains('real', *(jobs.parsed_fields[field][1] for field in 'xy'))
+
+    # An unchanged field is not parsed again
+    parsed_x = jobs.parsed_fields['x'][1]
+    list(jobs.calculate_job('real', parsers.parse_real, '0, 1, 2', '0, 1, 4', '5', progress))
+    assert jobs.parsed_fields['x'][1] is parsed_x
+
+
+def test_loaded_values_replace_the_summary_text():
+    jobs = Jobs()
+    values = parsers.parse_real('0, 1, 2')
+    jobs.loaded_fields['x'] = ('nodes.ean (loaded): 3 values', values)
+
+    assert jobs.read_field('x', parsers.parse_real, 'nodes.ean (loaded): 3 values') is values
+    assert jobs.read_field('x', parsers.parse_real, '5, 6') == parsers.parse_real('5, 6')
+
+
+def test_live_update_plans_the_next_job():
+    jobs = Jobs()
+
+    assert jobs.live_update('real', parsers.parse_real, ('0, 1, 2', '0, 1, 4', '3')) == 'calculate'
+    assert jobs.live_update('real', parsers.parse_real, ('0, 1, 2', '0, 1', '3')) is None
+    assert jobs.live_update('real', parsers.parse_real, ('2, 0, 1', '4, 0, 1', ''), 'sorted') == (
+        parsers.parse_real('0, 1, 2'), parsers.parse_real('0, 1, 4')
+    )
+    assert jobs.live_update('fast_real', parsers.parse_real, ('0, 1, 2', '0, 1, 4', '')) is None
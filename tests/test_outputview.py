@@ -0,0 +1,91 @@
+from mpmath import mp
+
+from gui.outputview import OutputView, ResultRows, _TextLines
+from gui.worker import ComputationWorker
+from utility import parsers
+
+
+def headless_view() -> OutputView:
+    """
+    Returns an output view holding segments only, without its Tk widgets (there is no display to draw on).
+    """
+    view = OutputView.__new__(OutputView)
+    view.segments, view._starts, view.line_count, view.top, view.visible_lines = [], [], 0, 0, 10
+    view.render = lambda: None
+    return view
+
+
+def test_rows_are_laid_out_like_prettify():
+    values = [mp.mpf(1), mp.mpf(2), mp.mpf(3)]
+    rows = ResultRows('Coefficients:', values)
+
+    assert '\n'.join(rows.iter_lines()) == 'Coefficients:\n' + parsers.prettify(values)
+    assert [rows.line(k) for k in range(len(rows))] == list(rows.iter_lines())
+    assert list(ResultRows('Empty:', []).iter_lines()) == ['Empty:', '[', ']']
+
+
+def test_rows_format_only_the_requested_lines():
+    formatted = []
+    rows = ResultRows('Values:', list(range(1000)), lambda value: formatted.append(value) or str(value))
+
+    assert rows.line(502) == ' 500,' and rows.line(1001) == ' 999'
+    assert formatted == [500, 999]
+
+
+def test_text_continues_the_last_line():
+    view = headless_view()
+    view.append('Lagrange: ')
+    view.append('1.0\nNeville: 2.0\n')
+    view.append(ResultRows('Coefficients:', [1, 2], str))
+    view.append('done')
+
+    lines = ['Lagrange: 1.0', 'Neville: 2.0', 'Coefficients:', '[', ' 1,', ' 2', ']', 'done']
+    assert list(view.iter_lines()) == lines
+    assert view.line_count == len(lines)
+    assert [view.line(k) for k in range(view.line_count)] == lines
+    assert isinstance(view.segments[0], _TextLines) and len(view.segments) == 3
+
+
+def test_save_writes_every_line(tmp_path):
+    view = headless_view()
+    view.append('Title\n')
+    view.append(ResultRows('Values:', list(range(5000)), str))
+    path = tmp_path / 'output.txt'
+    view.save(str(path))
+
+    assert path.read_text() == '\n'.join(view.iter_lines())
+    assert path.read_text().count('\n') == view.line_count - 1
+
+
+class Root:
+    """
+    Stands in for the Tk root, running the scheduled polls of a worker on demand.
+    """
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+
+def test_save_runs_in_the_background_on_a_snapshot(tmp_path, monkeypatch):
+    view = headless_view()
+    view.append('Title\n')
+    view.append(ResultRows('Values:', list(range(5000)), str))
+    expected = '\n'.join(view.iter_lines())
+    progress, finished = [], []
+    root = Root()
+    worker = ComputationWorker(root, on_progress=lambda f, label: progress.append(f),
+                               on_finish=lambda status, error: finished.append(status))
+    path = tmp_path / 'output.txt'
+
+    segments = view.snapshot()
+    worker.start(lambda report: view.save_job(str(path), segments, report))
+    # Text appended while the file is written is not saved
+    view.append('more')
+    while worker.running:
+        root.scheduled.pop(0)()
+
+    assert finished == ['done'] and path.read_text() == expected
+    assert progress and progress == sorted(progress) and progress[-1] < 1
@@ -0,0 +1,112 @@
+import pytest
+from mpmath import iv, mp
+
+from utility import algorithm, parallel
+from utility.intervalvector import IntervalVector
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pool():
+    yield
+    parallel.shutdown()
+
+
+@pytest.fixture
+def parallel_everything(monkeypatch):
+    """
+    Sends every computation to the pool, returns the list of the kernels run there.
+    """
+    monkeypatch.setattr(parallel, 'PARALLEL_MIN_OPERATIONS', 0)
+    kernels, run = [], parallel._run
+
+    def spy(workers, kernel, tasks, progress=None):
+        kernels.append(kernel.__name__)
+        return run(workers, kernel, tasks, progress)
+
+    monkeypatch.setattr(parallel, '_run', spy)
+    return kernels
+
+
+def real_dataset(n: int = 20, points: int = 16) -> tuple:
+    arr_x = [mp.mpf(k) / 3 for k in range(n)]
+    arr_y = [mp.cos(x) for x in arr_x]
+    arr_z = [mp.mpf(k) / 5 + mp.mpf('0.01') for k in range(points)]
+    return arr_x, arr_y, arr_z
+
+
+def interval_dataset(n: int = 20, points: int = 16) -> tuple:
+    arr_x, arr_y, arr_z = real_dataset(n, points)
+    return ([iv.mpf(x) for x in arr_x], [iv.mpf([y, y + mp.mpf('1e-15')]) for y in arr_y],
+            [iv.mpf(z) for z in arr_z])
+
+
+def overlap(a, b) -> bool:
+    return a.a <= b.b and b.a <= a.b
+
+
+def test_pack_round_trip():
+    arr_x, _, _ = real_dataset(5)
+    intervals = interval_dataset(5)[0]
+    vector = IntervalVector.from_intervals(intervals)
+
+    assert parallel.unpack(parallel.pack(arr_x)) == arr_x
+    assert parallel.unpack(parallel.pack(intervals)) == intervals
+    assert parallel.unpack(parallel.pack(vector)).tolist() == intervals
+
+
+def test_chunks_do_not_depend_on_the_workers():
+    assert parallel._chunks(10) == [(0, 4), (4, 8), (8, 10)]
+    chunks = parallel._chunks(1000)
+    assert len(chunks) <= parallel.MAX_CHUNKS and chunks[-1][1] == 1000
+    assert all(stop == start for (_, stop), (start, _) in zip(chunks, chunks[1:]))
+
+
+@pytest.mark.parametrize('dataset', [real_dataset, interval_dataset])
+def test_pool_matches_the_serial_kernels(parallel_everything, dataset):
+    arr_x, arr_y, arr_z = dataset()
+    serial = algorithm.BarycentricInterpolant(arr_x, arr_y)
+    pooled = algorithm.BarycentricInterpolant(arr_x, arr_y, workers=2)
+
+    # Per-node and per-point results are identical
+    assert pooled.weights == algorithm.barycentric_weights(arr_x)
+    assert pooled.evaluate_many(arr_z, workers=2) == serial.evaluate_many(arr_z)
+    assert algorithm.neville_many(arr_x, arr_y, arr_z, workers=2) == algorithm.neville_many(arr_x, arr_y, arr_z)
+
+    # Sums are associated by chunks, so they agree up to rounding (amplified by the cancellation
+    # within the coefficients)
+    pairs = [(algorithm.lagrange(arr_x, arr_y, arr_z, workers=2), algorithm.lagrange(arr_x, arr_y, arr_z), 2e-15)]
+    pairs += [(pooled_value, serial_value, 1e-9) for pooled_value, serial_value in zip(
+        algorithm.lagrange_coefficients(arr_x, arr_y, workers=2), algorithm.lagrange_coefficients(arr_x, arr_y))]
+    for pooled_value, serial_value, tolerance in pairs:
+        if isinstance(serial_value, iv.mpf):
+            assert overlap(pooled_value, serial_value)
+        else:
+            assert mp.almosteq(pooled_value, serial_value, rel_eps=tolerance)
+    assert set(parallel_everything) == {'_weights_kernel', '_evaluate_kernel', '_neville_kernel',
+                                        '_lagrange_kernel', '_combine_kernel'}
+
+def test_interval_vectors_are_split_by_points(parallel_everything):
+    arr_x, arr_y, arr_z = interval_dataset()
+    interpolant = algorithm.BarycentricInterpolant(arr_x, arr_y)
+    vector = IntervalVector.from_intervals(arr_z)
+
+    assert interpolant.evaluate_many(vector, workers=2).tolist() == interpolant.evaluate_many(vector).tolist()
+    assert parallel_everything == ['_evaluate_kernel']
+
+
+def test_small_inputs_stay_serial(monkeypatch):
+    def refuse(*args, **kwargs):
+        raise AssertionError('the process pool was used')
+
+    monkeypatch.setattr(parallel, '_run', refuse)
+    arr_x, arr_y, arr_z = real_dataset()
+
+    algorithm.lagrange(arr_x, arr_y, arr_z, workers=4)
+    algorithm.neville_many(arr_x, arr_y, arr_z, workers=4)
+    algorithm.lagrange_coefficients(arr_x, arr_y, workers=4)
+    algorithm.BarycentricInterpolant(arr_x, arr_y, workers=4).evaluate_many(arr_z, workers=4)
+
+    assert not parallel.worthwhile(10 ** 9, 1) and not parallel.worthwhile(10 ** 9, None)
+    # Large enough, but too few points for more than one chunk
+    assert not parallel.worthwhile(10 ** 9, 4, parallel.MIN_CHUNK_SIZE)
+    assert parallel.worthwhile(10 ** 9, 2, 2 * parallel.MIN_CHUNK_SIZE)
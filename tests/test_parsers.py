@@ -0,0 +1,102 @@
+import decimal
+import random
+
+import pytest
+from mpmath import iv, mp
+
+from utility import parsers, precision
+
+
+def test_ulp_of_negative_values():
+    for x in (mp.mpf(3), mp.mpf(-3), mp.mpf('-0.1'), mp.mpf('1e-30')):
+        assert parsers.ulp(x) == parsers.ulp(-x) > 0
+        assert parsers.next_below(x) < x < parsers.next_above(x)
+
+    singletons = parsers.parse_singleton('-2, 0, 2')
+    assert all(interval.a < interval.b for interval in singletons)
+
+
+def exact_sci(x: mp.mpf, prec: int, rounding=decimal.ROUND_HALF_UP) -> str:
+    """
+    Formats x like parsers.sci_str() with the exact decimal value of its binary representation.
+    """
+    sign, man, exp, _ = x._mpf_
+    with decimal.localcontext() as context:
+        context.prec = 2000
+        context.rounding = rounding
+        value = decimal.Decimal(man) * decimal.Decimal(2) ** exp
+        mantissa, exponent = format(value.copy_sign(decimal.Decimal(-1 if sign else 1)), f'.{prec}e').split('e')
+    return f'{mantissa}E{int(exponent):+05d}'
+
+
+def random_values(seed: int, count: int = 500) -> list:
+    generator = random.Random(seed)
+    return [mp.mpf(generator.uniform(-1, 1)) * mp.mpf(2) ** generator.randint(-3000, 3000) for _ in range(count)]
+
+
+@pytest.mark.parametrize('prec', [1, 3, 18, 40])
+def test_digits_are_rounded_exactly(prec):
+    with precision.working_precision(256):
+        for x in random_values(prec):
+            assert parsers.sci_str(x, prec) == exact_sci(x, prec)
+
+
+def test_huge_exponents(monkeypatch):
+    values = [mp.mpf(3) * mp.mpf(2) ** 100000, mp.mpf('-0.7') * mp.mpf(2) ** -123457] + random_values(7, 50)
+    expected = [exact_sci(x, 18) for x in values]
+    assert [parsers.sci_str(x) for x in values] == expected
+
+    # For exponents beyond 2^27 the float estimate of the decimal exponent may round up by one. Estimates
+    # too large by up to 30 are corrected all the same.
+    log10_2 = parsers._LOG10_2
+    for bump, selected in ((0.01, lambda x: abs(x) >= 1), (-0.01, lambda x: abs(x) < 1)):
+        monkeypatch.setattr(parsers, '_LOG10_2', log10_2 + bump)
+        for x, text in zip(values[2:], expected[2:]):
+            if selected(x):
+                assert parsers.sci_str(x) == text
+
+
+def test_rounding_carries_into_the_exponent():
+    assert parsers.sci_str(mp.mpf('9.9999'), 2) == '1.00E+0001'
+    assert parsers.sci_str(mp.mpf('-0.125'), 1) == '-1.3E-0001'
+    assert parsers.sci_str(mp.mpf(1) / 3, 3) == '3.333E-0001'
+    assert parsers.sci_str(12345, 4) == '1.2345E+0004'
+
+
+def test_special_values():
+    assert parsers.sci_str(mp.mpf(0), 3) == '0.000E+0000'
+    assert parsers.sci_str(mp.inf) == '+inf'
+    assert parsers.sci_str(-mp.inf) == '-inf'
+    assert parsers.sci_str(mp.nan) == 'nan'
+    assert parsers.interval_sci_str(iv.mpf([-mp.inf, 0]), 2) == '[-inf, 0.00E+0000], width=+inf'
+
+
+def test_interval_endpoints_are_rounded_outward():
+    with precision.working_precision(256):
+        for a in random_values(1, 200):
+            interval = iv.mpf([a, a + abs(a) * mp.mpf('1e-10')])
+            text = parsers.interval_sci_str(interval, 8)
+            lower, upper = text[1:text.index(']')].split(', ')
+            width = text[text.index('width=') + 6:]
+
+            assert mp.mpf(lower) <= interval.a and interval.b <= mp.mpf(upper)
+            assert mp.mpf(width) >= interval.b - interval.a
+            assert text.startswith('[' + exact_sci(mp.mpf(interval.a), 8, decimal.ROUND_FLOOR))
+
+
+def test_formatting_round_trips():
+    # 21 significant digits identify every 64-bit mantissa
+    for x in random_values(2):
+        assert mp.mpf(parsers.sci_str(x, 20)) == x
+    for x in (0.1, -2.5e-300, 1e308, 5e-324):
+        assert float(parsers.float_sci_str(x)) == x
+
+
+def test_prettify():
+    assert parsers.prettify(mp.mpf(2)) == parsers.sci_str(mp.mpf(2))
+    assert parsers.prettify(2.0) == parsers.float_sci_str(2.0)
+    assert parsers.prettify([mp.mpf(1), mp.mpf(2)]) == \
+        f'[\n {parsers.sci_str(mp.mpf(1))},\n {parsers.sci_str(mp.mpf(2))}\n]'
+    assert parsers.prettify([iv.mpf(1)]) == f'[\n {parsers.interval_sci_str(iv.mpf(1))}\n]'
+    assert parsers.prettify([mp.mpf(1), 2.0]).startswith('Type error')
+    assert parsers.prettify('text').startswith('Type error')
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+from mpmath import iv, mp
+
+from utility import precision
+
+
+def test_working_precision_is_restored():
+    with precision.working_precision(200):
+        assert mp.prec == iv.prec == 200
+        with precision.stable_precision() as bits:
+            assert bits == 200
+    assert precision.get_precision() == precision.DEFAULT_PRECISION
+
+
+def test_adaptive_meets_the_tolerance():
+    outcome = precision.adaptive(lambda: [iv.mpf(1) / 3], 1e-30)
+
+    assert outcome.converged and outcome.error <= 1e-30
+    assert 100 <= outcome.precision <= precision.ADAPTIVE_MAX_PRECISION
+
+
+def test_precision_changes_wait_for_other_threads():
+    held, release = threading.Event(), threading.Event()
+    seen = []
+
+    def background():
+        with precision.stable_precision():
+            held.set()
+            release.wait(5)
+            seen.append(precision.get_precision())
+
+    thread = threading.Thread(target=background)
+    thread.start()
+    held.wait(5)
+    threading.Timer(0.2, release.set).start()
+    with precision.working_precision(300):
+        seen.append(precision.get_precision())
+    thread.join()
+
+    assert seen == [precision.DEFAULT_PRECISION, 300]
+
+
+def test_waiting_can_be_cancelled():
+    held, release = threading.Event(), threading.Event()
+
+    def background():
+        with precision.stable_precision():
+            held.set()
+            release.wait(5)
+
+    def cancel():
+        raise KeyboardInterrupt
+
+    thread = threading.Thread(target=background)
+    thread.start()
+    held.wait(5)
+    start = time.perf_counter()
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            with precision.working_precision(300, wait=cancel):
+                pass
+    finally:
+        release.set()
+        thread.join()
+
+    assert time.perf_counter() - start < 1
+    # Nothing is left waiting, so the precision can still be changed
+    with precision.working_precision(300):
+        pass
+
+
+def test_relying_thread_cannot_change_the_precision():
+    with precision.stable_precision():
+        with pytest.raises(RuntimeError):
+            with precision.working_precision(300):
+                pass
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from mpmath import mp
+
+from utility import algorithm, parsers, precision, sampling
+
+
+def test_grid():
+    assert sampling._grid(0, 1, 5).tolist() == [0, 0.25, 0.5, 0.75, 1]
+    for start, stop, points in ((0, 1, 1), (0, 1, sampling.MAX_POINTS + 1), (1, 1, 10), (2, 1, 10)):
+        with pytest.raises(ValueError):
+            sampling._grid(start, stop, points)
+
+
+def test_decimate_keeps_the_extremes_of_every_column():
+    grid = np.linspace(0, 1, 9)
+    values = np.array([3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0, 5.0])
+
+    columns, lower, upper = sampling.decimate(grid, values, values, 0, 1, 4)
+
+    # Columns of width 0.25, the last grid point lands exactly on stop and stays in the last column
+    assert columns.tolist() == [0, 1, 2, 3]
+    assert lower.tolist() == [1.0, 1.0, 5.0, 2.0]
+    assert upper.tolist() == [3.0, 4.0, 9.0, 6.0]
+
+
+def test_decimate_skips_empty_columns_and_nan_values():
+    grid = np.array([0.0, 0.01, 0.55, 0.9, 1.0])
+    lower = np.array([np.nan, 2.0, 3.0, np.nan, np.nan])
+    upper = np.array([1.0, np.nan, 4.0, np.nan, np.nan])
+
+    columns, low, high = sampling.decimate(grid, lower, upper, 0, 1, 10)
+
+    assert columns.tolist() == [0, 5, 9]
+    assert low.tolist()[:2] == [2.0, 3.0] and high.tolist()[:2] == [1.0, 4.0]
+    # A column with NaN values only stays NaN
+    assert np.isnan(low[2]) and np.isnan(high[2])
+
+
+def test_samples_follow_the_polynomial():
+    interpolant = algorithm.BarycentricInterpolant(parsers.parse_real('0, 1, 2'), parsers.parse_real('0, 1, 4'))
+    samples = sampling.sample_interpolant(interpolant, -1, 3, 101)
+
+    assert not samples.has_envelope
+    assert samples.values == pytest.approx(samples.grid ** 2)
+
+    fast = sampling.sample_fast_real(np.array([0.0, 1.0, 2.0]), np.array([0.0, 1.0, 4.0]), -1, 3, 101)
+    assert fast.values == pytest.approx(samples.values)
+
+
+def test_interval_envelope_encloses_the_polynomial():
+    interpolant = algorithm.BarycentricInterpolant(
+        parsers.parse_interval('[0;0], [1;1], [2;2]'), parsers.parse_interval('[0;0.1], [1;1.1], [4;4.1]')
+    )
+    samples = sampling.sample_interpolant(interpolant, -1, 3, sampling.ENVELOPE_MAX_POINTS + 100)
+
+    assert samples.has_envelope and len(samples.envelope_grid) == sampling.ENVELOPE_MAX_POINTS
+    squares = samples.envelope_grid ** 2
+    assert (samples.lower <= squares).all() and (squares <= samples.upper).all()
+    assert (samples.upper - samples.lower < 1).all()
+
+
+def test_float_bounds_enclose_the_raw_values():
+    with precision.working_precision(200):
+        values = [mp.mpf(1) / 3, -mp.pi, mp.mpf(0), mp.mpf('1e-400'), mp.mpf('-7e500'), mp.mpf(2) ** 60 + 1,
+                  mp.inf, -mp.inf]
+        lower, upper = sampling._float_bounds([value._mpf_ for value in values])
+
+        assert all(low <= value <= high for low, value, high in zip(lower, values, upper))
+        assert (upper[:3] - lower[:3] <= 4 * np.spacing(np.abs(lower[:3]))).all()
+        assert np.isnan(sampling._float_bounds([mp.nan._mpf_])).all()
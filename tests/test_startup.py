@@ -0,0 +1,54 @@
+import subprocess
+import sys
+import threading
+
+from utility import startup
+
+
+def test_lazy_module_imports_on_first_access():
+    module = startup.LazyModule('json')
+
+    assert 'not loaded' in repr(module)
+    assert module.dumps([1]) == '[1]'
+    assert "'json' (loaded)" in repr(module)
+
+
+def test_preload_imports_in_the_background():
+    done = threading.Event()
+    thread = startup.preload(['colorsys', 'utility.tokenizer'], on_done=done.set)
+    thread.join(10)
+
+    assert done.is_set() and thread.daemon
+    assert 'colorsys' in sys.modules and 'utility.tokenizer' in sys.modules
+
+
+def test_import_profiler_records_new_modules():
+    sys.modules.pop('this', None)
+    with startup.ImportProfiler() as profiler:
+        import this  # noqa: F401
+        import json  # noqa: F401  (already imported, not recorded)
+
+    names = [record[0] for record in profiler.records]
+    assert names == ['this']
+    _, self_time, cumulative, depth, thread = profiler.records[0]
+    assert 0 <= self_time <= cumulative and depth == 0 and thread == threading.current_thread().name
+
+    text = startup.report(profiler, [('window shown', 0.5)])
+    assert 'window shown' in text and 'this [' in text
+
+
+def test_gui_starts_without_the_numeric_stack():
+    code = 'import sys, gui.core; print("numpy" in sys.modules, "mpmath" in sys.modules)'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.split() == ['False', 'False']
+
+
+def test_batch_options_are_registered_without_the_numeric_stack():
+    code = ('import sys, main; '
+            'args = main.parse_arguments(["batch", "data.jsonl", "-j", "2", "--order", "leja"]); '
+            'main.parse_arguments([]); '
+            'print(args.workers, args.order, "numpy" in sys.modules, "mpmath" in sys.modules)')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.split() == ['2', 'leja', 'False', 'False']
@@ -0,0 +1,55 @@
+import pytest
+from mpmath import iv, mp
+
+from utility import parsers, tokenizer
+
+
+def test_real_numbers():
+    assert list(tokenizer.iter_real(' 1, -2.5e3,\n.25 ,+7. ')) == [mp.mpf(1), mp.mpf(-2500), mp.mpf(0.25), mp.mpf(7)]
+    assert list(tokenizer.iter_number_strings('1, -2.5e3')) == ['1', '-2.5e3']
+
+
+def test_intervals():
+    intervals = list(tokenizer.iter_interval('[1; 2], [-3, 4.5],\n 0.1;0.1'))
+
+    assert intervals[:2] == [iv.mpf([1, 2]), iv.mpf([-3, 4.5])]
+    # Endpoints are rounded to nearest like every other number, not outward
+    assert intervals[2] == iv.mpf([mp.mpf('0.1'), mp.mpf('0.1')])
+
+
+def test_values_are_rounded_like_mpmath():
+    text = '0.1, 1e-400, 123456789012345678901234567890'
+
+    assert parsers.parse_real(text) == [mp.mpf(number) for number in text.split(', ')]
+    assert parsers.parse_interval('[0.3; 0.1]') == [iv.mpf([mp.mpf('0.1'), mp.mpf('0.3')])]
+
+
+@pytest.mark.parametrize('iterate, text, offset, line, column', [
+    (tokenizer.iter_real, '1, 2,\n  x, 4', 8, 2, 3),
+    (tokenizer.iter_real, '1,,2', 2, 1, 3),
+    (tokenizer.iter_real, '1, 2,', 5, 1, 6),
+    (tokenizer.iter_real, '', 0, 1, 1),
+    (tokenizer.iter_real, '1\n2', 2, 2, 1),
+    (tokenizer.iter_interval, '[1;2],\n\n[3;4', 12, 3, 5),
+    (tokenizer.iter_interval, '[1;2], [3 4]', 10, 1, 11),
+])
+def test_parse_error_position(iterate, text, offset, line, column):
+    with pytest.raises(tokenizer.ParseError) as error:
+        list(iterate(text))
+
+    assert (error.value.offset, error.value.line, error.value.column) == (offset, line, column)
+    assert f'line {line}, column {column}' in str(error.value)
+
+
+def test_parse_error_is_a_value_error():
+    with pytest.raises(ValueError):
+        parsers.parse_real('1, a')
+
+
+def test_values_before_an_error_are_yielded():
+    values = tokenizer.iter_real('1, 2, x')
+
+    assert next(values) == 1
+    assert next(values) == 2
+    with pytest.raises(tokenizer.ParseError):
+        next(values)
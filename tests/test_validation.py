@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from mpmath import iv, mp
+
+from utility import parsers, validation
+
+
+def test_duplicates_are_rejected():
+    for data_x in (parsers.parse_real('3, 1, 2, 1'), np.array([3.0, 1.0, 2.0, 1.0])):
+        error = validation.validate_dataset(data_x, data_x, data_x[:1])
+        assert 'duplicates' in error
+
+
+def test_overlapping_intervals_are_rejected():
+    overlapping = [iv.mpf([4, 5]), iv.mpf([0, 2]), iv.mpf([1, 3])]
+    touching = [iv.mpf([0, 1]), iv.mpf([1, 2])]
+    # A singleton node lying within a wider one
+    singleton = [iv.mpf([0, 4]), iv.mpf(2), iv.mpf([6, 7])]
+
+    assert 'X intervals #2 and #3 overlap' in validation.validate_dataset(overlapping, overlapping, [iv.mpf(6)])
+    assert 'overlap' in validation.validate_dataset(touching, touching, [iv.mpf(3)])
+    assert 'overlap' in validation.validate_dataset(singleton, singleton, [iv.mpf(3)])
+
+    separate = [iv.mpf([0, 1]), iv.mpf([10, 11]), iv.mpf(20)]
+    assert validation.validate_dataset(separate, separate, [iv.mpf(3)]) is None
+
+
+def test_size_errors():
+    data_x = parsers.parse_real('1, 2, 3')
+
+    assert 'does not match' in validation.validate_dataset(data_x, data_x[:2], data_x)
+    assert 'empty' in validation.validate_dataset(data_x, data_x, [])
+
+
+def test_close_nodes_are_only_warned_about():
+    data_x = [mp.mpf(0), mp.mpf(1), mp.mpf(1) + mp.ldexp(1, -50), mp.mpf(2)]
+    warnings = []
+
+    assert validation.validate_dataset(data_x, data_x, data_x, warnings) is None
+    assert len(warnings) == 1 and '#2 and #3' in warnings[0]
+
+    # Close float64 nodes and close interval nodes (closer than the sum of their widths)
+    warnings = []
+    validation.validate_dataset(np.array([0.0, 1.0, 1.0 + 2.0 ** -40, 2.0]), data_x, data_x, warnings)
+    assert '#2 and #3' in warnings[0]
+    _, warnings = validation.check_nodes([iv.mpf([0, 1]), iv.mpf(['1.5', 2]), iv.mpf([10, 11])])
+    assert '#1 and #2' in warnings[0]
+
+    # Only the first pairs are listed
+    data_x = [mp.mpf(k) + mp.ldexp(j, -60) for k in range(10) for j in range(2)]
+    _, warnings = validation.check_nodes(data_x)
+    assert f'(and {10 - validation.MAX_REPORTED_PAIRS} more)' in warnings[0]
+
+
+def test_node_orders():
+    data_x = parsers.parse_real('2, -1, 0.5, 3, -2')
+
+    assert validation.node_order(data_x, 'input') is None
+    assert validation.node_order(data_x, 'sorted') == [4, 1, 2, 0, 3]
+    assert validation.node_order(np.array([float(x) for x in data_x]), 'sorted') == [4, 1, 2, 0, 3]
+    with pytest.raises(ValueError):
+        validation.node_order(data_x, 'random')
+
+    leja = validation.node_order(data_x, 'leja')
+    assert sorted(leja) == list(range(len(data_x)))
+    # The farthest node from the center first, then the farthest from it
+    assert leja[:2] == [3, 4]
+
+
+def test_interval_nodes_are_sorted_by_their_lower_endpoints():
+    data_x = [iv.mpf([5, 6]), iv.mpf([-1, 0]), iv.mpf([2, 4])]
+
+    assert validation.sorted_order(data_x) == [1, 2, 0]
+    assert sorted(validation.leja_order(data_x)) == [0, 1, 2]
+
+
+def test_reorder():
+    values = parsers.parse_real('10, 20, 30')
+
+    assert validation.reorder(values, None) is values
+    assert validation.reorder(values, [2, 0, 1]) == [values[2], values[0], values[1]]
+    assert validation.reorder(np.array([10.0, 20.0, 30.0]), [2, 0, 1]).tolist() == [30.0, 10.0, 20.0]
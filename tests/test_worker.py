@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from gui.worker import ComputationWorker
+
+
+class Root:
+    """
+    Stands in for the Tk root, running the scheduled polls on demand instead of from an event loop.
+    """
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+    def run_until_finished(self, worker):
+        while worker.running:
+            self.scheduled.pop(0)()
+
+
+def run(job) -> dict:
+    root = Root()
+    events = {'outputs': [], 'progress': [], 'finish': None}
+    worker = ComputationWorker(
+        root,
+        on_output=events['outputs'].append,
+        on_progress=lambda fraction, label: events['progress'].append((fraction, label)),
+        on_finish=lambda status, error: events.update(finish=(status, error))
+    )
+    worker.start(job)
+    root.run_until_finished(worker)
+    return events
+
+
+def test_outputs_arrive_in_order():
+    def job(progress):
+        for k in range(3):
+            progress(k / 3, f'stage {k}')
+            yield k
+
+    events = run(job)
+
+    assert events['outputs'] == [0, 1, 2]
+    assert events['finish'] == ('done', None)
+    assert events['progress'] and all(label.startswith('stage') for _, label in events['progress'])
+
+
+def test_errors_are_reported():
+    def job(progress):
+        yield 'first'
+        raise ValueError('broken')
+
+    events = run(job)
+
+    assert events['outputs'] == ['first']
+    status, error = events['finish']
+    assert status == 'error' and isinstance(error, ValueError)
+
+
+def test_cancel_stops_the_job_at_its_next_progress_report():
+    root = Root()
+    reached, finished = threading.Event(), []
+    worker = ComputationWorker(root, on_finish=lambda status, error: finished.append(status))
+
+    def job(progress):
+        reached.set()
+        while True:
+            progress(0, 'spinning')
+
+    worker.start(job)
+    reached.wait(5)
+    worker.cancel()
+    root.run_until_finished(worker)
+
+    assert finished == ['cancelled']
+
+
+def test_only_one_job_at_a_time():
+    root = Root()
+    release = threading.Event()
+    worker = ComputationWorker(root)
+    worker.start(lambda progress: iter([release.wait(5)]))
+
+    with pytest.raises(RuntimeError):
+        worker.start(lambda progress: ())
+    release.set()
+    root.run_until_finished(worker)
+
+    # The worker can be reused once the job has finished
+    worker.start(lambda progress: ())
+    root.run_until_finished(worker)
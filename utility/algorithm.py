@@ -7,23 +7,66 @@ This module contains the three algorithms performed by the application:
     - `neville()`:
         Neville's Interpolation algorithm.
     - `lagrange_coefficients()`:
-        Computes Lagrange Interpolation Polynomial's coefficients.
+        Computes Lagrange Interpolation Polynomial's coefficients (or, with `product_coefficients()`,
+        the slower but in interval arithmetic narrower ones of the original algorithm).
 
-All three functions are constructed to work explicitly on mpmath floating point numbers and floating point intervals.
+`neville_many()` runs Neville's algorithm for many new points at once, sharing the node-difference table
+of the tableau between them, and can return the full tableau of every point.
+
+`interpolate_all()` is the fused form of the three algorithms, computing the node differences and the weights
+only once for all of them. `utility.fastreal` and `utility.floatinterval` provide it with the same signature.
+
+It also holds the `BarycentricInterpolant` class, a reusable form of the Lagrange polynomial that computes
+its barycentric weights once and then evaluates any number of new points in linear time each, and its
+`IncrementalInterpolant` subclass, which additionally supports inserting and removing single nodes in linear time,
+keeping its polynomial coefficients in sync without rebuilding them.
+
+All of the above are constructed to work explicitly on mpmath floating point numbers and floating point intervals.
+
+`lagrange()`, `neville()` and `neville_many()` additionally have vectorized code paths for nodes given as a
+`utility.intervalvector.IntervalVector`, which the remaining functions accept as any other sequence.
+`BarycentricInterpolant.evaluate_many()` likewise evaluates a whole `IntervalVector` of new points at once.
+
+The longer-running functions accept an optional ``progress`` callable, which is called with the completed
+fraction (0 to 1) of the work once per outer iteration. It may raise an exception to abort the computation.
+
+The algorithms and the costly helpers are recorded as stages of the active `utility.instrumentation.Profiler`.
+
+The O(n^2) functions and methods accept an optional ``workers`` count, which splits large inputs across
+a process pool, see `utility.parallel`. Small inputs are always computed serially.
 """
 
 
 from mpmath import iv, mp
+from mpmath.libmp import fone, mpf_div, mpf_mul, mpf_neg, mpf_sub, mpi_mul, mpi_neg
+
+from utility import parallel
+from utility import precision  # sets the default precision of both mpmath contexts
+from utility.instrumentation import add_operations, instrumented
+from utility.intervalvector import IntervalVector
+
+
+# Largest number of nodes for which neville_many() precomputes its node-difference table (n^2 / 2 values)
+NEVILLE_TABLE_MAX_NODES = 500
+
 
+@instrumented()
+def lagrange(arr_x, arr_y, arr_z, workers: int = None) -> mp.mpf | iv.mpf:
+    if parallel.worthwhile(len(arr_x) ** 2, workers):
+        return parallel.lagrange(arr_x, arr_y, arr_z, workers)
+    return _lagrange_terms(arr_x, arr_y, arr_z, 0, len(arr_x))
 
-iv.prec = 64
-mp.prec = 64
 
+def _lagrange_terms(arr_x, arr_y, arr_z, start: int, stop: int) -> mp.mpf | iv.mpf:
+    """
+    Returns the sum of the terms ``start..stop-1`` of `lagrange()`.
+    """
+    if isinstance(arr_x, IntervalVector):
+        return _lagrange_vector(arr_x, arr_y, arr_z, start, stop)
 
-def lagrange(arr_x, arr_y, arr_z) -> mp.mpf | iv.mpf:
     dtype = type(arr_x[0])
     result = dtype(0)
-    for i in range(len(arr_x)):
+    for i in range(start, stop):
         term = arr_y[i]
         for j in range(len(arr_x)):
             if i == j: continue
@@ -36,42 +79,814 @@ def lagrange(arr_x, arr_y, arr_z) -> mp.mpf | iv.mpf:
     return result
 
 
-def neville(arr_x, arr_y, arr_z) -> mp.mpf | iv.mpf:
-    y_ = arr_y.copy()
-    arr_z = arr_z[0]
+@instrumented()
+def neville(arr_x, arr_y, arr_z, progress=None) -> mp.mpf | iv.mpf:
+    return neville_many(arr_x, arr_y, arr_z[:1], progress=progress)[0]
+
+
+def neville_differences(arr_x, progress=None) -> list:
+    """
+    Compute the node-difference table of Neville's tableau, ``table[i - 1][j] = x_j - x_(i+j)``
+    for every level ``i`` of the tableau.
+
+    The table does not depend on the new point, so it can be shared by any number of `neville_many()` sweeps.
+    It holds ``n * (n - 1) / 2`` values.
+
+    :param arr_x: Interpolation nodes
+    :param progress: Optional progress callback
+    :return: List of levels. For interval nodes every level is an `IntervalVector`, the batched form
+        `neville_many()` computes with, otherwise a list of ``mp.mpf``.
+    """
+    n = len(arr_x)
+    if n and isinstance(arr_x[0], iv.mpf) and not isinstance(arr_x, IntervalVector):
+        arr_x = IntervalVector.from_intervals(arr_x)
+
+    table = []
+    for i in range(1, n):
+        if progress is not None:
+            progress(i / n)
+        if isinstance(arr_x, IntervalVector):
+            table.append(arr_x[:n - i].sub(arr_x[i:]))
+        else:
+            table.append([arr_x[j] - arr_x[i + j] for j in range(n - i)])
+    return table
+
+
+@instrumented()
+def neville_many(arr_x, arr_y, arr_z, progress=None, differences=None, tableau=False,
+                 workers: int = None) -> list | tuple:
+    """
+    Neville's algorithm at every point of ``arr_z``, sharing all the work that does not depend on the point.
+
+    The denominators ``x_j - x_(i+j)`` come from the node-difference table (see `neville_differences()`),
+    which is computed once for the whole sweep, unless there are more than `NEVILLE_TABLE_MAX_NODES` nodes.
+    The differences ``z - x_j`` are computed once per point instead of twice per tableau entry.
+    Interval nodes are processed as `IntervalVector` batches, real nodes on raw ``mpmath.libmp`` values,
+    both round exactly like the equivalent ``iv.mpf``/``mp.mpf`` arithmetic.
+
+    :param arr_x: Interpolation nodes
+    :param arr_y: Values at the interpolation nodes
+    :param arr_z: New points' x values
+    :param progress: Optional progress callback
+    :param differences: Optional precomputed `neville_differences()` of ``arr_x``
+    :param tableau: Also return the full tableau of every point, for error analysis
+    :param workers: Number of processes sharing the points, see `utility.parallel` (not used with ``tableau``)
+    :return: List of values, one per point. With ``tableau``, a tuple of that list and the list of tableaus,
+        where ``tableaus[k][i][j]`` is the value at ``arr_z[k]`` of the polynomial interpolating the nodes ``j..j+i``.
+    """
+    n = len(arr_x)
+    if not tableau and parallel.worthwhile(n * n * len(arr_z), workers, len(arr_z)):
+        return parallel.neville_many(arr_x, arr_y, arr_z, workers, progress=progress)
+    if n and isinstance(arr_x[0], iv.mpf) and not isinstance(arr_x, IntervalVector):
+        arr_x = IntervalVector.from_intervals(arr_x)
+    if differences is None and n <= NEVILLE_TABLE_MAX_NODES and len(arr_z) > 1:
+        differences = neville_differences(arr_x)
+
+    if isinstance(arr_x, IntervalVector):
+        return _neville_many_vector(arr_x, arr_y, arr_z, progress, differences, tableau)
+    return _neville_many_real(arr_x, arr_y, arr_z, progress, differences, tableau)
+
+
+def _neville_many_real(arr_x, arr_y, arr_z, progress=None, differences=None, tableau=False) -> list | tuple:
+    """
+    `neville_many()` for ``mp.mpf`` nodes. Works on raw values with the current ``mp`` precision and rounding,
+    so no ``mp.mpf`` objects are created for the entries of the tableau. The operations are therefore
+    counted explicitly, see `utility.instrumentation.add_operations()`.
+    """
+    prec, rounding = mp._prec_rounding
+    n = len(arr_x)
+    # Per point: the differences z - x_j, then two multiplications, a subtraction and a division
+    # per tableau entry, plus a subtraction per entry without the node-difference table
+    operations = n + (4 if differences is not None else 5) * (n * (n - 1) // 2)
+    xs = [mp.convert(x)._mpf_ for x in arr_x]
+    ys = [mp.convert(y)._mpf_ for y in arr_y]
+    if differences is not None:
+        differences = [[value._mpf_ for value in row] for row in differences]
+
+    values = []
+    tableaus = []
+    for k, z in enumerate(arr_z):
+        z = mp.convert(z)._mpf_
+        d = [mpf_sub(z, x, prec, rounding) for x in xs]
+        y_ = list(ys)
+        levels = [[mp.make_mpf(v) for v in y_]] if tableau else None
+
+        for i in range(1, n):
+            if progress is not None:
+                progress((k + i / n) / len(arr_z))
+            if differences is not None:
+                row = differences[i - 1]
+            else:
+                row = [mpf_sub(xs[j], xs[i + j], prec, rounding) for j in range(n - i)]
+            for j in range(n - i):
+                y_[j] = mpf_div(
+                    mpf_sub(
+                        mpf_mul(d[i + j], y_[j], prec, rounding),
+                        mpf_mul(d[j], y_[j + 1], prec, rounding),
+                        prec, rounding
+                    ),
+                    row[j], prec, rounding
+                )
+            if tableau:
+                levels.append([mp.make_mpf(v) for v in y_[:n - i]])
+
+        add_operations(operations)
+        values.append(mp.make_mpf(y_[0]))
+        tableaus.append(levels)
+    return (values, tableaus) if tableau else values
+
+
+def _lagrange_vector(arr_x: IntervalVector, arr_y, arr_z, start: int, stop: int) -> iv.mpf:
+    """
+    `_lagrange_terms()` for `IntervalVector` nodes, vectorized over j. The numerators ``z - x_j``
+    do not depend on i, so they are computed only once. Every term is multiplied up from ``y_i`` in the order
+    of the scalar loop, so the results are identical to those of ``iv.mpf`` nodes.
+    """
+    numerators = arr_x.rsub(arr_z[0])
+    result = iv.mpf(0)
+    for i in range(start, stop):
+        fractions = numerators / arr_x.rsub(arr_x[i])
+        result = result + fractions.prod(skip=i, start=arr_y[i])
+    return result
+
+
+def _neville_many_vector(arr_x: IntervalVector, arr_y, arr_z, progress=None, differences=None,
+                         tableau=False) -> list | tuple:
+    """
+    `neville_many()` for `IntervalVector` nodes, every level of the tableau is computed as one batch.
+    """
+    if not isinstance(arr_y, IntervalVector):
+        arr_y = IntervalVector.from_intervals(arr_y)
+    n = len(arr_x)
+
+    values = []
+    tableaus = []
+    for k, z in enumerate(arr_z):
+        d = arr_x.rsub(z)
+        y_ = arr_y
+        levels = [y_.tolist()] if tableau else None
 
-    for i in range(1, len(arr_x)):
-        for j in range(len(arr_x) - i):
-            dx_ij = arr_z - arr_x[i + j]
-            dx_j = arr_x[j] - arr_z
-            dx_j_ij = arr_x[j] - arr_x[i + j]
+        for i in range(1, n):
+            if progress is not None:
+                progress((k + i / n) / len(arr_z))
+            if differences is not None:
+                denominators = differences[i - 1]
+            else:
+                denominators = arr_x[:n - i].sub(arr_x[i:])
+            y_ = d[i:].mul(y_[:n - i]).sub(d[:n - i].mul(y_[1:n - i + 1])).div(denominators)
+            if tableau:
+                levels.append(y_.tolist())
 
-            y_[j] = (dx_ij * y_[j] + dx_j * y_[j + 1]) / dx_j_ij
-    return y_[0]
+        values.append(y_[0])
+        tableaus.append(levels)
+    return (values, tableaus) if tableau else values
 
 
-def lagrange_coefficients(arr_x, arr_y) -> list:
+@instrumented()
+def lagrange_coefficients(arr_x, arr_y, progress=None, workers: int = None, tight: bool = False) -> list:
+    """
+    Compute the coefficients of the interpolation polynomial (lowest degree first) in O(n^2), from the barycentric
+    weights and synthetic divisions of the master polynomial, see `combine_basis_polynomials()`.
+
+    The operations are not performed in the order of the original O(n^3) algorithm, which multiplied out every
+    basis polynomial on its own, so the results are not bitwise identical to it: real coefficients differ
+    by a few ulp (a few dozen, for ill-conditioned nodes), and interval coefficients are wider, because
+    the synthetic divisions carry the width of every master polynomial coefficient along: about 1.2 to 3 times
+    on average for up to two dozen nodes, while single coefficients of larger or ill-conditioned datasets may be
+    hundreds of times wider. The interval coefficients remain rigorous enclosures of the exact ones.
+    With ``tight``, the original algorithm is used instead, see `product_coefficients()`.
+
+    :param arr_x: Interpolation nodes
+    :param arr_y: Values at the nodes
+    :param progress: Optional progress callback
+    :param workers: Number of processes sharing the work, see `utility.parallel` (ignored with ``tight``)
+    :param tight: Whether to compute the coefficients of the original O(n^3) algorithm
+    :return: List of coefficients, one per node
+    """
+    if isinstance(arr_x, IntervalVector):
+        arr_x, arr_y = arr_x.tolist(), list(arr_y)
+    if tight:
+        return product_coefficients(arr_x, arr_y, progress=progress)
+
+    weights = barycentric_weights(arr_x, workers=workers)
+    return combine_basis_polynomials(
+        arr_x,
+        [weights[i] * arr_y[i] for i in range(len(arr_x))],
+        progress=progress,
+        workers=workers
+    )
+
+
+@instrumented()
+def product_coefficients(arr_x, arr_y, progress=None) -> list:
+    """
+    Compute the coefficients of the interpolation polynomial (lowest degree first) in O(n^3), multiplying out
+    every basis polynomial on its own.
+
+    The operations are performed in the order of the original algorithm, so the results are bitwise identical
+    to it, which in interval arithmetic gives somewhat narrower enclosures than `lagrange_coefficients()`.
+
+    :param arr_x: Interpolation nodes
+    :param arr_y: Values at the nodes
+    :param progress: Optional progress callback
+    :return: List of coefficients, one per node
+    """
+    n = len(arr_x)
     dtype = type(arr_x[0])
-    out = [dtype(0)] * len(arr_x)
+    out = [dtype(0)] * n
+    basis = []
 
-    for i in range(len(arr_x)):
-        coeffs = [dtype(1)]
+    for i in range(n):
+        if progress is not None:
+            progress(i / n)
+        # The basis polynomial is multiplied out in place, in the same buffer for every node
+        basis[:] = [dtype(1)]
         denominator = dtype(1)
+        for j in range(n):
+            if i == j: continue
+            multiply_by_root(basis, arr_x[j])
+            denominator *= arr_x[i] - arr_x[j]
 
+        scale = arr_y[i] / denominator
+        for k in range(n):
+            out[k] += basis[k] * scale
+    return out
+
+
+def horner(poly: list, z) -> mp.mpf | iv.mpf:
+    """
+    Evaluate a polynomial given by its coefficients (lowest degree first) at ``z``.
+    """
+    result = poly[-1]
+    for k in range(len(poly) - 2, -1, -1):
+        result = result * z + poly[k]
+    return result
+
+
+def multiply_by_root(poly: list, root) -> list:
+    """
+    Multiply a polynomial given by its coefficients (lowest degree first) by ``(x - root)`` in place.
+
+    :return: The same, now one element longer, list
+    """
+    poly.append(poly[-1])
+    for k in range(len(poly) - 2, 0, -1):
+        poly[k] = poly[k - 1] - root * poly[k]
+    poly[0] = -root * poly[0]
+    return poly
+
+
+@instrumented()
+def master_polynomial(arr_x) -> list:
+    """
+    Compute the coefficients (lowest degree first) of the polynomial ``prod(x - x_j)`` in O(n^2).
+    """
+    poly = [type(arr_x[0])(1)]
+    for x in arr_x:
+        multiply_by_root(poly, x)
+    return poly
+
+
+def _log2_magnitude(value) -> float:
+    """
+    Returns an approximation of ``log2(|value|)`` read directly from the binary representation of an
+    ``mp.mpf`` or ``iv.mpf`` value (the larger endpoint for intervals).
+    """
+    raws = value._mpi_ if hasattr(value, '_mpi_') else (value._mpf_,)
+    return max(
+        raw[2] + raw[3] if raw[1] else float('-inf')
+        for raw in raws
+    )
+
+
+def synthetic_division(poly: list, root, out: list = None, magnitudes: list = None) -> list:
+    """
+    Divide a polynomial given by its coefficients (lowest degree first) by ``(x - root)`` in O(n).
+
+    The remainder is discarded, so ``root`` is expected to be a root of ``poly``. To keep the rounding
+    errors from growing with powers of ``root`` (or of ``1 / root``), the division is composite:
+    the coefficients above the term ``poly[s] * root**s`` of the largest magnitude are computed by
+    forward deflation (from the highest degree down), the ones below it by backward deflation.
+
+    :param poly: Coefficients of the divided polynomial
+    :param root: Root of the divisor
+    :param out: Optional preallocated list of length ``len(poly) - 1`` to write the quotient into
+    :param magnitudes: Optional precomputed ``_log2_magnitude()`` of every coefficient of ``poly``
+    :return: Coefficients of the quotient (``out``, if given)
+    """
+    degree = len(poly) - 1
+    if out is None:
+        out = [poly[0]] * degree
+    if magnitudes is None:
+        magnitudes = [_log2_magnitude(c) for c in poly]
+
+    # Backward deflation divides by the root, which is only possible if it cannot be zero
+    split = 0
+    if not (0 in root if isinstance(root, iv.mpf) else root == 0):
+        root_magnitude = _log2_magnitude(root)
+        split = max(
+            range(degree + 1),
+            key=lambda k: magnitudes[k] + k * root_magnitude
+        )
+        split = min(split, degree - 1)
+
+    # Forward deflation, coefficients split..degree-1
+    out[degree - 1] = poly[degree]
+    for k in range(degree - 1, split, -1):
+        out[k - 1] = poly[k] + root * out[k]
+
+    # Backward deflation, coefficients 0..split-1
+    if split > 0:
+        out[0] = -poly[0] / root
+        for k in range(1, split):
+            out[k] = (out[k - 1] - poly[k]) / root
+
+    return out
+
+
+@instrumented()
+def combine_basis_polynomials(arr_x, scales, progress=None, workers: int = None) -> list:
+    """
+    Compute the coefficients (lowest degree first) of ``sum(scales[i] * prod(x - x_j, j != i))`` in O(n^2).
+
+    The master polynomial ``prod(x - x_j)`` is built once, each basis polynomial is then obtained from it
+    by synthetic division in O(n), written into the same preallocated buffer. The rounding therefore differs
+    from multiplying out every basis polynomial on its own, see `lagrange_coefficients()`.
+
+    :param arr_x: Interpolation nodes
+    :param scales: Factor of each basis polynomial, for Lagrange's polynomial these are ``w_i * y_i``
+    :param progress: Optional progress callback
+    :param workers: Number of processes sharing the basis polynomials, see `utility.parallel`
+    :return: List of coefficients
+    """
+    master = master_polynomial(arr_x)
+    magnitudes = [_log2_magnitude(c) for c in master]
+    if parallel.worthwhile(len(arr_x) ** 2, workers):
+        return parallel.combine_basis_polynomials(arr_x, scales, master, magnitudes, workers, progress=progress)
+    return _combine_range(arr_x, scales, master, magnitudes, 0, len(arr_x), progress)
+
+
+def _combine_range(arr_x, scales, master: list, magnitudes: list, start: int, stop: int, progress=None) -> list:
+    """
+    Returns the sum of the scaled basis polynomials ``start..stop-1`` of `combine_basis_polynomials()`.
+    """
+    dtype = type(arr_x[0])
+    quotient = [dtype(0)] * len(arr_x)
+    out = [dtype(0)] * len(arr_x)
+
+    for i in range(start, stop):
+        if progress is not None:
+            progress((i - start) / (stop - start))
+        synthetic_division(master, arr_x[i], out=quotient, magnitudes=magnitudes)
+        scale = scales[i]
+        for k in range(len(arr_x)):
+            out[k] += quotient[k] * scale
+
+    return out
+
+
+@instrumented()
+def barycentric_weights(arr_x, progress=None, workers: int = None) -> list:
+    """
+    Compute the barycentric weights ``w_i = 1 / prod(x_i - x_j, j != i)`` of the given nodes.
+
+    Only one division per node is performed, the remaining O(n^2) work consists of subtractions
+    and multiplications.
+
+    :param arr_x: Interpolation nodes
+    :param progress: Optional progress callback
+    :param workers: Number of processes sharing the nodes, see `utility.parallel`
+    :return: List of weights, one per node
+    """
+    if parallel.worthwhile(len(arr_x) ** 2, workers):
+        return parallel.barycentric_weights(arr_x, workers, progress=progress)
+    return _weights_range(arr_x, 0, len(arr_x), progress)
+
+
+@instrumented()
+def weights_from_differences(arr_x, differences: list, progress=None) -> list:
+    """
+    Compute the barycentric weights of the nodes from their node-difference table (see `neville_differences()`),
+    without subtracting any nodes again.
+
+    Every difference ``x_i - x_j`` with ``j > i`` is ``table[j - i - 1][i]``, and with ``j < i`` it is the negated
+    ``table[i - j - 1][j]``. Both real and interval rounding are symmetric, so the product of the stored differences,
+    negated for an odd number of the latter, is exactly the product `barycentric_weights()` computes.
+
+    :param arr_x: Interpolation nodes
+    :param differences: Node-difference table of ``arr_x``
+    :param progress: Optional progress callback
+    :return: List of weights, one per node, identical to the ones of `barycentric_weights()`
+    """
+    n = len(arr_x)
+    interval = isinstance(arr_x[0], iv.mpf)
+    if interval:
+        prec = iv.prec
+        levels = [list(zip(level.lower, level.upper)) for level in differences]
+        one, multiply, negate = (fone, fone), lambda a, b: mpi_mul(a, b, prec), mpi_neg
+    else:
+        prec, rounding = mp._prec_rounding
+        levels = [[entry._mpf_ for entry in level] for level in differences]
+        one, multiply, negate = fone, lambda a, b: mpf_mul(a, b, prec, rounding), mpf_neg
+    make = iv.make_mpf if interval else mp.make_mpf
+    dtype = type(arr_x[0])
+
+    weights = [dtype(1)] * n
+    for i in range(n):
+        if progress is not None:
+            progress(i / n)
+        denominator = one
+        for j in range(i):
+            denominator = multiply(denominator, levels[i - j - 1][j])
+        for j in range(i + 1, n):
+            denominator = multiply(denominator, levels[j - i - 1][i])
+        if i % 2:
+            denominator = negate(denominator)
+        # The raw multiplications and negations bypass the operation counter of utility.instrumentation
+        add_operations(n - 1 + i % 2)
+        weights[i] = 1 / make(denominator)
+    return weights
+
+
+def _weights_range(arr_x, start: int, stop: int, progress=None) -> list:
+    """
+    Returns the barycentric weights of the nodes ``start..stop-1``.
+    """
+    dtype = type(arr_x[0])
+    weights = [dtype(1)] * (stop - start)
+    for i in range(start, stop):
+        if progress is not None:
+            progress((i - start) / (stop - start))
+        denominator = dtype(1)
         for j in range(len(arr_x)):
             if i == j: continue
+            denominator *= arr_x[i] - arr_x[j]
+        weights[i - start] = 1 / denominator
+    return weights
 
-            coeffs_tmp = [dtype(0)] * (len(coeffs) + 1)
 
-            for k in range(len(coeffs)):
-                coeffs_tmp[k]     -= coeffs[k] * arr_x[j]
-                coeffs_tmp[k + 1] += coeffs[k]
+class BarycentricInterpolant:
+    """
+    Lagrange interpolation polynomial stored in the barycentric form.
 
-            coeffs = coeffs_tmp
-            denominator *= arr_x[i] - arr_x[j]
+    The weights are computed once in O(n^2) upon initialization, from the node-difference table, which is then
+    kept for Neville's algorithm (up to `NEVILLE_TABLE_MAX_NODES` nodes). After that, every evaluation
+    costs O(n). Evaluation uses the first (modified Lagrange) barycentric form
+    ``p(z) = sum(w_i * y_i * prod(z - x_j, j != i))``, with the products built from prefix
+    and suffix products of ``z - x_j``. It never divides by ``z - x_i``, so it stays valid
+    for new points equal to, or overlapping with, one of the nodes in all three arithmetic modes.
+    """
 
-        scale = arr_y[i] / denominator
-        for j in range(len(coeffs)):
-            out[j] += coeffs[j] * scale
+    def __init__(self, arr_x, arr_y, progress=None, workers: int = None, weights: list = None):
+        """
+        Initialize the interpolant and compute its barycentric weights.
 
-    return out
+        :param arr_x: Interpolation nodes (``mp.mpf`` or ``iv.mpf``)
+        :param arr_y: Values at the interpolation nodes, of the same type and length as ``arr_x``
+        :param progress: Optional progress callback of the weights computation
+        :param workers: Number of processes computing the weights, see `utility.parallel`
+        :param weights: Already computed barycentric weights of ``arr_x``, which are then not computed again
+        """
+
+        self.dtype = type(arr_x[0])
+        self.nodes = list(arr_x)
+        self.values = list(arr_y)
+        self._coefficients = None
+        self._tight_coefficients = None
+        self._neville_differences = None
+        self._float_data = None
+
+        if weights is None:
+            n = len(self.nodes)
+            if n <= NEVILLE_TABLE_MAX_NODES and not parallel.worthwhile(n * n, workers):
+                # The node differences are shared by the weights and every later Neville sweep
+                self._neville_differences = neville_differences(self.nodes)
+                weights = weights_from_differences(self.nodes, self._neville_differences, progress=progress)
+            else:
+                weights = barycentric_weights(self.nodes, progress=progress, workers=workers)
+        self.weights = list(weights)
+        self._scaled_values = [w * y for w, y in zip(self.weights, self.values)]
+
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+    def __call__(self, z) -> mp.mpf | iv.mpf:
+        return self.evaluate(z)
+
+
+    def coefficients(self, progress=None, workers: int = None, tight: bool = False) -> list:
+        """
+        Return the coefficients of the interpolation polynomial, lowest degree first.
+
+        The coefficients are computed from the stored weights in O(n^2) on the first call and reused afterwards.
+        With ``tight``, they are computed by `product_coefficients()` in O(n^3) instead, and stored apart.
+
+        :param progress: Optional progress callback, only called if the coefficients are computed
+        :param workers: Number of processes computing the coefficients, see `utility.parallel`
+        :param tight: Whether to return the coefficients of the original O(n^3) algorithm
+        """
+
+        if tight:
+            if self._tight_coefficients is None:
+                self._tight_coefficients = product_coefficients(self.nodes, self.values, progress=progress)
+            return list(self._tight_coefficients)
+        if self._coefficients is None:
+            self._coefficients = combine_basis_polynomials(
+                self.nodes,
+                self._scaled_values,
+                progress=progress,
+                workers=workers
+            )
+        return list(self._coefficients)
+
+
+    def evaluate(self, z) -> mp.mpf | iv.mpf:
+        """
+        Evaluate the interpolation polynomial at a single point in O(n).
+
+        :param z: New point's x (``mp.mpf`` or ``iv.mpf``)
+        :return: Value of the polynomial at ``z``
+        """
+
+        n = len(self.nodes)
+        differences = [z - x for x in self.nodes]
+
+        # suffix[i] = prod(z - x_j, j >= i)
+        suffix = [self.dtype(1)] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            suffix[i] = suffix[i + 1] * differences[i]
+
+        result = self.dtype(0)
+        prefix = self.dtype(1)
+        for i in range(n):
+            result = result + self._scaled_values[i] * prefix * suffix[i + 1]
+            prefix = prefix * differences[i]
+        return result
+
+
+    def neville_differences(self) -> list | None:
+        """
+        Return the node-difference table of Neville's tableau (see the module-level `neville_differences()`),
+        computed on the first call and reused afterwards. Returns None for more than `NEVILLE_TABLE_MAX_NODES` nodes.
+        """
+
+        if self._neville_differences is None and len(self.nodes) <= NEVILLE_TABLE_MAX_NODES:
+            self._neville_differences = neville_differences(self.nodes)
+        return self._neville_differences
+
+
+    def neville_many(self, arr_z, progress=None, tableau=False, workers: int = None) -> list | tuple:
+        """
+        Run Neville's algorithm on the interpolant's nodes at every point of ``arr_z``,
+        reusing the stored node-difference table. See the module-level `neville_many()`.
+        """
+
+        if not tableau and parallel.worthwhile(len(self.nodes) ** 2 * len(arr_z), workers, len(arr_z)):
+            return parallel.neville_many(self.nodes, self.values, arr_z, workers, progress=progress)
+        return neville_many(
+            self.nodes,
+            self.values,
+            arr_z,
+            progress=progress,
+            differences=self.neville_differences(),
+            tableau=tableau
+        )
+
+
+    def float_data(self) -> tuple:
+        """
+        Return the nodes, the weights and the values of the interpolant as lists of floats, for plotting.
+
+        Interval nodes, weights and values are replaced by their midpoints. The weights are divided by
+        the largest of them first, which leaves the second barycentric form unchanged and keeps them
+        from overflowing. Computed on the first call and reused afterwards.
+        """
+
+        if self._float_data is None:
+            def midpoint(value):
+                return value.mid if isinstance(value, iv.mpf) else value
+
+            weights = [mp.mpf(midpoint(w)) for w in self.weights]
+            largest = max(abs(w) for w in weights)
+            self._float_data = (
+                [float(midpoint(x)) for x in self.nodes],
+                [float(w / largest) for w in weights],
+                [float(midpoint(y)) for y in self.values]
+            )
+        return self._float_data
+
+
+    @instrumented()
+    def evaluate_many(self, arr_z, progress=None, workers: int = None) -> list | IntervalVector:
+        """
+        Evaluate the interpolation polynomial at every point of ``arr_z``.
+
+        :param arr_z: New points' x values, an `IntervalVector` for the vectorized interval path
+        :param progress: Optional progress callback
+        :param workers: Number of processes sharing the points, see `utility.parallel`
+        :return: List of values, one per point, or an `IntervalVector` for an `IntervalVector` of points
+        """
+
+        if parallel.worthwhile(len(self.nodes) * len(arr_z), workers, len(arr_z)):
+            return parallel.evaluate_many(self, arr_z, workers, progress=progress)
+        if isinstance(arr_z, IntervalVector):
+            return self._evaluate_vector(arr_z, progress=progress)
+
+        out = []
+        for z in arr_z:
+            if progress is not None:
+                progress(len(out) / len(arr_z))
+            out.append(self.evaluate(z))
+        return out
+
+
+    def _evaluate_vector(self, arr_z: IntervalVector, progress=None) -> IntervalVector:
+        """
+        `self.evaluate()` of every point of an `IntervalVector` at once, with the same operations
+        in the same order, so the results are identical to the ones of the scalar path.
+        """
+
+        n, m = len(self.nodes), len(arr_z)
+        differences = [arr_z - x for x in self.nodes]
+
+        one = IntervalVector.filled(iv.mpf(1), m)
+        suffix = [one] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            suffix[i] = suffix[i + 1] * differences[i]
+
+        result = IntervalVector.filled(iv.mpf(0), m)
+        prefix = one
+        for i in range(n):
+            if progress is not None:
+                progress(i / n)
+            result = result + prefix * self._scaled_values[i] * suffix[i + 1]
+            prefix = prefix * differences[i]
+        return result
+
+
+class IncrementalInterpolant(BarycentricInterpolant):
+    """
+    Barycentric interpolant that allows inserting and removing single nodes in O(n).
+
+    Alongside the barycentric weights, the interpolant keeps the coefficients of the polynomial
+    (lowest degree first, the same as `lagrange_coefficients()`) and of the master polynomial
+    ``M(x) = prod(x - x_j)``. Both updates rely on the fact that two interpolation polynomials differing
+    by one node differ by a multiple of the master polynomial of their common nodes:
+
+        - inserting ``(x_new, y_new)``: ``p' = p + a * M``, where ``a = (y_new - p(x_new)) / M(x_new)``,
+        - removing ``x_k``: ``p' = p - lead(p) * M / (x - x_k)``.
+
+    Suited for data arriving one point at a time, when the polynomial is queried after every new point.
+    It is a library class: the application itself always fits a `BarycentricInterpolant`, whose weights
+    are rounded the same way however the dataset was entered.
+    """
+
+    def __init__(self, arr_x=(), arr_y=()):
+        """
+        Initialize the interpolant, optionally inserting the starting nodes one by one.
+
+        :param arr_x: Starting interpolation nodes (``mp.mpf`` or ``iv.mpf``), may be empty
+        :param arr_y: Values at the starting nodes
+        """
+
+        self.dtype = None
+        self.nodes = []
+        self.values = []
+        self.weights = []
+        self._scaled_values = []
+        self._master = []
+        self._coefficients = []
+        self._neville_differences = None
+        self._float_data = None
+
+        for x, y in zip(arr_x, arr_y):
+            self.insert(x, y)
+
+
+    def coefficients(self, progress=None, workers: int = None, tight: bool = False) -> list:
+        """
+        Return the coefficients of the interpolation polynomial, lowest degree first.
+
+        The coefficients are kept up to date by every insertion and removal, so ``progress`` is only called
+        with ``tight``, whose coefficients are computed anew by `product_coefficients()` on every call.
+        ``workers`` is accepted for compatibility with `BarycentricInterpolant.coefficients()` and ignored.
+        """
+
+        if tight:
+            return product_coefficients(self.nodes, self.values, progress=progress)
+        return list(self._coefficients)
+
+
+    def insert(self, x, y) -> None:
+        """
+        Add the node ``x`` with the value ``y`` in O(n).
+
+        :param x: New node, distinct from all current nodes (not overlapping any of them, for intervals)
+        :param y: Value at the new node
+        :raises ValueError: If ``x`` duplicates (or overlaps) one of the current nodes
+        """
+
+        for k, node in enumerate(self.nodes):
+            difference = x - node
+            # [Error] Overlapping interval nodes, their difference contains zero
+            if isinstance(difference, iv.mpf):
+                if 0 in difference:
+                    raise ValueError(f'The X interval {x} overlaps the X interval #{k + 1} ({node}), so their '
+                                     'difference contains zero and the results would be infinitely wide.')
+            # [Error] Duplicate node
+            elif difference == 0:
+                raise ValueError(f'The X value {x} duplicates the X value #{k + 1}, which is forbidden.')
+
+        if not self.nodes:
+            self.dtype = type(x)
+            self.nodes = [x]
+            self.values = [y]
+            self.weights = [self.dtype(1)]
+            self._scaled_values = [y]
+            self._master = multiply_by_root([self.dtype(1)], x)
+            self._coefficients = [y]
+            return
+
+        # M(x_new) = prod(x_new - x_j), which is also the inverse of the new node's weight
+        master_at_x = horner(self._master, x)
+        scale = (y - horner(self._coefficients, x)) / master_at_x
+
+        self._coefficients.append(self.dtype(0))
+        for k in range(len(self._master)):
+            self._coefficients[k] = self._coefficients[k] + scale * self._master[k]
+
+        for i in range(len(self.nodes)):
+            self.weights[i] = self.weights[i] / (self.nodes[i] - x)
+            self._scaled_values[i] = self.weights[i] * self.values[i]
+        self.weights.append(1 / master_at_x)
+        self._scaled_values.append(self.weights[-1] * y)
+
+        multiply_by_root(self._master, x)
+        self._neville_differences = None
+        self._float_data = None
+        self.nodes.append(x)
+        self.values.append(y)
+
+
+    def remove(self, index: int) -> None:
+        """
+        Remove the node at the given position in O(n).
+
+        :param index: Position of the node within `self.nodes`
+        """
+
+        x = self.nodes.pop(index)
+        self.values.pop(index)
+        self.weights.pop(index)
+        self._scaled_values.pop(index)
+        self._neville_differences = None
+        self._float_data = None
+
+        if not self.nodes:
+            self.__init__()
+            return
+
+        quotient = synthetic_division(self._master, x)
+        lead = self._coefficients[-1]
+        self._coefficients = [
+            self._coefficients[k] - lead * quotient[k]
+            for k in range(len(quotient) - 1)
+        ]
+        self._master = quotient
+
+        for i in range(len(self.nodes)):
+            self.weights[i] = self.weights[i] * (self.nodes[i] - x)
+            self._scaled_values[i] = self.weights[i] * self.values[i]
+
+
+@instrumented()
+def interpolate_all(arr_x, arr_y, arr_z, progress=None, workers: int = None) -> tuple:
+    """
+    Fused kernel computing the results of `lagrange()`, `neville_many()` and `lagrange_coefficients()` at once.
+
+    The node differences ``x_i - x_j`` are computed once into the node-difference table, which gives both
+    the barycentric weights (see `weights_from_differences()`) and the denominators of every Neville sweep,
+    and the scaled values ``w_i * y_i`` are shared by the evaluation and the coefficients. Calling the three
+    algorithms separately computes every difference three times and the weights twice.
+
+    :param arr_x: Interpolation nodes
+    :param arr_y: Values at the interpolation nodes
+    :param arr_z: New points' x values
+    :param progress: Optional progress callback of the whole computation
+    :param workers: Number of processes sharing large computations, see `utility.parallel`
+    :return: Tuple of the Lagrange values, the Neville values (one per point) and the coefficients
+    """
+
+    def stage_progress(stage):
+        if progress is None:
+            return None
+        return lambda f: progress((stage + f) / 4)
+
+    interpolant = BarycentricInterpolant(arr_x, arr_y, progress=stage_progress(0), workers=workers)
+    return (
+        interpolant.evaluate_many(arr_z, progress=stage_progress(1), workers=workers),
+        interpolant.neville_many(arr_z, progress=stage_progress(2), workers=workers),
+        interpolant.coefficients(progress=stage_progress(3), workers=workers)
+    )
@@ -0,0 +1,473 @@
+"""
+Headless batch mode running the interpolation algorithms on many datasets at once.
+
+This module reads datasets from a CSV or JSONL file, spreads them across a process pool and streams
+the results, in input order, as JSON lines to the standard output or to a file. It uses the same parsers
+(`utility.parsers`, through `gui.arithmeticmodes.parser_modes_map`) and the same kernels
+(`utility.algorithm`, `utility.fastreal`) as the GUI, but never imports tkinter.
+
+Every dataset consists of the fields ``x``, ``y``, ``z``, the optional ``mode`` (``'real'`` by default),
+the optional ``tolerance``, which turns on the adaptive precision of `utility.precision` for the dataset,
+the optional ``order`` of the nodes (``'input'`` by default, see `utility.validation.NODE_ORDERS`),
+the optional ``backend`` of the interval modes (``'mpmath'`` by default, ``'float64'`` for the NumPy interval
+kernels of `utility.floatinterval`), and the optional ``dataset``, the path of a binary dataset file
+(`utility.datafile`) whose mode and values are used instead of parsing the fields, at the precision stored
+in the file. The fields left empty in the file (usually the new points) are still read from ``z`` (or ``x``, ``y``).
+
+    - JSONL: one JSON object per line. Field values are either strings in the same format as the GUI's
+      entry fields, or JSON lists of numbers (lists of ``[a, b]`` pairs in the interval mode).
+    - CSV: a header row naming the columns, values in the same format as the GUI's entry fields.
+    - A single dataset file (``.ean``), run as one dataset.
+    - A column file (``-f columns``, guessed for ``.npy`` files): the X and Y values of a single dataset
+      in two columns of a CSV or NumPy file (``--columns``, see `utility.columnfile`), run in the mode
+      given by ``--mode`` with the new points given by ``--new-points``.
+
+Datasets are spread across the processes of the batch mode's own pool (``--workers``). A few very large
+datasets are better served by splitting the work of every single dataset across processes instead
+(``--kernel-workers``, see `utility.parallel`), in which case the datasets run one after another by default.
+
+It can be run with ``python main.py batch <input>`` or ``python -m utility.batch <input>``. The numeric stack
+is only imported once the batch mode runs, so `build_argument_parser()` stays cheap for `main`, which
+registers the batch options on every start.
+
+Functions
+---------
+
+    - ``read_datasets(path, file_format, columns)``
+        Lazily reads datasets from a CSV or JSONL file
+    - ``run_dataset(record)``
+        Runs all three algorithms on a single dataset
+    - ``run_batch(records, output, workers)``
+        Runs many datasets in a process pool and writes the results in input order
+    - ``main(argv)``
+        Command line entry point
+"""
+
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+
+from gui import arithmeticmodes
+from utility.startup import LazyModule
+
+futures = LazyModule('concurrent.futures')
+mpmath = LazyModule('mpmath')
+algorithm = LazyModule('utility.algorithm')
+columnfile = LazyModule('utility.columnfile')
+datafile = LazyModule('utility.datafile')
+fastreal = LazyModule('utility.fastreal')
+floatinterval = LazyModule('utility.floatinterval')
+parsers = LazyModule('utility.parsers')
+precision = LazyModule('utility.precision')
+validation = LazyModule('utility.validation')
+
+
+def _field_to_text(value, mode: str) -> str:
+    """
+    Convert a JSON field value into the text format accepted by the mode's parser.
+    """
+    if isinstance(value, str):
+        return value
+    if not isinstance(value, list):
+        value = [value]
+    if mode == 'interval':
+        return ','.join(
+            f'[{item[0]};{item[1]}]' if isinstance(item, list) else str(item)
+            for item in value
+        )
+    return ','.join(str(item) for item in value)
+
+
+def _json_row(line: str) -> dict:
+    row = json.loads(line)
+    if not isinstance(row, dict):
+        raise TypeError(f'expected a JSON object, got {type(row).__name__}')
+    return row
+
+
+def _row_to_record(row: dict) -> dict:
+    """
+    Convert a CSV or JSONL row into a dataset dictionary.
+
+    :raises ValueError: If the tolerance is not a number
+    """
+    dataset = row.get('dataset') or None
+    mode = row.get('mode') or (None if dataset else 'real')
+    tolerance = row.get('tolerance')
+    try:
+        tolerance = float(tolerance) if tolerance not in (None, '') else None
+    except (TypeError, ValueError):
+        raise ValueError(f'incorrect tolerance: {tolerance!r}') from None
+    return {
+        'mode': mode,
+        'x': _field_to_text(row.get('x', ''), mode),
+        'y': _field_to_text(row.get('y', ''), mode),
+        'z': _field_to_text(row.get('z', ''), mode),
+        'tolerance': tolerance,
+        'order': row.get('order') or None,
+        'backend': row.get('backend') or None,
+        'dataset': dataset,
+        'columns': None,
+    }
+
+
+def read_datasets(path: str, file_format: str = None, columns: tuple = (0, 1)):
+    """
+    Lazily read datasets from a CSV or JSONL file, or a single dataset from a dataset file or a column file.
+
+    :param path: Path of the input file, ``'-'`` for the standard input
+    :param file_format: ``'csv'``, ``'jsonl'``, ``'dataset'`` or ``'columns'``, guessed from the file extension
+        if not given
+    :param columns: Columns of the X and Y values of a column file, see `utility.columnfile.load()`
+    :return: Generator of dataset dictionaries with the keys ``'x'``, ``'y'``, ``'z'``, ``'mode'``,
+        ``'tolerance'``, ``'order'``, ``'backend'``, ``'dataset'`` and ``'columns'``. The mode of records with
+        a dataset file is ``None`` unless set explicitly, it is read from the file.
+    """
+
+    if file_format is None:
+        if path.lower().endswith('.csv'):
+            file_format = 'csv'
+        elif path.lower().endswith(datafile.EXTENSION):
+            file_format = 'dataset'
+        elif path.lower().endswith('.npy'):
+            file_format = 'columns'
+        else:
+            file_format = 'jsonl'
+
+    if file_format in ('dataset', 'columns'):
+        yield {'mode': None, 'x': '', 'y': '', 'z': '', 'tolerance': None, 'order': None, 'backend': None,
+               'dataset': path if file_format == 'dataset' else None,
+               'columns': (path, *columns) if file_format == 'columns' else None}
+        return
+
+    file = sys.stdin if path == '-' else open(path, newline='')
+    try:
+        if file_format == 'csv':
+            rows = csv.DictReader(file)
+            parse_row = dict
+        else:
+            rows = (line for line in file if line.strip())
+            parse_row = _json_row
+
+        for row in rows:
+            # [Error] Malformed row, reported as the error of its own dataset
+            try:
+                record = _row_to_record(parse_row(row))
+            except (ValueError, TypeError, IndexError, AttributeError) as error:
+                record = {'mode': None, 'x': '', 'y': '', 'z': '', 'tolerance': None, 'order': None,
+                          'backend': None, 'dataset': None, 'columns': None,
+                          'error': f'Incorrect dataset row: {error}'}
+            yield record
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def _to_json(value):
+    if isinstance(value, (mpmath.mp.mpf, mpmath.iv.mpf)):
+        return str(value)
+    return float(value)
+
+
+def _run_algorithms(mode: str, data_x, data_y, data_z, workers: int = None, backend: str = 'mpmath') -> tuple:
+    """
+    Returns the Lagrange values, the Neville values and the coefficients of an already validated dataset.
+    """
+    if mode == 'fast_real':
+        results = fastreal.interpolate_all(data_x, data_y, data_z, workers=workers)
+        return tuple(result.tolist() for result in results)
+    if backend == 'float64' and mode in ('interval', 'singleton'):
+        results = floatinterval.interpolate_all(data_x, data_y, data_z, workers=workers)
+        return tuple(result.to_intervals() for result in results)
+    return algorithm.interpolate_all(data_x, data_y, data_z, workers=workers)
+
+
+def run_dataset(record: dict) -> dict:
+    """
+    Parse a single dataset and run all three algorithms on it.
+
+    :param record: Dataset dictionary, as produced by `read_datasets()`, optionally with the number
+        of ``'kernel_workers'`` sharing the work of the dataset
+    :return: Dictionary with the results (as strings, or floats in the 'fast_real' mode),
+        or with the key ``'error'`` holding an error message. With adaptive precision, it also holds
+        the keys ``'precision'``, ``'error_estimate'`` and ``'converged'``; the ``'precision'`` of a dataset file
+        computed at its stored precision is given as well. ``'warnings'`` lists
+        the warnings about too close X values, if there are any.
+    """
+
+    mode = record['mode']
+    if record.get('error'):
+        return {'mode': mode, 'error': record['error']}
+    dataset = None
+    if record.get('dataset'):
+        # [Error] Unreadable dataset file, or one holding values of another mode
+        try:
+            dataset = datafile.load(record['dataset'])
+        except (OSError, datafile.DatasetFileError) as error:
+            return {'mode': mode, 'error': f'Could not load the dataset file: {error}'}
+        if mode is None:
+            mode = dataset.mode
+        elif mode != dataset.mode:
+            return {'mode': mode, 'error': f'The dataset file holds values of the \'{dataset.mode}\' mode.'}
+    elif record.get('columns'):
+        # [Error] Unreadable column file, or columns holding invalid values
+        mode = mode or 'real'
+        try:
+            dataset = columnfile.load(record['columns'][0], mode, *record['columns'][1:])
+        except (OSError, columnfile.ColumnFileError) as error:
+            return {'mode': mode, 'error': f'Could not import the columns: {error}'}
+
+    # The values of a dataset file are computed at the precision they were stored at,
+    # unless the adaptive precision (or a float64 path) picks its own
+    if (record.get('dataset') and mode != 'fast_real' and record.get('tolerance') is None
+            and record.get('backend') != 'float64'):
+        with precision.working_precision(dataset.precision):
+            result = _run_loaded(record, mode, dataset)
+        if 'error' not in result:
+            result['precision'] = dataset.precision
+        return result
+    return _run_loaded(record, mode, dataset)
+
+
+def _run_loaded(record: dict, mode: str, dataset) -> dict:
+    """
+    Parse the fields of a dataset not filled by its loaded values, and run all three algorithms on it.
+    """
+
+    if mode not in arithmeticmodes.MODES:
+        return {'mode': mode, 'error': f'Incorrect mode key request: {mode}'}
+    parser = arithmeticmodes.parser_modes_map[mode]
+
+    def loaded(field):
+        values = getattr(dataset, field) if dataset is not None else None
+        return values if values is not None and len(values) else None
+
+    errors = []
+    data = {}
+    for field, title in (('x', 'X values'), ('y', 'Y values'), ('z', 'New Point x')):
+        data[field] = loaded(field)
+        if data[field] is not None:
+            continue
+        if not record[field]:
+            return {'mode': mode, 'error': 'Not all fields have been filled.'}
+        data[field] = parsers.safe_parse(
+            parser_func=parser,
+            data_str=record[field],
+            error_command=errors.append,
+            error_message=f'Incorrect data format in field \'{title}\':\n{{}}'
+        )
+    if errors:
+        return {'mode': mode, 'error': '\n'.join(errors)}
+
+    data_x, data_y, data_z = data['x'], data['y'], data['z']
+    warnings = []
+    error = validation.validate_dataset(data_x, data_y, data_z, warnings)
+    if error is not None:
+        return {'mode': mode, 'error': error}
+
+    order = record.get('order') or 'input'
+    if order not in validation.NODE_ORDERS:
+        return {'mode': mode, 'error': f'Incorrect node order: {order}'}
+    indices = validation.node_order(data_x, order)
+
+    backend = record.get('backend') or 'mpmath'
+    if backend not in floatinterval.BACKENDS:
+        return {'mode': mode, 'error': f'Incorrect interval backend: {backend}'}
+    float_intervals = backend == 'float64' and mode in ('interval', 'singleton')
+
+    def run_reordered(data_x, data_y, data_z):
+        return _run_algorithms(
+            mode,
+            validation.reorder(data_x, indices),
+            validation.reorder(data_y, indices),
+            data_z,
+            record.get('kernel_workers'),
+            backend
+        )
+
+    tolerance = record.get('tolerance')
+    result = {'mode': mode}
+    if warnings:
+        result['warnings'] = warnings
+    # The precision of the fast paths cannot be raised
+    if tolerance is None or mode == 'fast_real' or float_intervals:
+        lagrange, neville, coefficients = run_reordered(data_x, data_y, data_z)
+    else:
+        outcome = precision.adaptive(
+            lambda: run_reordered(*(
+                data[field] if loaded(field) is not None else parser(record[field]) for field in 'xyz'
+            )),
+            tolerance
+        )
+        lagrange, neville, coefficients = outcome.result
+        result.update(
+            precision=outcome.precision,
+            error_estimate=str(outcome.error),
+            converged=outcome.converged
+        )
+
+    result.update(
+        lagrange=[_to_json(v) for v in lagrange],
+        neville=[_to_json(v) for v in neville],
+        coefficients=[_to_json(v) for v in coefficients]
+    )
+    return result
+
+
+def run_batch(records, output, workers: int = None) -> int:
+    """
+    Run all datasets and write one JSON line of results per dataset, in input order.
+
+    At most ``4 * workers`` datasets are in flight at once, so results start streaming out before
+    the whole input has been read.
+
+    A dataset that fails in any way, including malformed input rows and unexpected exceptions, gets a line
+    with its ``'error'`` and the remaining datasets still run.
+
+    :param records: Iterable of dataset dictionaries
+    :param output: Writable text stream
+    :param workers: Number of worker processes, the number of CPUs if not given, 1 runs in-process
+    :return: Number of datasets that failed
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    failed = 0
+
+    def write(index, result):
+        nonlocal failed
+        failed += 'error' in result
+        output.write(json.dumps({'index': index, **result}) + '\n')
+        output.flush()
+
+    def collect(index, record, future):
+        # [Error] The worker process itself failed (e.g. it was killed)
+        try:
+            write(index, future.result())
+        except Exception as error:
+            write(index, _unexpected_error(record, error))
+
+    if workers == 1:
+        for index, record in enumerate(records):
+            write(index, _run_isolated(record))
+        return failed
+
+    with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for index, record in enumerate(records):
+            pending.append((index, record, executor.submit(_run_isolated, record)))
+            if len(pending) >= 4 * workers:
+                collect(*pending.popleft())
+        while pending:
+            collect(*pending.popleft())
+    return failed
+
+
+def _unexpected_error(record: dict, error: Exception) -> dict:
+    return {'mode': record.get('mode'), 'error': f'Unexpected error: {type(error).__name__}: {error}'}
+
+
+def _run_isolated(record: dict) -> dict:
+    """
+    Run a single dataset with `run_dataset()`, turning any unexpected exception into the dataset's error,
+    so that a single failing dataset does not abort the whole batch.
+    """
+    try:
+        return run_dataset(record)
+    except Exception as error:
+        return _unexpected_error(record, error)
+
+
+def build_argument_parser(parser: argparse.ArgumentParser = None) -> argparse.ArgumentParser:
+    """
+    Add the batch mode's arguments to the given (sub)parser, or to a new one.
+    """
+
+    if parser is None:
+        parser = argparse.ArgumentParser(
+            prog='python -m utility.batch',
+            description='Run the interpolation algorithms on many datasets without the GUI.'
+        )
+    parser.add_argument('input', help='CSV or JSONL file with datasets, or a single dataset file (.ean), '
+                                      '\'-\' for the standard input')
+    parser.add_argument('-o', '--output', default='-', help='output JSONL file, standard output by default')
+    parser.add_argument('-f', '--format', choices=('csv', 'jsonl', 'dataset', 'columns'), default=None,
+                        help='input format, guessed from the file extension by default')
+    parser.add_argument('--columns', nargs=2, default=('0', '1'), metavar=('X', 'Y'),
+                        help='columns of the X and Y values of a column file, by index (from 0) or header name, '
+                             'interval endpoints as low:high, 0 and 1 by default')
+    parser.add_argument('--mode', choices=arithmeticmodes.MODES, default=None,
+                        help='arithmetic mode of a column file, \'real\' by default')
+    parser.add_argument('--new-points', default=None,
+                        help='new points for datasets that do not set their own, in the format of the GUI\'s field')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='number of worker processes, the number of CPUs by default')
+    parser.add_argument('-t', '--tolerance', type=float, default=None,
+                        help='use adaptive precision with this tolerance for datasets that do not set their own')
+    parser.add_argument('-k', '--kernel-workers', type=int, default=None,
+                        help='number of processes sharing the work of every single dataset, '
+                             'datasets then run one after another unless --workers is given')
+    parser.add_argument('--backend', choices=arithmeticmodes.interval_backend_options, default=None,
+                        help='interval backend of the interval modes for datasets that do not set their own, '
+                             '\'mpmath\' by default')
+    parser.add_argument('--order', choices=arithmeticmodes.node_order_options, default=None,
+                        help='order of the nodes for datasets that do not set their own, \'input\' by default')
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Command line entry point of the batch mode.
+
+    :param argv: Command line arguments, ``sys.argv[1:]`` if not given
+    :return: Exit code, 1 if any dataset failed
+    """
+
+    args = build_argument_parser().parse_args(argv)
+    return run(args)
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Run the batch mode with already parsed command line arguments.
+    """
+
+    records = read_datasets(args.input, args.format, tuple(map(columnfile.parse_column, args.columns)))
+    if args.mode is not None:
+        records = (dict(record, mode=args.mode) if record['mode'] is None else record for record in records)
+    if args.new_points is not None:
+        records = (dict(record, z=args.new_points) if not record['z'] else record for record in records)
+    if args.tolerance is not None:
+        records = (
+            dict(record, tolerance=args.tolerance) if record['tolerance'] is None else record
+            for record in records
+        )
+    if args.kernel_workers is not None:
+        records = (dict(record, kernel_workers=args.kernel_workers) for record in records)
+        if args.workers is None:
+            args.workers = 1
+    if args.backend is not None:
+        records = (
+            dict(record, backend=args.backend) if record['backend'] is None else record
+            for record in records
+        )
+    if args.order is not None:
+        records = (
+            dict(record, order=args.order) if record['order'] is None else record
+            for record in records
+        )
+    if args.output == '-':
+        failed = run_batch(records, sys.stdout, args.workers)
+    else:
+        with open(args.output, 'w') as output:
+            failed = run_batch(records, output, args.workers)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
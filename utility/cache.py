@@ -0,0 +1,300 @@
+"""
+Caching module holding fitted interpolants between computations.
+
+Fitting an interpolant (its barycentric weights, coefficients and difference tables) costs O(n^2) or more,
+while evaluating it at a new point costs only O(n). When the X and Y data stay the same and only the new point
+changes, the fitted interpolant can be reused. This module provides a bounded LRU cache for that purpose.
+The cache is thread-safe, so interpolants can be fitted into it in the background.
+
+Classes
+-------
+
+    - ``InterpolantCache(max_entries, max_bytes)``
+        LRU cache of fitted interpolants keyed on the arithmetic mode, the working precision
+        and a content hash of the parsed X and Y data.
+
+Functions
+---------
+
+    - ``dataset_digest(*arrays)``
+        Computes a content hash of parsed numeric data
+    - ``approximate_nbytes(obj)``
+        Estimates the memory taken by the numeric values held by an object
+"""
+
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+from utility import algorithm, precision
+from utility.intervalvector import IntervalVector
+
+
+def _raw(value):
+    """
+    Returns the raw, hashable binary representation of an ``mp.mpf`` or ``iv.mpf`` value.
+    """
+    if hasattr(value, '_mpf_'):
+        return value._mpf_
+    if hasattr(value, '_mpi_'):
+        return value._mpi_
+    return value
+
+
+def dataset_digest(*arrays) -> str:
+    """
+    Compute a content hash of the given arrays of parsed numeric values.
+
+    The hash is computed from the exact binary representations of the values, so two datasets
+    get the same digest only if their values are bitwise equal.
+
+    :param arrays: Lists of ``mp.mpf`` or ``iv.mpf`` values
+    :return: Hexadecimal digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        digest.update(repr(len(array)).encode())
+        for value in array:
+            digest.update(repr(_raw(value)).encode())
+    return digest.hexdigest()
+
+
+def _value_nbytes(value) -> int:
+    """
+    Returns the approximate size in bytes of a single numeric value, including its mantissas.
+    """
+    raw = _raw(value)
+    parts = raw if isinstance(raw, tuple) and raw and isinstance(raw[0], tuple) else (raw,)
+    return sys.getsizeof(value) + sum(
+        sys.getsizeof(part) + sum(sys.getsizeof(field) for field in part)
+        for part in parts
+        if isinstance(part, tuple)
+    )
+
+
+def approximate_nbytes(obj) -> int:
+    """
+    Estimate the memory taken by the numeric values stored in the list attributes of an object.
+
+    Lists and interval vectors nested one level deep (such as difference tables) are counted as well.
+    The size of a single value is measured on the first value found and assumed for all others.
+
+    :param obj: Any object, usually a fitted interpolant
+    :return: Approximate size in bytes
+    """
+    count = 0
+    sample = None
+    for attribute in vars(obj).values():
+        if not isinstance(attribute, list):
+            continue
+        for item in attribute:
+            if isinstance(item, (list, IntervalVector)):
+                count += len(item)
+                if sample is None and item:
+                    sample = item[0]
+            else:
+                count += 1
+                if sample is None:
+                    sample = item
+    if sample is None:
+        return sys.getsizeof(obj)
+    return sys.getsizeof(obj) + count * (_value_nbytes(sample) + 8)
+
+
+class InterpolantCache:
+    """
+    Bounded LRU cache of fitted interpolants.
+
+    Entries are keyed on the arithmetic mode, the precision they were fitted at and the content hash of
+    the parsed X and Y data. When either the number of entries or their total approximate size exceeds its limit,
+    the least recently used entries are evicted. The `hits`, `misses` and `evictions` counters are public.
+
+    All methods may be called from any thread. A dataset that is being fitted by one thread is not fitted
+    again by another, which waits for the first fit to finish instead.
+    """
+
+    def __init__(self,
+                 max_entries: int = 16,
+                 max_bytes: int = 64 * 2**20):
+        """
+        Initialize an empty cache.
+
+        :param max_entries: Maximum number of stored interpolants
+        :type max_entries: int
+        :param max_bytes: Maximum total approximate size of the stored interpolants, in bytes
+        :type max_bytes: int
+        """
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._pending = {}
+        self._lock = threading.RLock()
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    @staticmethod
+    def make_key(mode: str, arr_x, arr_y, prec: int = None) -> tuple:
+        """
+        Build the cache key of a dataset.
+
+        :param mode: Arithmetic mode name, as in `gui.arithmeticmodes.parser_modes_map`
+        :param arr_x: Parsed X values
+        :param arr_y: Parsed Y values
+        :param prec: Precision the interpolant is fitted at, in bits. The current precision by default
+        :return: Hashable key
+        """
+
+        if prec is None:
+            prec = precision.get_precision()
+        return mode, prec, dataset_digest(arr_x, arr_y)
+
+
+    def get_or_fit(self,
+                   mode: str,
+                   arr_x,
+                   arr_y,
+                   fit=algorithm.BarycentricInterpolant,
+                   wait=None):
+        """
+        Return the cached interpolant of the dataset, fitting and storing it first on a miss.
+
+        If another thread is already fitting the same dataset, its result is awaited instead. Should that fit
+        fail (or be cancelled), the dataset is fitted by this call. The interpolant is fitted and stored under
+        the precision current when the call starts, which `utility.precision.stable_precision()` keeps
+        from being changed by other threads meanwhile.
+
+        :param mode: Arithmetic mode name
+        :param arr_x: Parsed X values
+        :param arr_y: Parsed Y values
+        :param fit: Callable building the interpolant from ``arr_x`` and ``arr_y``
+        :param wait: Optional callable, called repeatedly while waiting for another thread's fit
+            (or for another thread's change of the precision). It may raise an exception to stop waiting.
+        :return: Fitted interpolant
+        """
+
+        with precision.stable_precision(wait) as prec:
+            return self._get_or_fit(self.make_key(mode, arr_x, arr_y, prec), arr_x, arr_y, fit, wait)
+
+
+    def _get_or_fit(self, key: tuple, arr_x, arr_y, fit, wait):
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return self._entries[key]
+                pending = self._pending.get(key)
+                if pending is None:
+                    self.misses += 1
+                    pending = self._pending[key] = threading.Event()
+                    break
+            while not pending.wait(0.05):
+                if wait is not None:
+                    wait()
+
+        try:
+            interpolant = fit(arr_x, arr_y)
+            self.store(key, interpolant)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+        return interpolant
+
+
+    def contains(self, mode: str, arr_x, arr_y) -> bool:
+        """
+        Check whether the interpolant of the dataset is cached, without counting a hit or a miss.
+        """
+
+        key = self.make_key(mode, arr_x, arr_y)
+        with self._lock:
+            return key in self._entries
+
+
+    def store(self, key: tuple, interpolant) -> None:
+        """
+        Store an interpolant under the given key, evicting least recently used entries if needed.
+
+        The size of an entry is measured when it is stored. Values an interpolant computes lazily later on
+        (such as its coefficients) are accounted for the next time `refresh_size()` is called for it.
+        """
+
+        size = approximate_nbytes(interpolant)
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = interpolant
+            self._sizes[key] = size
+            self._total_bytes += size
+            self._evict()
+
+
+    def refresh_size(self, mode: str, arr_x, arr_y) -> None:
+        """
+        Re-measure the size of a cached interpolant, e.g. after its coefficients have been computed.
+        """
+
+        key = self.make_key(mode, arr_x, arr_y)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._sizes[key]
+                self._sizes[key] = approximate_nbytes(self._entries[key])
+                self._total_bytes += self._sizes[key]
+                self._evict()
+
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+
+        The hit, miss and eviction counters keep counting across clears. Fits still running are left alone,
+        so their interpolants are stored once they finish and the threads waiting for them still get them.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters and its current size.
+        """
+
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+    # Both helpers below expect the caller to hold the lock
+
+    def _discard(self, key: tuple) -> None:
+        del self._entries[key]
+        self._total_bytes -= self._sizes.pop(key)
+
+
+    def _evict(self) -> None:
+        # The most recently stored entry is always kept, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or
+                self._total_bytes > self.max_bytes):
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
@@ -0,0 +1,266 @@
+"""
+Column import module reading the X and Y values of a dataset from columns of a CSV or NumPy (``.npy``) file.
+
+Large datasets no longer have to be pasted into the entry fields and parsed as one long string. This module
+reads two columns of a file straight into the numbers of an arithmetic mode, one chunk of `CHUNK_ROWS` rows
+at a time, and returns them as a `utility.datafile.Dataset` without new points:
+
+    - CSV (or any delimited text) files are read row by row. The delimiter is guessed from the start
+      of the file and a first row that is not numeric is taken for a header, so columns may be selected
+      by their header names. The cells of every chunk are converted by the mode's own parser
+      (`gui.arithmeticmodes.parser_modes_map`), so they accept exactly what the entry fields accept,
+      and errors are reported with the line of the offending cell.
+    - ``.npy`` files are memory-mapped and converted chunk by chunk. Columns are selected by their index
+      in a 2-D array, or by their field name in a structured array. Their float64 values are binary numbers,
+      so they are converted exactly, into point intervals in the interval modes.
+
+In the interval mode, a column may also be given as a pair of columns holding the endpoints, ``'low:high'``.
+
+Classes
+-------
+
+    - ``ColumnFileError``
+        Raised for files or columns that cannot be imported
+
+Functions
+---------
+
+    - ``parse_column(text)``
+        Converts a column given as text into a column selection
+    - ``load(path, mode, x_column, y_column, progress)``
+        Reads the X and Y values of a dataset from two columns of a file
+"""
+
+
+import csv
+import os
+
+import numpy as np
+from mpmath import iv, mp
+
+from gui.arithmeticmodes import parser_modes_map
+from utility import precision, tokenizer
+from utility.datafile import Dataset
+
+
+EXTENSIONS = ('.csv', '.tsv', '.txt', '.npy')
+
+# Rows converted at once, between two progress reports
+CHUNK_ROWS = 1 << 16
+
+_SNIFF_SIZE = 1 << 16
+_DELIMITERS = ',;\t '
+
+
+class ColumnFileError(ValueError):
+    """
+    Raised when a file cannot be read as columns, or the selected columns do not hold valid values.
+    """
+
+
+def parse_column(text: str):
+    """
+    Convert a column selection given as text (e.g. on the command line) into the form taken by `load()`.
+
+    :param text: Column index (counted from 0), header or field name, or two of them as ``'low:high'``
+    :return: An int, a str, or a tuple of two of them
+    """
+
+    if ':' in text:
+        low, high = text.split(':', 1)
+        return parse_column(low), parse_column(high)
+    text = text.strip()
+    return int(text) if text.isdigit() else text
+
+
+def _endpoints(column) -> tuple:
+    return tuple(column) if isinstance(column, tuple) else (column,)
+
+
+def load(path: str, mode: str, x_column=0, y_column=1, progress=None) -> Dataset:
+    """
+    Read the X and Y values of a dataset from two columns of a CSV or ``.npy`` file.
+
+    :param path: Path of the file, read as a NumPy array if it ends with ``.npy`` and as delimited text otherwise
+    :param mode: Arithmetic mode of the values, one of `utility.datafile.MODES`
+    :param x_column: Column of the X values, an index (counted from 0) or a header or field name. In the
+                     interval mode, a pair of them holding the lower and upper endpoints
+    :param y_column: Column of the Y values, in the same form
+    :param progress: Optional ``progress(fraction, label)`` callback, called after every chunk
+    :raises ColumnFileError: If the file cannot be read as columns, or the columns hold invalid values
+    :raises OSError: If the file cannot be read
+    :return: The dataset, with the current precision and no new points
+    """
+
+    if mode not in parser_modes_map:
+        raise ColumnFileError(f'Incorrect mode key request: {mode}')
+    columns = [_endpoints(x_column), _endpoints(y_column)]
+    if mode != 'interval' and any(len(endpoints) > 1 for endpoints in columns):
+        raise ColumnFileError('Pairs of endpoint columns are only accepted in the interval mode.')
+    if progress is None:
+        progress = lambda fraction, label: None
+
+    if path.lower().endswith('.npy'):
+        data_x, data_y = _load_npy(path, mode, columns, progress)
+    else:
+        data_x, data_y = _load_csv(path, mode, columns, progress)
+
+    if len(data_x) == 0:
+        raise ColumnFileError(f'{os.path.basename(path)} holds no values.')
+    empty = np.empty(0) if mode == 'fast_real' else []
+    return Dataset(mode, precision.get_precision(), data_x, data_y, empty)
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _resolve(column, header: list, name: str) -> int:
+    if isinstance(column, int):
+        return column
+    if header is None:
+        raise ColumnFileError(f'{name} has no header row, columns must be given by their index.')
+    if column not in header:
+        raise ColumnFileError(f'{name} has no column named \'{column}\'.')
+    return header.index(column)
+
+
+def _load_csv(path: str, mode: str, columns: list, progress) -> tuple:
+    """
+    Read the columns of a delimited text file, converting one chunk of rows at a time with the mode's parser.
+    """
+
+    name = os.path.basename(path)
+    parser = parser_modes_map[mode]
+    size = max(os.path.getsize(path), 1)
+    read = 0
+
+    with open(path, newline='') as file:
+        sample = file.read(_SNIFF_SIZE)
+        file.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=_DELIMITERS)
+        except csv.Error:
+            dialect = csv.excel
+
+        def lines():
+            nonlocal read
+            for line in file:
+                read += len(line)
+                yield line
+
+        reader = csv.reader(lines(), dialect)
+        rows = (row for row in reader if any(cell.strip() for cell in row))
+        first = next(rows, None)
+        if first is None:
+            return [], []
+        first = [cell.strip() for cell in first]
+
+        wanted = [column for endpoints in columns for column in endpoints]
+        header = None
+        if any(isinstance(column, str) for column in wanted) or not all(
+                _is_number(first[column]) for column in wanted if column < len(first)):
+            header = first
+        indices = [[_resolve(column, header, name) for column in endpoints] for endpoints in columns]
+
+        data = ([], [])
+        pending = [] if header is not None else [(reader.line_num, first)]
+        while True:
+            pending.extend((reader.line_num, row) for _, row in zip(range(CHUNK_ROWS - len(pending)), rows))
+            if not pending:
+                break
+            for values, field_indices, title in zip(data, indices, ('X', 'Y')):
+                values.extend(_convert_cells(parser, pending, field_indices, mode, name, title))
+            pending = []
+            progress(min(read / size, 1.0), f'Importing {name}')
+
+    if mode == 'fast_real':
+        return tuple(np.concatenate(values) if values else np.empty(0) for values in data)
+    return data
+
+
+def _convert_cells(parser, rows: list, indices: list, mode: str, name: str, title: str):
+    """
+    Convert the cells of one column (or of a pair of endpoint columns) of a chunk of rows with the mode's parser.
+
+    :return: List of values, or a list holding a single float64 array in the 'fast_real' mode
+    """
+
+    try:
+        cells = [[row[index].strip() for index in indices] for _, row in rows]
+    except IndexError:
+        line = next(line for line, row in rows if max(indices) >= len(row))
+        raise ColumnFileError(f'{name}, line {line}: missing {title} column.') from None
+
+    if mode == 'interval':
+        # A single column holds point intervals
+        text = ','.join(f'{cell[0]};{cell[-1]}' for cell in cells)
+    else:
+        text = ','.join(cell[0] for cell in cells)
+
+    try:
+        values = parser(text)
+    except tokenizer.ParseError as error:
+        line = rows[text.count(',', 0, error.offset)][0]
+        raise ColumnFileError(f'{name}, line {line}: incorrect {title} value.') from None
+    return [values] if mode == 'fast_real' else values
+
+
+def _load_npy(path: str, mode: str, columns: list, progress) -> tuple:
+    """
+    Read the columns of a memory-mapped ``.npy`` file, converting one chunk of rows at a time.
+    """
+
+    name = os.path.basename(path)
+    try:
+        array = np.load(path, mmap_mode='r', allow_pickle=False)
+    except ValueError as error:
+        raise ColumnFileError(f'{name} is not a NumPy array file: {error}') from None
+
+    def column(selection):
+        if array.dtype.names is not None:
+            if selection not in array.dtype.names:
+                raise ColumnFileError(f'{name} has no field named \'{selection}\'.')
+            data = array[selection]
+        elif array.ndim != 2 or not isinstance(selection, int) or selection >= array.shape[1]:
+            raise ColumnFileError(f'{name} has no column {selection!r}, its shape is {array.shape}.')
+        else:
+            data = array[:, selection]
+        if data.ndim != 1 or not (np.issubdtype(data.dtype, np.integer) or np.issubdtype(data.dtype, np.floating)):
+            raise ColumnFileError(f'{name}: column {selection!r} does not hold real numbers.')
+        return data
+
+    selected = [[column(selection) for selection in endpoints] for endpoints in columns]
+    count = len(selected[0][0])
+
+    data = ([], [])
+    for start in range(0, count, CHUNK_ROWS):
+        for values, endpoints, title in zip(data, selected, ('X', 'Y')):
+            chunk = [np.asarray(endpoint[start:start + CHUNK_ROWS], dtype=np.float64) for endpoint in endpoints]
+            if not all(np.isfinite(endpoint).all() for endpoint in chunk):
+                raise ColumnFileError(f'{name}: the {title} column holds infinite or NaN values.')
+            values.extend(_convert_floats(chunk, mode))
+        progress(min((start + CHUNK_ROWS) / count, 1.0), f'Importing {name}')
+
+    if mode == 'fast_real':
+        return tuple(np.concatenate(values) if values else np.empty(0) for values in data)
+    return data
+
+
+def _convert_floats(chunk: list, mode: str) -> list:
+    """
+    Convert a chunk of float64 values (or of pairs of endpoints) exactly into the numbers of the mode.
+
+    :return: List of values, or a list holding a single float64 array in the 'fast_real' mode
+    """
+
+    if mode == 'fast_real':
+        return [chunk[0]]
+    if mode == 'real':
+        return list(map(mp.mpf, chunk[0].tolist()))
+    low, high = chunk[0], chunk[-1]
+    return [iv.mpf(pair) for pair in zip(np.minimum(low, high).tolist(), np.maximum(low, high).tolist())]
@@ -0,0 +1,336 @@
+"""
+Binary dataset file module storing parsed datasets for quick reloading.
+
+Typing or pasting a dataset into the entry fields means parsing its decimal text again every time.
+This module instead stores the parsed X values, Y values and new points of a dataset, together with its
+arithmetic mode and working precision, in a compact binary file (``.ean``), which is read back through
+a memory map without any decimal conversion:
+
+    - In the 'fast_real' mode, the values are stored as little-endian float64, and loading returns read-only
+      NumPy arrays mapped directly onto the file (zero-copy). This is the only zero-copy mode.
+    - In the ``mpmath`` modes, every value (every endpoint, in the interval modes) is stored as a fixed-size
+      record of its binary exponent and its mantissa, split into as many 64-bit words as the precision needs.
+      Loading rebuilds the exact ``mp.mpf`` / ``iv.mpf`` values from the mapped records, reading the mantissas
+      of the whole array at once, so it allocates one Python object per value (two per interval).
+
+The values are stored and loaded exactly, so a loaded dataset is bitwise equal to the saved one.
+
+The file starts with a 64-byte header (`HEADER`), followed by the X, Y and new points' arrays one after another.
+
+Classes
+-------
+
+    - ``Dataset(mode, precision, x, y, z)``
+        Parsed dataset held by a dataset file, or imported from columns of a CSV or NPY file
+        (`utility.columnfile`)
+    - ``DatasetFileError``
+        Raised for files that are not valid dataset files
+
+Functions
+---------
+
+    - ``save(path, mode, data_x, data_y, data_z, precision)``
+        Writes a parsed dataset to a dataset file
+    - ``load(path)``
+        Reads a dataset file through a memory map
+    - ``is_dataset_file(path)``
+        Tells whether a file starts with the dataset file signature
+"""
+
+
+import os
+
+import numpy as np
+from mpmath import iv, mp
+from mpmath.libmp import finf, fnan, fninf, fzero
+
+from utility import precision as precision_module
+
+
+EXTENSION = '.ean'
+MAGIC = b'EANDATA\x00'
+VERSION = 1
+
+# Mode codes stored in the header
+MODES = ('real', 'interval', 'singleton', 'fast_real')
+
+HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u2'),
+    ('mode', 'u1'),
+    ('endpoints', 'u1'),
+    ('precision', '<u4'),
+    ('words', '<u4'),
+    ('counts', '<u8', (3,)),
+    ('reserved', 'V20'),
+])
+
+# Kinds of the stored ``mpmath`` values
+_POSITIVE, _NEGATIVE, _ZERO, _INF, _NINF, _NAN = range(6)
+_SPECIAL_RAWS = {_ZERO: fzero, _INF: finf, _NINF: fninf, _NAN: fnan}
+_SPECIAL_KINDS = {raw: kind for kind, raw in _SPECIAL_RAWS.items()}
+
+_WORD_BITS = 64
+_WORD_MASK = (1 << _WORD_BITS) - 1
+
+
+class DatasetFileError(ValueError):
+    """
+    Raised when a file is not a valid dataset file, or a dataset cannot be stored.
+    """
+
+
+class Dataset:
+    """
+    Parsed dataset held by a dataset file: its mode, its precision and the X values, Y values and new points.
+    """
+
+    __slots__ = ('mode', 'precision', 'x', 'y', 'z')
+
+    def __init__(self, mode: str, precision: int, x, y, z):
+        """
+        Initialize a utility.datafile.Dataset instance.
+
+        :param mode: Arithmetic mode of the values, one of `MODES`
+        :param precision: Working precision the values were parsed at, in bits
+        :param x: X values, a list of ``mp.mpf`` / ``iv.mpf`` values or a float64 array in the 'fast_real' mode
+        :param y: Y values, of the same type
+        :param z: New points' x values, of the same type, possibly empty
+        """
+
+        self.mode = mode
+        self.precision = precision
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+    def summary(self) -> str:
+        return (f'{self.mode} mode, {self.precision} bits, {len(self.x):,} nodes, '
+                f'{len(self.z):,} new points')
+
+
+    def describe(self, field: str, head: int = 3) -> str:
+        """
+        Returns a short description of one of the fields, shown in its entry field instead of its values:
+        the number of values, their range and the first few of them.
+
+        :param field: 'x', 'y' or 'z'
+        :param head: Number of leading values listed
+        """
+
+        values = getattr(self, field)
+        if len(values) == 0:
+            return '0 values'
+        if self.mode == 'fast_real':
+            low, high = float(np.min(values)), float(np.max(values))
+            first = [float(value) for value in values[:head]]
+        elif self.mode in ('interval', 'singleton'):
+            low = min(mp.make_mpf(value._mpi_[0]) for value in values)
+            high = max(mp.make_mpf(value._mpi_[1]) for value in values)
+            first = values[:head]
+        else:
+            low, high = min(values), max(values)
+            first = values[:head]
+        more = ', ...' if len(values) > head else ''
+        return (f'{len(values):,} value{"s" if len(values) > 1 else ""} in [{_short_str(low)}; {_short_str(high)}]\n'
+                f'{", ".join(map(_short_str, first))}{more}')
+
+
+def _short_str(value) -> str:
+    if isinstance(value, iv.mpf):
+        return f'[{_short_str(mp.make_mpf(value._mpi_[0]))}; {_short_str(mp.make_mpf(value._mpi_[1]))}]'
+    if isinstance(value, float):
+        return f'{value:.8g}'
+    return mp.nstr(value, 8)
+
+
+def _record_dtype(words: int) -> np.dtype:
+    return np.dtype([('exponent', '<i8'), ('mantissa', '<u8', (words,)), ('kind', 'u1')], align=True)
+
+
+def _item_dtype(mode: str, words: int) -> np.dtype:
+    if mode == 'fast_real':
+        return np.dtype('<f8')
+    return _record_dtype(words)
+
+
+def _raws(values, endpoints: int) -> list:
+    """
+    Returns the raw ``mpmath.libmp`` values of a list of numbers, endpoint by endpoint for intervals.
+    """
+    if endpoints == 2:
+        return [raw for value in values for raw in value._mpi_]
+    return [value._mpf_ for value in values]
+
+
+def _encode(raws: list, words: int) -> np.ndarray:
+    """
+    Convert raw ``mpmath.libmp`` values into an array of exponent and mantissa records.
+    """
+    records = np.zeros(len(raws), dtype=_record_dtype(words))
+    kinds = [_SPECIAL_KINDS.get(raw, _NEGATIVE if raw[0] else _POSITIVE) for raw in raws]
+    records['kind'] = kinds
+    records['exponent'] = [raw[2] if kind <= _NEGATIVE else 0 for raw, kind in zip(raws, kinds)]
+    mantissas = [raw[1] if kind <= _NEGATIVE else 0 for raw, kind in zip(raws, kinds)]
+    if words == 1:
+        records['mantissa'][:, 0] = mantissas
+    else:
+        for word in range(words):
+            records['mantissa'][:, word] = [(man >> (word * _WORD_BITS)) & _WORD_MASK for man in mantissas]
+    return records
+
+
+def _decode(records: np.ndarray) -> list:
+    """
+    Convert an array of exponent and mantissa records back into raw ``mpmath.libmp`` values.
+    """
+    kinds = records['kind']
+    mantissa = records['mantissa']
+    finite = kinds <= _NEGATIVE
+    # Stored mantissas are normalized (odd), anything else is not a value written by save()
+    if (kinds > _NAN).any() or not (mantissa[finite, 0] & 1).all():
+        raise DatasetFileError('The dataset file is corrupted.')
+
+    words = mantissa.shape[1]
+    if words == 1:
+        mantissas = mantissa[:, 0].tolist()
+    else:
+        data = np.ascontiguousarray(mantissa).tobytes()
+        size = words * 8
+        mantissas = [int.from_bytes(data[start:start + size], 'little') for start in range(0, len(data), size)]
+
+    return [
+        (kind, man, exp, man.bit_length()) if kind <= _NEGATIVE else _SPECIAL_RAWS[kind]
+        for kind, man, exp in zip(kinds.tolist(), mantissas, records['exponent'].tolist())
+    ]
+
+
+def _words(raw_arrays, prec: int) -> int:
+    """
+    Returns the number of 64-bit words of the mantissas, enough for the precision and for every stored value.
+    """
+    bits = max((raw[3] for raws in raw_arrays for raw in raws if raw[1]), default=0)
+    return max(1, -(-max(bits, prec) // _WORD_BITS))
+
+
+def save(path: str, mode: str, data_x, data_y, data_z, precision: int = None) -> None:
+    """
+    Write a parsed dataset to a dataset file.
+
+    The file is written next to its destination first and moved into place once complete.
+
+    :param path: Path of the dataset file
+    :param mode: Arithmetic mode of the values, one of `MODES`
+    :param data_x: Parsed X values
+    :param data_y: Parsed Y values
+    :param data_z: Parsed new points' x values, may be empty
+    :param precision: Working precision of the values, the current one if not given
+    :raises DatasetFileError: If the mode is not known
+    :return: None
+    """
+
+    if mode not in MODES:
+        raise DatasetFileError(f'Incorrect mode key request: {mode}')
+    if precision is None:
+        precision = precision_module.get_precision()
+
+    endpoints = 2 if mode in ('interval', 'singleton') else 1
+    if mode == 'fast_real':
+        words = 0
+        arrays = [np.asarray(data, dtype='<f8') for data in (data_x, data_y, data_z)]
+    else:
+        raw_arrays = [_raws(data, endpoints) for data in (data_x, data_y, data_z)]
+        words = _words(raw_arrays, precision)
+        arrays = [_encode(raws, words) for raws in raw_arrays]
+
+    header = np.zeros(1, dtype=HEADER)
+    header['magic'] = MAGIC
+    header['version'] = VERSION
+    header['mode'] = MODES.index(mode)
+    header['endpoints'] = endpoints
+    header['precision'] = precision
+    header['words'] = words
+    header['counts'] = [len(data_x), len(data_y), len(data_z)]
+
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(header.tobytes())
+        for array in arrays:
+            file.write(array.tobytes())
+    os.replace(temporary, path)
+
+
+def _read_header(path: str) -> np.ndarray:
+    with open(path, 'rb') as file:
+        data = file.read(HEADER.itemsize)
+    if len(data) < HEADER.itemsize or not data.startswith(MAGIC):
+        raise DatasetFileError(f'{os.path.basename(path)} is not a dataset file.')
+    header = np.frombuffer(data, dtype=HEADER)[0]
+    if header['version'] != VERSION:
+        raise DatasetFileError(f'Unsupported dataset file version: {header["version"]}')
+    if header['mode'] >= len(MODES):
+        raise DatasetFileError('The dataset file is corrupted.')
+    return header
+
+
+def is_dataset_file(path: str) -> bool:
+    """
+    Tells whether the file at the given path starts with the dataset file signature.
+    """
+    try:
+        with open(path, 'rb') as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def load(path: str) -> Dataset:
+    """
+    Read a dataset file through a memory map.
+
+    In the 'fast_real' mode, the returned arrays are read-only views of the mapped file. In the ``mpmath`` modes,
+    the values are rebuilt exactly, whatever the current precision is; the stored precision is checked against
+    the size of the mantissa records and returned in `Dataset.precision`, for the caller to compute at.
+
+    :param path: Path of the dataset file
+    :raises DatasetFileError: If the file is not a valid dataset file, or its precision does not match its records
+    :raises OSError: If the file cannot be read
+    :return: The stored dataset
+    """
+
+    header = _read_header(path)
+    mode = MODES[header['mode']]
+    endpoints = int(header['endpoints'])
+    words = int(header['words'])
+    stored_precision = int(header['precision'])
+    # The mantissa words written by save() always hold the whole stored precision
+    needed = 0 if mode == 'fast_real' else max(1, -(-stored_precision // _WORD_BITS))
+    if not stored_precision or words < needed or (mode == 'fast_real') != (words == 0):
+        raise DatasetFileError('The dataset file is corrupted.')
+    dtype = _item_dtype(mode, words)
+    counts = [int(count) for count in header['counts']]
+
+    expected = HEADER.itemsize + sum(counts) * endpoints * dtype.itemsize
+    if os.path.getsize(path) != expected:
+        raise DatasetFileError('The dataset file is truncated or corrupted.')
+
+    fields = []
+    offset = HEADER.itemsize
+    for count in counts:
+        shape = (count, endpoints) if endpoints == 2 else (count,)
+        if count:
+            array = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+        else:
+            array = np.empty(shape, dtype=dtype)
+        offset += count * endpoints * dtype.itemsize
+
+        if mode == 'fast_real':
+            fields.append(array.view(np.ndarray))
+        elif endpoints == 2:
+            raws = _decode(array.reshape(-1))
+            fields.append([iv.make_mpf(pair) for pair in zip(raws[0::2], raws[1::2])])
+        else:
+            fields.append(list(map(mp.make_mpf, _decode(array))))
+
+    return Dataset(mode, stored_precision, *fields)
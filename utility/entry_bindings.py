@@ -1,3 +1,5 @@
+import functools
+import re
 import tkinter as tk
 
 
@@ -33,3 +35,25 @@ def input_filter(event,
     if char and char not in allowed_chars:
         return 'break'
     return None
+
+
+@functools.lru_cache(maxsize=16)
+def _disallowed_pattern(allowed_chars: str) -> re.Pattern:
+    return re.compile(f'[^{re.escape(allowed_chars)}]+')
+
+
+def filter_text(text: str,
+                allowed_chars: str = '0123456789.[;],\n') -> str:
+    """
+    Remove every character not in allowed_chars from the text, in a single pass.
+    The pattern of every character set is compiled once and reused.
+    """
+    return _disallowed_pattern(allowed_chars).sub('', text)
+
+
+def is_filtered(text: str,
+                allowed_chars: str = '0123456789.[;],\n') -> bool:
+    """
+    Tells whether the text only holds characters in allowed_chars.
+    """
+    return _disallowed_pattern(allowed_chars).search(text) is None
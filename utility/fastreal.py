@@ -0,0 +1,246 @@
+"""
+NumPy float64 fast path for the real arithmetic mode.
+
+This module mirrors the algorithms of `utility.algorithm` for plain IEEE double precision numbers.
+All kernels are vectorized with NumPy and work on ``np.ndarray`` objects, which makes them much
+faster than their ``mpmath`` counterparts, at the cost of being limited to 53-bit accuracy.
+It is meant for large, well-conditioned datasets.
+
+Functions
+---------
+
+    - ``parse_fast_real(s)``
+        Converts numeric array string into a ``np.float64`` array
+    - ``barycentric_weights(arr_x)``
+        Computes the (rescaled) barycentric weights of the nodes
+    - ``evaluate_barycentric(arr_x, weights, arr_y, arr_z)``
+        Evaluates the second barycentric form with given weights at every point of ``arr_z``
+    - ``lagrange(arr_x, arr_y, arr_z)``
+        Evaluates the Lagrange polynomial at every point of ``arr_z``
+    - ``neville(arr_x, arr_y, arr_z)``
+        Runs Neville's algorithm for every point of ``arr_z``
+    - ``lagrange_coefficients(arr_x, arr_y, weights)``
+        Computes Lagrange Interpolation Polynomial's coefficients
+    - ``interpolate_all(arr_x, arr_y, arr_z, progress, workers)``
+        Computes all three results at once, sharing the barycentric weights
+    - ``compare_with_mpmath(arr_x, arr_y, arr_z)``
+        Reports the speedup and deviation of the fast path against the ``mpmath`` algorithms
+"""
+
+
+import time
+
+import numpy as np
+from mpmath import mp
+
+from utility import algorithm, tokenizer
+
+
+# Number of rows processed at once by the kernels, bounds their memory use to BLOCK_SIZE * n floats.
+BLOCK_SIZE = 512
+
+# Largest dataset for which the GUI still runs the mpmath reference computation.
+COMPARE_MAX_NODES = 100
+
+
+def parse_fast_real(s: str) -> np.ndarray:
+    return np.fromiter(
+        map(float, tokenizer.iter_number_strings(s)),
+        dtype=np.float64
+    )
+
+
+def _capacity_exponent(arr_x: np.ndarray) -> int:
+    """
+    Returns ``k`` such that ``2^k`` is about ``4 / (max(x) - min(x))``, which keeps the products of node
+    differences from overflowing or underflowing for large node counts. Scaling by a power of two is exact,
+    and ``2^(k * (n - 1))`` is applied with ``np.ldexp`` without ever being formed as a float.
+    """
+    spread = arr_x.max() - arr_x.min()
+    if not 0 < spread < np.inf:
+        return 0
+    return int(np.frexp(4.0 / spread)[1]) - 1
+
+
+def barycentric_weights(arr_x: np.ndarray) -> np.ndarray:
+    """
+    Compute the barycentric weights of the nodes, rescaled by ``2^(k * (n - 1))`` where ``2^k`` is
+    the capacity scale of the nodes (see `_capacity_exponent()`).
+
+    :param arr_x: Interpolation nodes
+    :return: Rescaled weights, one per node
+    """
+    n = len(arr_x)
+    exponent = _capacity_exponent(arr_x)
+    weights = np.empty(n)
+    for start in range(0, n, BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, n)
+        diff = np.ldexp(arr_x[start:stop, None] - arr_x[None, :], exponent)
+        diff[np.arange(stop - start), np.arange(start, stop)] = 1.0
+        weights[start:stop] = 1.0 / np.prod(diff, axis=1)
+    return weights
+
+
+def evaluate_barycentric(arr_x: np.ndarray, weights: np.ndarray, arr_y: np.ndarray, arr_z: np.ndarray) -> np.ndarray:
+    """
+    Evaluate the second barycentric form ``sum(w_i y_i / (z - x_i)) / sum(w_i / (z - x_i))`` at every point
+    of ``arr_z``, in blocks of `BLOCK_SIZE` points. The weights may be scaled by any common factor.
+
+    :param arr_x: Interpolation nodes
+    :param weights: Barycentric weights of the nodes
+    :param arr_y: Values at the nodes
+    :param arr_z: New points' x values
+    :return: Values of the polynomial, one per point
+    """
+    out = np.empty(len(arr_z))
+
+    for start in range(0, len(arr_z), BLOCK_SIZE):
+        z = arr_z[start:start + BLOCK_SIZE, None]
+        diff = z - arr_x[None, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terms = weights / diff
+            block = (terms @ arr_y) / terms.sum(axis=1)
+
+        # Points that hit a node exactly take the node's value
+        rows, cols = np.nonzero(diff == 0)
+        block[rows] = arr_y[cols]
+        out[start:start + BLOCK_SIZE] = block
+    return out
+
+
+def lagrange(arr_x: np.ndarray, arr_y: np.ndarray, arr_z: np.ndarray) -> np.ndarray:
+    return evaluate_barycentric(arr_x, barycentric_weights(arr_x), arr_y, arr_z)
+
+
+def neville(arr_x: np.ndarray, arr_y: np.ndarray, arr_z: np.ndarray) -> np.ndarray:
+    n = len(arr_x)
+    out = np.empty(len(arr_z))
+
+    for start in range(0, len(arr_z), BLOCK_SIZE):
+        z = arr_z[start:start + BLOCK_SIZE, None]
+        y_ = np.tile(arr_y, (len(z), 1))
+        for i in range(1, n):
+            dx_ij = z - arr_x[i:]
+            dx_j = arr_x[:n - i] - z
+            dx_j_ij = arr_x[:n - i] - arr_x[i:]
+            y_[:, :n - i] = (dx_ij * y_[:, :n - i] + dx_j * y_[:, 1:n - i + 1]) / dx_j_ij
+        out[start:start + BLOCK_SIZE] = y_[:, 0]
+    return out
+
+
+def lagrange_coefficients(arr_x: np.ndarray, arr_y: np.ndarray, weights: np.ndarray = None) -> np.ndarray:
+    """
+    Compute the coefficients of the interpolation polynomial, lowest degree first.
+
+    The polynomial is built in the scaled variable ``t = 2^k x`` (see `_capacity_exponent()`), whose nodes
+    have exactly the rescaled weights of `barycentric_weights()`, and its coefficients are scaled back by
+    ``2^(k * j)`` with ``np.ldexp``. No power of the scale is ever formed as a float, so a coefficient only
+    overflows or underflows if its own value is out of the float64 range. The basis polynomials are divided
+    out of the master polynomial by composite deflation, like in `utility.algorithm.synthetic_division()`.
+
+    :param arr_x: Interpolation nodes
+    :param arr_y: Values at the nodes
+    :param weights: Rescaled weights from `barycentric_weights()`, computed if not given
+    :return: Coefficients, one per node
+    """
+    n = len(arr_x)
+    if weights is None:
+        weights = barycentric_weights(arr_x)
+    exponent = _capacity_exponent(arr_x)
+    scaled_x = np.ldexp(arr_x, exponent)
+    scaled_values = arr_y * weights
+
+    # Coefficients of prod(t - t_j), lowest degree first
+    master = np.poly(scaled_x)[::-1]
+    with np.errstate(divide='ignore'):
+        magnitudes = np.log2(np.abs(master))
+    out = np.zeros(n)
+
+    # Synthetic division of the master polynomial by (t - t_i), for a block of nodes at once
+    for start in range(0, n, BLOCK_SIZE):
+        roots = scaled_x[start:start + BLOCK_SIZE]
+
+        # Composite deflation, split at the term master[s] * t_i^s of the largest magnitude
+        # (see utility.algorithm.synthetic_division()), zero nodes are deflated forward only
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terms = magnitudes[None, :] + np.arange(n + 1)[None, :] * np.log2(np.abs(roots))[:, None]
+        split = np.minimum(np.argmax(np.nan_to_num(terms, nan=-np.inf), axis=1), n - 1)
+        split[roots == 0] = 0
+
+        quotients = np.empty((len(roots), n))
+        quotients[:, n - 1] = master[n]
+        for k in range(n - 1, 0, -1):
+            quotients[:, k - 1] = master[k] + roots * quotients[:, k]
+        if split.max() > 0:
+            backward = np.empty((len(roots), split.max()))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                backward[:, 0] = -master[0] / roots
+                for k in range(1, split.max()):
+                    backward[:, k] = (backward[:, k - 1] - master[k]) / roots
+            below = np.arange(split.max())[None, :] < split[:, None]
+            quotients[:, :split.max()] = np.where(below, backward, quotients[:, :split.max()])
+        out += scaled_values[start:start + BLOCK_SIZE] @ quotients
+    return np.ldexp(out, exponent * np.arange(n))
+
+
+def interpolate_all(arr_x: np.ndarray, arr_y: np.ndarray, arr_z: np.ndarray, progress=None,
+                    workers: int = None) -> tuple:
+    """
+    Compute the results of `lagrange()`, `neville()` and `lagrange_coefficients()` at once,
+    computing the barycentric weights only once for the first and the last of them.
+
+    The signature is that of `utility.algorithm.interpolate_all()`. The kernels are vectorized instead
+    of split across processes, so ``workers`` is ignored.
+
+    :param progress: Optional progress callback, called once before each of the three results
+    :param workers: Ignored
+    :return: Tuple of the three result arrays
+    """
+    if progress is not None:
+        progress(0)
+    weights = barycentric_weights(arr_x)
+    lagrange_values = evaluate_barycentric(arr_x, weights, arr_y, arr_z)
+    if progress is not None:
+        progress(1 / 3)
+    neville_values = neville(arr_x, arr_y, arr_z)
+    if progress is not None:
+        progress(2 / 3)
+    return lagrange_values, neville_values, lagrange_coefficients(arr_x, arr_y, weights)
+
+
+def compare_with_mpmath(arr_x: np.ndarray, arr_y: np.ndarray, arr_z: np.ndarray) -> dict:
+    """
+    Run both the fast path and the ``mpmath`` algorithms on the same data and compare them.
+
+    The ``mpmath`` computation runs on the exact values of the float64 inputs, so the reported
+    deviation measures the error of the float64 kernels alone.
+
+    :return: Dictionary holding both timings, the speedup and the largest absolute deviation
+        of each of the three results.
+    """
+
+    start = time.perf_counter()
+    fast = interpolate_all(arr_x, arr_y, arr_z)
+    fast_time = time.perf_counter() - start
+
+    mp_x = [mp.mpf(float(v)) for v in arr_x]
+    mp_y = [mp.mpf(float(v)) for v in arr_y]
+    mp_z = [mp.mpf(float(v)) for v in arr_z]
+
+    start = time.perf_counter()
+    reference = algorithm.interpolate_all(mp_x, mp_y, mp_z)
+    mpmath_time = time.perf_counter() - start
+
+    deviations = [
+        max(float(abs(mp.mpf(float(a)) - b)) for a, b in zip(fast_values, reference_values))
+        for fast_values, reference_values in zip(fast, reference)
+    ]
+
+    return {
+        'fast_time': fast_time,
+        'mpmath_time': mpmath_time,
+        'speedup': mpmath_time / fast_time if fast_time > 0 else float('inf'),
+        'lagrange_deviation': deviations[0],
+        'neville_deviation': deviations[1],
+        'coefficients_deviation': deviations[2],
+    }
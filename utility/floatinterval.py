@@ -0,0 +1,454 @@
+"""
+NumPy float64 interval backend for the interval and singleton arithmetic modes.
+
+The ``mpmath`` interval context handles one interval per Python object, at any precision. This module instead
+stores whole arrays of intervals as two float64 NumPy arrays of lower and upper endpoints (`FloatIntervalArray`)
+and runs the interval algorithms on them with vectorized NumPy operations, mirroring the kernels of
+`utility.fastreal`.
+
+NumPy rounds every operation to nearest, so after each operation the lower endpoints are moved one float
+down and the upper endpoints one float up with ``np.nextafter``. A result rounded to nearest is never more
+than half a float away from the exact one, so the widened interval still encloses it, and every result of this
+backend is a rigorous enclosure, just like the results of ``mpmath.iv`` (only limited to 53-bit endpoints).
+NaN endpoints (e.g. from ``0 * inf``) are widened to the whole real line.
+
+The nodes are expected not to overlap (see `utility.validation`). Nodes whose float64 enclosures touch make
+the differences of the nodes contain zero, which gives infinitely wide, but still valid, results.
+
+Classes
+-------
+
+    - ``FloatIntervalArray(lower, upper)``
+        Array of intervals with vectorized, outward-rounded arithmetic
+
+Functions
+---------
+
+    - ``barycentric_weights(arr_x)``
+        Computes enclosures of the (rescaled) barycentric weights of the nodes
+    - ``evaluate_barycentric(arr_x, weights, arr_y, arr_z)``
+        Evaluates the first barycentric form with given weights at every point of ``arr_z``
+    - ``lagrange(arr_x, arr_y, arr_z)``
+        Encloses the values of the Lagrange polynomial at every point of ``arr_z``
+    - ``neville(arr_x, arr_y, arr_z)``
+        Runs Neville's algorithm for every point of ``arr_z``
+    - ``lagrange_coefficients(arr_x, arr_y, weights)``
+        Encloses Lagrange Interpolation Polynomial's coefficients
+    - ``interpolate_all(arr_x, arr_y, arr_z, progress, workers)``
+        Computes all three results at once, sharing the barycentric weights
+"""
+
+
+import numpy as np
+from mpmath import iv
+from mpmath.libmp import from_float, mpf_cmp, round_ceiling, round_floor, to_float
+
+from utility.instrumentation import instrumented
+
+
+# Interval backends selectable for the interval and singleton modes
+BACKENDS = ('mpmath', 'float64')
+
+# Number of rows processed at once by the kernels, bounds their memory use to BLOCK_SIZE * n intervals.
+BLOCK_SIZE = 512
+
+
+def _widen(lower: np.ndarray, upper: np.ndarray) -> tuple:
+    """
+    Returns the endpoints rounded to nearest moved one float outward, NaN endpoints replaced by infinities.
+    """
+    lower = np.nextafter(lower, -np.inf)
+    upper = np.nextafter(upper, np.inf)
+    return np.where(np.isnan(lower), -np.inf, lower), np.where(np.isnan(upper), np.inf, upper)
+
+
+def _float_bound(raw: tuple, upper: bool) -> float:
+    """
+    Returns the nearest float64 not below (``upper``) or not above a raw ``mpmath.libmp`` value.
+    """
+    value = to_float(raw, rnd=round_ceiling if upper else round_floor)
+    # Values beyond the float64 range are flushed to zero or to infinity whatever the rounding
+    comparison = mpf_cmp(from_float(value), raw)
+    if (comparison < 0) if upper else (comparison > 0):
+        value = float(np.nextafter(value, np.inf if upper else -np.inf))
+    return value
+
+
+class FloatIntervalArray:
+    """
+    Array of intervals stored as two float64 arrays of lower and upper endpoints.
+
+    Indexing, slicing and item assignment work like on NumPy arrays. Arithmetic operators work element-wise,
+    with NumPy broadcasting, between two interval arrays or between an interval array and floats (or float
+    arrays), which are exact degenerate intervals. Every result is widened outward, see the module description.
+    """
+
+    __slots__ = ('lower', 'upper')
+
+    def __init__(self, lower, upper):
+        """
+        Initialize an array from its endpoints.
+
+        :param lower: Lower endpoints, converted to a float64 array
+        :param upper: Upper endpoints, of the same shape
+        """
+
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+
+
+    @classmethod
+    def from_intervals(cls, intervals) -> 'FloatIntervalArray':
+        """
+        Build an array from ``iv.mpf`` intervals, rounding their endpoints outward to float64.
+        """
+
+        raws = [iv.convert(x)._mpi_ for x in intervals]
+        return cls(
+            [_float_bound(a, upper=False) for a, _ in raws],
+            [_float_bound(b, upper=True) for _, b in raws]
+        )
+
+
+    @classmethod
+    def filled(cls, value: float, shape) -> 'FloatIntervalArray':
+        """
+        Build an array of the given shape holding the same exact float everywhere.
+        """
+
+        return cls(np.full(shape, value), np.full(shape, value))
+
+
+    def to_intervals(self) -> list:
+        """
+        Convert a one-dimensional array into a list of ``iv.mpf`` intervals holding the same (exact) endpoints.
+        """
+
+        return [
+            iv.make_mpf((from_float(a), from_float(b)))
+            for a, b in zip(self.lower.tolist(), self.upper.tolist())
+        ]
+
+
+    @property
+    def shape(self) -> tuple:
+        return self.lower.shape
+
+
+    def __len__(self) -> int:
+        return len(self.lower)
+
+
+    def __getitem__(self, index) -> 'FloatIntervalArray':
+        return FloatIntervalArray(self.lower[index], self.upper[index])
+
+
+    def __setitem__(self, index, value) -> None:
+        value = _as_intervals(value)
+        self.lower[index] = value.lower
+        self.upper[index] = value.upper
+
+
+    def copy(self) -> 'FloatIntervalArray':
+        return FloatIntervalArray(self.lower.copy(), self.upper.copy())
+
+
+    def __neg__(self) -> 'FloatIntervalArray':
+        return FloatIntervalArray(-self.upper, -self.lower)
+
+
+    def __add__(self, other) -> 'FloatIntervalArray':
+        other = _as_intervals(other)
+        return FloatIntervalArray(*_widen(self.lower + other.lower, self.upper + other.upper))
+
+
+    __radd__ = __add__
+
+
+    def __sub__(self, other) -> 'FloatIntervalArray':
+        other = _as_intervals(other)
+        return FloatIntervalArray(*_widen(self.lower - other.upper, self.upper - other.lower))
+
+
+    def __rsub__(self, other) -> 'FloatIntervalArray':
+        return _as_intervals(other) - self
+
+
+    def __mul__(self, other) -> 'FloatIntervalArray':
+        other = _as_intervals(other)
+        with np.errstate(invalid='ignore', over='ignore', under='ignore'):
+            products = (self.lower * other.lower, self.lower * other.upper,
+                        self.upper * other.lower, self.upper * other.upper)
+        # NaN products (0 * inf) propagate through minimum/maximum and are widened to infinities
+        return FloatIntervalArray(*_widen(np.minimum.reduce(products), np.maximum.reduce(products)))
+
+
+    __rmul__ = __mul__
+
+
+    def __truediv__(self, other) -> 'FloatIntervalArray':
+        other = _as_intervals(other)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore', under='ignore'):
+            quotients = (self.lower / other.lower, self.lower / other.upper,
+                         self.upper / other.lower, self.upper / other.upper)
+        lower, upper = _widen(np.minimum.reduce(quotients), np.maximum.reduce(quotients))
+
+        # Divisors containing zero give the whole real line
+        unbounded = (other.lower <= 0) & (other.upper >= 0)
+        return FloatIntervalArray(np.where(unbounded, -np.inf, lower), np.where(unbounded, np.inf, upper))
+
+
+    def __rtruediv__(self, other) -> 'FloatIntervalArray':
+        return _as_intervals(other) / self
+
+
+    def prod(self, axis: int = -1) -> 'FloatIntervalArray':
+        """
+        Returns the products along an axis, multiplied pairwise in ``log2(length)`` vectorized steps.
+        """
+
+        return self._reduce(FloatIntervalArray.__mul__, 1.0, axis)
+
+
+    def sum(self, axis: int = -1) -> 'FloatIntervalArray':
+        """
+        Returns the sums along an axis, added pairwise in ``log2(length)`` vectorized steps.
+        """
+
+        return self._reduce(FloatIntervalArray.__add__, 0.0, axis)
+
+
+    def _reduce(self, operation, identity: float, axis: int) -> 'FloatIntervalArray':
+        result = FloatIntervalArray(np.moveaxis(self.lower, axis, -1), np.moveaxis(self.upper, axis, -1))
+        if result.shape[-1] == 0:
+            return FloatIntervalArray.filled(identity, result.shape[:-1])
+        while result.shape[-1] > 1:
+            length = result.shape[-1]
+            half = length // 2
+            paired = operation(result[..., :half], result[..., half:2 * half])
+            if length % 2:
+                paired = FloatIntervalArray(
+                    np.concatenate([paired.lower, result.lower[..., -1:]], axis=-1),
+                    np.concatenate([paired.upper, result.upper[..., -1:]], axis=-1)
+                )
+            result = paired
+        return result[..., 0]
+
+
+def _as_intervals(value) -> FloatIntervalArray:
+    if isinstance(value, FloatIntervalArray):
+        return value
+    return FloatIntervalArray(value, value)
+
+
+def _as_array(values) -> FloatIntervalArray:
+    if isinstance(values, FloatIntervalArray):
+        return values
+    return FloatIntervalArray.from_intervals(values)
+
+
+def _capacity_exponent(arr_x: FloatIntervalArray) -> int:
+    """
+    Returns ``k`` such that ``2^k`` is about ``4 / (max(x) - min(x))``, which keeps the products of node
+    differences from overflowing or underflowing. Scaling by a power of two is exact.
+    """
+    spread = arr_x.upper.max() - arr_x.lower.min()
+    if not 0 < spread < np.inf:
+        return 0
+    return int(np.frexp(4.0 / spread)[1]) - 1
+
+
+def _scale(values: FloatIntervalArray, exponent) -> FloatIntervalArray:
+    """
+    Returns the values multiplied by ``2^exponent`` (an integer, or an integer array broadcast against
+    the values), widened in case of overflow or underflow.
+    """
+    if np.isscalar(exponent) and exponent == 0:
+        return values
+    with np.errstate(over='ignore', under='ignore'):
+        return FloatIntervalArray(*_widen(np.ldexp(values.lower, exponent), np.ldexp(values.upper, exponent)))
+
+
+def _log2_magnitudes(values: FloatIntervalArray) -> np.ndarray:
+    """
+    Returns ``log2`` of the larger endpoint magnitude of every interval, ``-inf`` for zero,
+    like `utility.algorithm._log2_magnitude()`.
+    """
+    with np.errstate(divide='ignore'):
+        return np.log2(np.maximum(np.abs(values.lower), np.abs(values.upper)))
+
+
+@instrumented()
+def barycentric_weights(arr_x) -> FloatIntervalArray:
+    """
+    Compute enclosures of the barycentric weights of the nodes, rescaled by ``2^(k * (n - 1))``
+    where ``2^k`` is the capacity scale of the nodes (see `_capacity_exponent()`).
+
+    :param arr_x: Interpolation nodes, a `FloatIntervalArray` or ``iv.mpf`` intervals
+    :return: Rescaled weights, one per node
+    """
+    arr_x = _as_array(arr_x)
+    n = len(arr_x)
+    exponent = _capacity_exponent(arr_x)
+    weights = FloatIntervalArray.filled(0.0, n)
+    for start in range(0, n, BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, n)
+        diff = _scale(arr_x[start:stop, None] - arr_x[None, :], exponent)
+        diff[np.arange(stop - start), np.arange(start, stop)] = 1.0
+        weights[start:stop] = 1.0 / diff.prod(axis=1)
+    return weights
+
+
+@instrumented()
+def evaluate_barycentric(arr_x, weights: FloatIntervalArray, arr_y, arr_z) -> FloatIntervalArray:
+    """
+    Evaluate the first barycentric form ``sum(w_i * y_i * prod(z - x_j, j != i))`` at every point of ``arr_z``,
+    in blocks of `BLOCK_SIZE` points, with weights from `barycentric_weights()`.
+
+    Like `utility.algorithm.BarycentricInterpolant.evaluate()`, the products are built from prefix and suffix
+    products of ``z - x_j`` and never divide by ``z - x_i``, so points overlapping a node stay finite.
+
+    :param arr_x: Interpolation nodes
+    :param weights: Rescaled barycentric weights of the nodes
+    :param arr_y: Values at the nodes
+    :param arr_z: New points' x values
+    :return: Enclosures of the values of the polynomial, one per point
+    """
+    arr_x, arr_y, arr_z = _as_array(arr_x), _as_array(arr_y), _as_array(arr_z)
+    n = len(arr_x)
+    exponent = _capacity_exponent(arr_x)
+    scaled_values = weights * arr_y
+    out = FloatIntervalArray.filled(0.0, len(arr_z))
+
+    for start in range(0, len(arr_z), BLOCK_SIZE):
+        z = arr_z[start:start + BLOCK_SIZE]
+        differences = _scale(z[:, None] - arr_x[None, :], exponent)
+
+        # suffix[:, i] = prod(z - x_j, j >= i)
+        suffix = FloatIntervalArray.filled(1.0, (len(z), n + 1))
+        for i in range(n - 1, -1, -1):
+            suffix[:, i] = suffix[:, i + 1] * differences[:, i]
+
+        result = FloatIntervalArray.filled(0.0, len(z))
+        prefix = FloatIntervalArray.filled(1.0, len(z))
+        for i in range(n):
+            result = result + prefix * scaled_values[i] * suffix[:, i + 1]
+            prefix = prefix * differences[:, i]
+        out[start:start + BLOCK_SIZE] = result
+    return out
+
+
+def lagrange(arr_x, arr_y, arr_z) -> FloatIntervalArray:
+    return evaluate_barycentric(arr_x, barycentric_weights(arr_x), arr_y, arr_z)
+
+
+@instrumented()
+def neville(arr_x, arr_y, arr_z) -> FloatIntervalArray:
+    arr_x, arr_y, arr_z = _as_array(arr_x), _as_array(arr_y), _as_array(arr_z)
+    n = len(arr_x)
+    out = FloatIntervalArray.filled(0.0, len(arr_z))
+
+    for start in range(0, len(arr_z), BLOCK_SIZE):
+        z = arr_z[start:start + BLOCK_SIZE, None]
+        y_ = FloatIntervalArray(np.tile(arr_y.lower, (len(z), 1)), np.tile(arr_y.upper, (len(z), 1)))
+        for i in range(1, n):
+            dx_ij = z - arr_x[i:]
+            dx_j = arr_x[:n - i] - z
+            dx_j_ij = arr_x[:n - i] - arr_x[i:]
+            y_[:, :n - i] = (dx_ij * y_[:, :n - i] + dx_j * y_[:, 1:n - i + 1]) / dx_j_ij
+        out[start:start + BLOCK_SIZE] = y_[:, 0]
+    return out
+
+
+@instrumented()
+def lagrange_coefficients(arr_x, arr_y, weights: FloatIntervalArray = None) -> FloatIntervalArray:
+    """
+    Compute enclosures of the coefficients of the interpolation polynomial, lowest degree first.
+
+    Like `utility.fastreal.lagrange_coefficients()`, the polynomial is built in the scaled variable
+    ``t = 2^k x`` (see `_capacity_exponent()`), whose nodes have exactly the rescaled weights of
+    `barycentric_weights()`, and its coefficients are scaled back by ``2^(k * j)``, so no power of the scale
+    overflows. Every basis polynomial is divided out of the master polynomial by the composite deflation of
+    `utility.algorithm.synthetic_division()`: the coefficients above its term of the largest magnitude
+    by forward deflation, the ones below it by backward deflation, which keeps the intervals from widening
+    with powers of the node (or of its inverse).
+
+    :param arr_x: Interpolation nodes, a `FloatIntervalArray` or ``iv.mpf`` intervals
+    :param arr_y: Values at the nodes, of the same type
+    :param weights: Rescaled weights from `barycentric_weights()`, computed if not given
+    :return: Enclosures of the coefficients, one per node
+    """
+    arr_x, arr_y = _as_array(arr_x), _as_array(arr_y)
+    n = len(arr_x)
+    if weights is None:
+        weights = barycentric_weights(arr_x)
+    exponent = _capacity_exponent(arr_x)
+    scaled_x = _scale(arr_x, exponent)
+    scaled_values = arr_y * weights
+
+    # Coefficients of prod(t - t_j), lowest degree first
+    master = FloatIntervalArray.filled(0.0, n + 1)
+    master[0] = 1.0
+    for j in range(n):
+        shifted = master[:j + 1].copy()
+        master[1:j + 2] = shifted
+        master[0] = 0.0
+        master[:j + 1] = master[:j + 1] - scaled_x[j] * shifted
+    magnitudes = _log2_magnitudes(master)
+    out = FloatIntervalArray.filled(0.0, n)
+
+    # Synthetic division of the master polynomial by (t - t_i), for a block of nodes at once
+    for start in range(0, n, BLOCK_SIZE):
+        roots = scaled_x[start:start + BLOCK_SIZE]
+
+        # Split of every node at the term master[s] * t_i^s of the largest magnitude. Backward deflation
+        # divides by the node, so nodes that may be zero are deflated forward only.
+        with np.errstate(invalid='ignore'):
+            terms = magnitudes[None, :] + np.arange(n + 1)[None, :] * _log2_magnitudes(roots)[:, None]
+        split = np.minimum(np.argmax(np.nan_to_num(terms, nan=-np.inf), axis=1), n - 1)
+        split[(roots.lower <= 0) & (roots.upper >= 0)] = 0
+
+        forward = FloatIntervalArray.filled(0.0, (len(roots), n))
+        forward[:, n - 1] = master[n]
+        for k in range(n - 1, 0, -1):
+            forward[:, k - 1] = master[k] + roots * forward[:, k]
+
+        backward = FloatIntervalArray.filled(0.0, (len(roots), n))
+        if split.max() > 0:
+            backward[:, 0] = -master[0] / roots
+            for k in range(1, split.max()):
+                backward[:, k] = (backward[:, k - 1] - master[k]) / roots
+
+        below = np.arange(n)[None, :] < split[:, None]
+        quotients = FloatIntervalArray(np.where(below, backward.lower, forward.lower),
+                                       np.where(below, backward.upper, forward.upper))
+        out = out + (scaled_values[start:start + BLOCK_SIZE, None] * quotients).sum(axis=0)
+    return _scale(out, exponent * np.arange(n))
+
+
+def interpolate_all(arr_x, arr_y, arr_z, progress=None, workers: int = None) -> tuple:
+    """
+    Compute the results of `lagrange()`, `neville()` and `lagrange_coefficients()` at once,
+    converting the inputs and computing the barycentric weights only once.
+
+    The signature is that of `utility.algorithm.interpolate_all()`. The kernels are vectorized instead
+    of split across processes, so ``workers`` is ignored.
+
+    :param arr_x: Interpolation nodes, a `FloatIntervalArray` or ``iv.mpf`` intervals
+    :param arr_y: Values at the nodes, of the same type
+    :param arr_z: New points' x values, of the same type
+    :param progress: Optional progress callback, called once before each of the three results
+    :param workers: Ignored
+    :return: Tuple of the three result arrays
+    """
+    if progress is not None:
+        progress(0)
+    arr_x, arr_y, arr_z = _as_array(arr_x), _as_array(arr_y), _as_array(arr_z)
+    weights = barycentric_weights(arr_x)
+    lagrange_values = evaluate_barycentric(arr_x, weights, arr_y, arr_z)
+    if progress is not None:
+        progress(1 / 3)
+    neville_values = neville(arr_x, arr_y, arr_z)
+    if progress is not None:
+        progress(2 / 3)
+    return lagrange_values, neville_values, lagrange_coefficients(arr_x, arr_y, weights)
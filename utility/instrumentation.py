@@ -0,0 +1,334 @@
+"""
+Instrumentation module measuring the stages of a computation.
+
+A `Profiler` records the wall time of every stage entered while it is active, and can additionally count
+the arithmetic operations performed on ``mpmath`` numbers and track memory allocations. Stages nest, so
+a stage of the calculate pipeline (e.g. ``'lagrange'``) holds the stages of the `utility.algorithm` kernels
+it called (e.g. ``'barycentric_weights'``).
+
+    - Wall time only costs two ``time.perf_counter()`` calls per stage and is meant to always be on.
+    - Operation counting wraps the arithmetic methods of ``mp.mpf``, ``iv.mpf`` and
+      `utility.intervalvector.IntervalVector` (whose operations count once per element) while the
+      profiler is active, which slows the computation down noticeably. Every thread counts its own
+      operations, so a profiler only counts those of the thread it is active in. Kernels working on raw
+      ``mpmath.libmp`` values bypass these methods, so they report their operations with `add_operations()`
+      instead.
+    - Allocation tracking uses ``tracemalloc``, which slows the computation down even more.
+
+The active profiler is stored per thread, so the kernels find it without it being passed around.
+When no profiler is active, `stage()` and `instrumented()` do nothing.
+
+Classes
+-------
+
+    - ``Profiler(count_operations, track_allocations)``
+        Records the stages of a computation, usable as a context manager activating it
+
+Functions
+---------
+
+    - ``current()``
+        Returns the profiler active in the current thread
+    - ``stage(name)``
+        Context manager recording a stage in the active profiler
+    - ``instrumented(name)``
+        Decorator recording every call of a function as a stage
+    - ``add_operations(count)``
+        Counts arithmetic operations performed on raw values
+"""
+
+
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+from mpmath import iv, mp
+
+from utility.intervalvector import IntervalVector
+
+
+_local = threading.local()
+_null_stage = nullcontext()
+
+
+def current():
+    """
+    Returns the profiler active in the current thread, or None.
+    """
+    return getattr(_local, 'profiler', None)
+
+
+def stage(name: str):
+    """
+    Context manager recording a stage in the profiler active in the current thread, if there is one.
+
+    :param name: Name of the stage
+    """
+    profiler = getattr(_local, 'profiler', None)
+    if profiler is None:
+        return _null_stage
+    return profiler.stage(name)
+
+
+def instrumented(name: str = None):
+    """
+    Decorator recording every call of the decorated function as a stage, see `stage()`.
+
+    :param name: Name of the stage, the function's name by default
+    """
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = getattr(_local, 'profiler', None)
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.stage(stage_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_MPF_OPERATIONS = (
+    '__add__', '__radd__', '__sub__', '__rsub__', '__mul__', '__rmul__',
+    '__truediv__', '__rtruediv__', '__pow__', '__rpow__', '__neg__', '__abs__'
+)
+_VECTOR_OPERATIONS = ('add', 'sub', 'rsub', 'mul', 'div', 'rdiv', 'neg')
+
+
+class _OperationCounter:
+    """
+    Counts arithmetic operations by temporarily wrapping the arithmetic methods of the number classes.
+
+    The wrappers are installed once, for as long as at least one profiler counting operations is active.
+    The count itself is kept per thread, so threads neither race on it nor count each other's operations.
+    """
+
+    def __init__(self):
+        self._counts = threading.local()
+        self._users = 0
+        self._saved = []
+        self._lock = threading.Lock()
+
+
+    @property
+    def count(self) -> int:
+        """
+        Number of operations counted in the current thread.
+        """
+
+        return getattr(self._counts, 'count', 0)
+
+
+    def _increase(self, count: int) -> None:
+        counts = self._counts
+        counts.count = getattr(counts, 'count', 0) + count
+
+
+    def _wrap(self, cls, name: str, weight=None) -> None:
+        original = getattr(cls, name)
+        increase = self._increase
+
+        if weight is None:
+            def wrapper(*args):
+                increase(1)
+                return original(*args)
+        else:
+            def wrapper(vector, *args):
+                increase(len(vector))
+                return original(vector, *args)
+
+        self._saved.append((cls, name, cls.__dict__.get(name)))
+        setattr(cls, name, wrapper)
+
+
+    def add(self, count: int) -> None:
+        if self._users:
+            self._increase(count)
+
+
+    def install(self) -> None:
+        with self._lock:
+            self._users += 1
+            if self._users > 1:
+                return
+            for cls in (mp.mpf, iv.mpf):
+                for name in _MPF_OPERATIONS:
+                    if hasattr(cls, name):
+                        self._wrap(cls, name)
+            for name in _VECTOR_OPERATIONS:
+                self._wrap(IntervalVector, name, weight=len)
+            # The operator aliases of IntervalVector refer to the original methods
+            for alias, name in (('__add__', 'add'), ('__radd__', 'add'), ('__sub__', 'sub'),
+                                ('__rsub__', 'rsub'), ('__mul__', 'mul'), ('__rmul__', 'mul'),
+                                ('__truediv__', 'div'), ('__rtruediv__', 'rdiv'), ('__neg__', 'neg')):
+                self._saved.append((IntervalVector, alias, IntervalVector.__dict__[alias]))
+                setattr(IntervalVector, alias, getattr(IntervalVector, name))
+
+
+    def uninstall(self) -> None:
+        with self._lock:
+            self._users -= 1
+            if self._users > 0:
+                return
+            for cls, name, original in reversed(self._saved):
+                if original is None:
+                    delattr(cls, name)
+                else:
+                    setattr(cls, name, original)
+            self._saved.clear()
+
+
+_operation_counter = _OperationCounter()
+
+
+def add_operations(count: int) -> None:
+    """
+    Count arithmetic operations performed without the wrapped methods, e.g. on raw ``mpmath.libmp`` values.
+    Does nothing unless a profiler counting operations is active.
+
+    :param count: Number of operations
+    """
+    _operation_counter.add(count)
+
+
+class Profiler:
+    """
+    Records the wall time, and optionally the operation count and allocations, of the stages of a computation.
+
+    A profiler is activated in the current thread by using it as a context manager, stages are then
+    recorded with `Profiler.stage()` or the module-level `stage()` and `instrumented()`.
+    The records are kept in the order the stages were entered.
+    """
+
+    def __init__(self, count_operations: bool = False, track_allocations: bool = False):
+        """
+        Initialize a utility.instrumentation.Profiler instance.
+
+        :param count_operations: Count the arithmetic operations on ``mpmath`` numbers in every stage
+        :type count_operations: bool
+        :param track_allocations: Track the memory allocated in every stage with ``tracemalloc``
+        :type track_allocations: bool
+        """
+
+        self.count_operations = count_operations
+        self.track_allocations = track_allocations
+        self.records = []
+
+        self._stack = []
+        self._previous = None
+        self._started_tracing = False
+
+
+    def __enter__(self) -> 'Profiler':
+        self._previous = current()
+        _local.profiler = self
+        if self.count_operations:
+            _operation_counter.install()
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        if self.count_operations:
+            _operation_counter.uninstall()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        _local.profiler = self._previous
+        self._previous = None
+
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Context manager recording a single stage.
+
+        :param name: Name of the stage
+        """
+
+        record = {'stage': name, 'depth': len(self._stack), 'seconds': None}
+        self.records.append(record)
+
+        tracking = self.track_allocations and tracemalloc.is_tracing()
+        frame = {}
+        if tracking:
+            frame['memory'], _ = tracemalloc.get_traced_memory()
+            frame['peak'] = frame['memory']
+            tracemalloc.reset_peak()
+        if self.count_operations:
+            frame['operations'] = _operation_counter.count
+        self._stack.append(frame)
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._stack.pop()
+
+            if self.count_operations:
+                record['operations'] = _operation_counter.count - frame['operations']
+            if tracking:
+                memory, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, frame['peak'])
+                record['allocated'] = memory - frame['memory']
+                record['peak'] = peak - frame['memory']
+                # reset_peak() of this stage hid the peak from the enclosing stage
+                if self._stack and 'peak' in self._stack[-1]:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+
+
+    def total_seconds(self) -> float:
+        """
+        Returns the wall time of all top-level stages.
+        """
+
+        return sum(record['seconds'] or 0 for record in self.records if record['depth'] == 0)
+
+
+    def to_dict(self) -> dict:
+        """
+        Returns the options and the records of the profiler, ready for JSON serialization.
+        """
+
+        return {
+            'count_operations': self.count_operations,
+            'track_allocations': self.track_allocations,
+            'total_seconds': self.total_seconds(),
+            'stages': [dict(record) for record in self.records],
+        }
+
+
+    def export(self, path: str) -> None:
+        """
+        Save the records as a JSON file, see `Profiler.to_dict()`.
+        """
+
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+    def report(self) -> str:
+        """
+        Returns the records formatted as a plain text table, nested stages indented.
+        """
+
+        lines = [f'{"stage":<36}{"time [s]":>12}{"operations":>14}{"allocated":>14}{"peak":>14}']
+        for record in self.records:
+            name = '  ' * record['depth'] + record['stage']
+            seconds = f'{record["seconds"]:.6f}' if record['seconds'] is not None else '-'
+            lines.append(
+                f'{name:<36}{seconds:>12}'
+                f'{record.get("operations", "-"):>14}'
+                f'{record.get("allocated", "-"):>14}'
+                f'{record.get("peak", "-"):>14}'
+            )
+        lines.append(f'{"total":<36}{self.total_seconds():>12.6f}')
+        return '\n'.join(lines)
@@ -0,0 +1,237 @@
+"""
+Structure-of-arrays interval vector module for the interval and singleton arithmetic modes.
+
+A list of ``iv.mpf`` objects allocates a new Python object, and goes through ``mpmath``'s context
+bookkeeping, for every single operation. The `IntervalVector` class instead stores the lower and upper
+endpoints of all its intervals as two parallel lists of raw ``mpmath.libmp`` values
+(``(sign, mantissa, exponent, bitcount)`` tuples) and performs element-wise arithmetic directly on them,
+rounding the lower endpoints down and the upper endpoints up, so every result still encloses the exact one.
+
+The algorithms `utility.algorithm.lagrange()` and `utility.algorithm.neville()` have vectorized code paths
+for `IntervalVector` arguments, the remaining functions accept it as any other sequence of ``iv.mpf`` values.
+
+Classes
+-------
+
+    - ``IntervalVector(lower, upper)``
+        Vector of intervals with batched, outward-rounded add/sub/mul/div.
+"""
+
+
+from mpmath import iv
+from mpmath.libmp import (
+    finf, fninf, fnan, fone, fzero, mpf_add, mpf_neg, mpf_sub,
+    mpi_div, mpi_mul, round_ceiling, round_floor
+)
+
+
+def _replace_nan(lower: list, upper: list) -> tuple:
+    """
+    Widens endpoints that became NaN (e.g. from inf - inf) to the infinity on their side, like ``mpi_add``.
+    """
+    if fnan in lower:
+        lower = [fninf if a == fnan else a for a in lower]
+    if fnan in upper:
+        upper = [finf if b == fnan else b for b in upper]
+    return lower, upper
+
+
+class IntervalVector:
+    """
+    Vector of intervals stored as parallel lists of raw lower and upper endpoints.
+
+    Arithmetic operators work element-wise between two vectors of the same length, or between a vector
+    and a single interval (``iv.mpf``), which is broadcast over the whole vector. All operations are performed
+    at the current ``iv.prec`` and round outward.
+    """
+
+    __slots__ = ('lower', 'upper')
+
+    def __init__(self, lower: list, upper: list):
+        """
+        Initialize a vector from raw endpoints.
+
+        :param lower: List of raw lower endpoints
+        :type lower: list
+        :param upper: List of raw upper endpoints, of the same length
+        :type upper: list
+        """
+
+        self.lower = lower
+        self.upper = upper
+
+
+    @classmethod
+    def from_intervals(cls, intervals) -> 'IntervalVector':
+        """
+        Build a vector from an iterable of ``iv.mpf`` intervals.
+        """
+
+        raws = [iv.convert(x)._mpi_ for x in intervals]
+        return cls([raw[0] for raw in raws], [raw[1] for raw in raws])
+
+
+    @classmethod
+    def filled(cls, value, length: int) -> 'IntervalVector':
+        """
+        Build a vector of the given length holding the same interval everywhere.
+        """
+
+        a, b = iv.convert(value)._mpi_
+        return cls([a] * length, [b] * length)
+
+
+    def tolist(self) -> list:
+        """
+        Convert the vector into a list of ``iv.mpf`` intervals.
+        """
+
+        return [iv.make_mpf(raw) for raw in zip(self.lower, self.upper)]
+
+
+    def copy(self) -> 'IntervalVector':
+        return IntervalVector(list(self.lower), list(self.upper))
+
+
+    def __len__(self) -> int:
+        return len(self.lower)
+
+
+    def __iter__(self):
+        for raw in zip(self.lower, self.upper):
+            yield iv.make_mpf(raw)
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return IntervalVector(self.lower[index], self.upper[index])
+        return iv.make_mpf((self.lower[index], self.upper[index]))
+
+
+    def __setitem__(self, index: int, value):
+        self.lower[index], self.upper[index] = iv.convert(value)._mpi_
+
+
+    def __repr__(self) -> str:
+        return f'IntervalVector({self.tolist()!r})'
+
+
+    def _operand(self, other) -> tuple:
+        """
+        Returns the raw lower and upper endpoint lists of the other operand, broadcasting single intervals.
+        """
+        if isinstance(other, IntervalVector):
+            if len(other) != len(self):
+                raise ValueError(f'Vector lengths differ: {len(self)} and {len(other)}')
+            return other.lower, other.upper
+        a, b = iv.convert(other)._mpi_
+        return [a] * len(self), [b] * len(self)
+
+
+    def add(self, other) -> 'IntervalVector':
+        prec = iv.prec
+        lower, upper = self._operand(other)
+        return IntervalVector(*_replace_nan(
+            [mpf_add(s, t, prec, round_floor) for s, t in zip(self.lower, lower)],
+            [mpf_add(s, t, prec, round_ceiling) for s, t in zip(self.upper, upper)]
+        ))
+
+
+    def sub(self, other) -> 'IntervalVector':
+        prec = iv.prec
+        lower, upper = self._operand(other)
+        return IntervalVector(*_replace_nan(
+            [mpf_sub(s, t, prec, round_floor) for s, t in zip(self.lower, upper)],
+            [mpf_sub(s, t, prec, round_ceiling) for s, t in zip(self.upper, lower)]
+        ))
+
+
+    def rsub(self, other) -> 'IntervalVector':
+        """
+        Element-wise ``other - self``.
+        """
+
+        prec = iv.prec
+        lower, upper = self._operand(other)
+        return IntervalVector(*_replace_nan(
+            [mpf_sub(s, t, prec, round_floor) for s, t in zip(lower, self.upper)],
+            [mpf_sub(s, t, prec, round_ceiling) for s, t in zip(upper, self.lower)]
+        ))
+
+
+    def _combine(self, func, lower: list, upper: list, swap: bool = False) -> 'IntervalVector':
+        prec = iv.prec
+        out_lower = [None] * len(self)
+        out_upper = [None] * len(self)
+        for k in range(len(self)):
+            s = (self.lower[k], self.upper[k])
+            t = (lower[k], upper[k])
+            out_lower[k], out_upper[k] = func(t, s, prec) if swap else func(s, t, prec)
+        return IntervalVector(out_lower, out_upper)
+
+
+    def mul(self, other) -> 'IntervalVector':
+        return self._combine(mpi_mul, *self._operand(other))
+
+
+    def div(self, other) -> 'IntervalVector':
+        return self._combine(mpi_div, *self._operand(other))
+
+
+    def rdiv(self, other) -> 'IntervalVector':
+        """
+        Element-wise ``other / self``.
+        """
+
+        return self._combine(mpi_div, *self._operand(other), swap=True)
+
+
+    def neg(self) -> 'IntervalVector':
+        return IntervalVector(
+            [mpf_neg(b) for b in self.upper],
+            [mpf_neg(a) for a in self.lower]
+        )
+
+
+    def sum(self):
+        """
+        Return the sum of all elements as an ``iv.mpf`` interval.
+        """
+
+        prec = iv.prec
+        a, b = fzero, fzero
+        for s, t in zip(self.lower, self.upper):
+            a = mpf_add(a, s, prec, round_floor)
+            b = mpf_add(b, t, prec, round_ceiling)
+        (a,), (b,) = _replace_nan([a], [b])
+        return iv.make_mpf((a, b))
+
+
+    def prod(self, skip: int = None, start=None):
+        """
+        Return the product of all elements as an ``iv.mpf`` interval.
+
+        The elements are multiplied in order, one at a time, onto ``start``, so ``prod(start=y)`` is rounded
+        exactly like the scalar loop ``y * v[0] * v[1] * ...``.
+
+        :param skip: Optional index of an element left out of the product
+        :param start: Optional ``iv.mpf`` factor the product starts from, 1 by default
+        """
+
+        prec = iv.prec
+        result = (fone, fone) if start is None else iv.convert(start)._mpi_
+        for k in range(len(self)):
+            if k == skip: continue
+            result = mpi_mul(result, (self.lower[k], self.upper[k]), prec)
+        return iv.make_mpf(result)
+
+
+    __add__ = add
+    __radd__ = add
+    __sub__ = sub
+    __rsub__ = rsub
+    __mul__ = mul
+    __rmul__ = mul
+    __truediv__ = div
+    __rtruediv__ = rdiv
+    __neg__ = neg
@@ -0,0 +1,301 @@
+"""
+Process-pool execution of the ``mpmath`` kernels of `utility.algorithm`.
+
+``mpmath`` arithmetic is pure Python and holds the GIL, so threads cannot speed it up. This module splits
+the work of a single large computation across a pool of worker processes instead:
+
+    - evaluating the polynomial and Neville's algorithm at many new points splits the points,
+    - `lagrange()`, the barycentric weights and the coefficients split the nodes ``i`` of their outer loop,
+      and the partial results (sums over the nodes of a chunk) are added up in the parent.
+
+Values are sent to and from the workers as raw ``mpmath.libmp`` tuples (``_mpf_``, ``_mpi_``, or the endpoint
+lists of an `utility.intervalvector.IntervalVector`), together with the working precisions of both contexts.
+
+The work is split into chunks whose boundaries only depend on the size of the input, never on the number of
+workers or on which worker finishes first, and the partial results are merged in chunk order. The results
+are therefore the same for any number of workers, and per-point and per-node results (evaluation, Neville's
+algorithm, weights) are identical to the serial ones. Partial sums are associated differently than in the
+serial loop, so sums may differ from the serial results in the last bits (and stay valid enclosures in the
+interval modes).
+
+Inputs below `PARALLEL_MIN_OPERATIONS`, or too few points to fill more than one chunk, are not worth
+the overhead of the processes, `worthwhile()` tells the kernels of `utility.algorithm` to stay serial for them.
+
+Functions
+---------
+
+    - ``worthwhile(operations, workers, items)``
+        Tells whether a computation of the given size should run in the process pool
+    - ``pack(values)`` / ``unpack(packed)``
+        Convert values to and from their compact raw form
+    - ``lagrange(arr_x, arr_y, arr_z, workers)``
+        `utility.algorithm.lagrange()`, nodes split across the workers
+    - ``barycentric_weights(arr_x, workers, progress)``
+        `utility.algorithm.barycentric_weights()`, nodes split across the workers
+    - ``combine_basis_polynomials(arr_x, scales, master, magnitudes, workers, progress)``
+        `utility.algorithm.combine_basis_polynomials()`, basis polynomials split across the workers
+    - ``evaluate_many(interpolant, arr_z, workers, progress)``
+        `utility.algorithm.BarycentricInterpolant.evaluate_many()`, points split across the workers
+    - ``neville_many(arr_x, arr_y, arr_z, workers, progress)``
+        `utility.algorithm.neville_many()`, points split across the workers
+    - ``shutdown()``
+        Stops the worker processes
+"""
+
+
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from mpmath import iv, mp
+
+from utility import algorithm
+from utility.intervalvector import IntervalVector
+
+
+# Smallest computation, in elementary operations, worth sending to the process pool
+PARALLEL_MIN_OPERATIONS = 50_000
+
+# Inputs are split into at most this many chunks (of at least MIN_CHUNK_SIZE items), independently of the workers
+MAX_CHUNKS = 64
+MIN_CHUNK_SIZE = 4
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def worthwhile(operations: int, workers: int | None, items: int = None) -> bool:
+    """
+    Tells whether a computation of the given size should run in the process pool.
+
+    :param operations: Approximate number of elementary operations of the computation
+    :param workers: Requested number of worker processes, ``None`` or 1 for serial computation
+    :param items: Number of items (e.g. new points) the computation would be split into chunks of. A computation
+        fitting into a single chunk would run in one worker process only, so it stays serial
+    """
+    if workers is None or workers < 2 or operations < PARALLEL_MIN_OPERATIONS:
+        return False
+    return items is None or len(_chunks(items)) > 1
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Returns the shared process pool, (re)started with the given number of workers.
+
+    The workers are spawned rather than forked, as the GUI forks from a process running several threads.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown() -> None:
+    """
+    Stop the worker processes, they are started again by the next parallel computation.
+
+    :return: None
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _pool_workers = 0
+
+
+atexit.register(shutdown)
+
+
+def _chunks(size: int) -> list:
+    """
+    Returns the ``(start, stop)`` bounds of the chunks of an input of the given size.
+    """
+    chunk = max(MIN_CHUNK_SIZE, -(-size // MAX_CHUNKS))
+    return [(start, min(start + chunk, size)) for start in range(0, size, chunk)]
+
+
+def pack(values) -> tuple:
+    """
+    Convert a sequence of ``mp.mpf`` or ``iv.mpf`` values, or an `IntervalVector`, to a compact picklable form.
+
+    :param values: Values to convert
+    :return: Tuple of the kind of the values and their raw ``mpmath.libmp`` representation
+    """
+    if isinstance(values, IntervalVector):
+        return 'vector', values.lower, values.upper
+    values = list(values)
+    if values and isinstance(values[0], iv.mpf):
+        return 'iv', [value._mpi_ for value in values]
+    return 'mp', [value._mpf_ for value in values]
+
+
+def unpack(packed: tuple):
+    """
+    Convert values packed by `pack()` back to their original type.
+    """
+    kind = packed[0]
+    if kind == 'vector':
+        return IntervalVector(packed[1], packed[2])
+    if kind == 'iv':
+        return [iv.make_mpf(raw) for raw in packed[1]]
+    return [mp.make_mpf(raw) for raw in packed[1]]
+
+
+def _precisions() -> tuple:
+    return mp.prec, iv.prec
+
+
+def _set_precisions(precisions: tuple) -> None:
+    # Every worker process runs a single task at a time, so its global precision can be set per task
+    mp.prec, iv.prec = precisions
+
+
+def _run(workers: int, kernel, tasks: list, progress=None) -> list:
+    """
+    Run the kernel on every task in the process pool and return the results in task order.
+
+    Calls ``progress`` after each finished task; if it raises, the remaining tasks are cancelled.
+    """
+    pool = _get_pool(workers)
+    futures = [pool.submit(kernel, *task) for task in tasks]
+    results = []
+    try:
+        for k, future in enumerate(futures):
+            results.append(future.result())
+            if progress is not None:
+                progress((k + 1) / len(futures))
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+    return results
+
+
+def _lagrange_kernel(precisions: tuple, x: tuple, y: tuple, z: tuple, start: int, stop: int) -> tuple:
+    _set_precisions(precisions)
+    return pack([algorithm._lagrange_terms(unpack(x), unpack(y), unpack(z), start, stop)])
+
+
+def _weights_kernel(precisions: tuple, x: tuple, start: int, stop: int) -> tuple:
+    _set_precisions(precisions)
+    return pack(algorithm._weights_range(unpack(x), start, stop))
+
+
+def _combine_kernel(precisions: tuple, x: tuple, scales: tuple, master: tuple, magnitudes: list,
+                    start: int, stop: int) -> tuple:
+    _set_precisions(precisions)
+    return pack(algorithm._combine_range(unpack(x), unpack(scales), unpack(master), magnitudes, start, stop))
+
+
+def _evaluate_kernel(precisions: tuple, x: tuple, y: tuple, weights: tuple, z: tuple) -> tuple:
+    _set_precisions(precisions)
+    interpolant = algorithm.BarycentricInterpolant(unpack(x), unpack(y), weights=unpack(weights))
+    return pack(interpolant.evaluate_many(unpack(z)))
+
+
+def _neville_kernel(precisions: tuple, x: tuple, y: tuple, z: tuple) -> tuple:
+    _set_precisions(precisions)
+    return pack(algorithm.neville_many(unpack(x), unpack(y), unpack(z)))
+
+
+def _add_all(partials: list):
+    """
+    Returns the sum of the partial results, added up in chunk order.
+    """
+    result = partials[0]
+    for partial in partials[1:]:
+        result = result + partial
+    return result
+
+
+def lagrange(arr_x, arr_y, arr_z, workers: int) -> mp.mpf | iv.mpf:
+    """
+    `utility.algorithm.lagrange()`, its terms split across the workers and added up in chunk order.
+    """
+    precisions = _precisions()
+    x, y, z = pack(arr_x), pack(arr_y), pack(arr_z[:1])
+    partials = _run(
+        workers,
+        _lagrange_kernel,
+        [(precisions, x, y, z, start, stop) for start, stop in _chunks(len(arr_x))]
+    )
+    return _add_all([unpack(partial)[0] for partial in partials])
+
+
+def barycentric_weights(arr_x, workers: int, progress=None) -> list:
+    """
+    `utility.algorithm.barycentric_weights()`, the nodes split across the workers.
+    """
+    precisions = _precisions()
+    x = pack(arr_x)
+    chunks = _run(
+        workers,
+        _weights_kernel,
+        [(precisions, x, start, stop) for start, stop in _chunks(len(arr_x))],
+        progress
+    )
+    return [weight for chunk in chunks for weight in unpack(chunk)]
+
+
+def combine_basis_polynomials(arr_x, scales, master: list, magnitudes: list, workers: int, progress=None) -> list:
+    """
+    `utility.algorithm.combine_basis_polynomials()`, the basis polynomials split across the workers
+    and their partial sums added up coefficient by coefficient in chunk order.
+
+    :param master: Coefficients of the master polynomial of ``arr_x``
+    :param magnitudes: ``_log2_magnitude()`` of every coefficient of ``master``
+    """
+    precisions = _precisions()
+    x, packed_scales, packed_master = pack(arr_x), pack(scales), pack(master)
+    partials = _run(
+        workers,
+        _combine_kernel,
+        [(precisions, x, packed_scales, packed_master, magnitudes, start, stop)
+         for start, stop in _chunks(len(arr_x))],
+        progress
+    )
+    partials = [unpack(partial) for partial in partials]
+    return [_add_all(coefficients) for coefficients in zip(*partials)]
+
+
+def evaluate_many(interpolant, arr_z, workers: int, progress=None) -> list | IntervalVector:
+    """
+    `utility.algorithm.BarycentricInterpolant.evaluate_many()`, the points split across the workers.
+    """
+    precisions = _precisions()
+    x, y, weights = pack(interpolant.nodes), pack(interpolant.values), pack(interpolant.weights)
+    chunks = _run(
+        workers,
+        _evaluate_kernel,
+        [(precisions, x, y, weights, pack(arr_z[start:stop])) for start, stop in _chunks(len(arr_z))],
+        progress
+    )
+    chunks = [unpack(chunk) for chunk in chunks]
+    if isinstance(arr_z, IntervalVector):
+        return IntervalVector(
+            [a for chunk in chunks for a in chunk.lower],
+            [b for chunk in chunks for b in chunk.upper]
+        )
+    return [value for chunk in chunks for value in chunk]
+
+
+def neville_many(arr_x, arr_y, arr_z, workers: int, progress=None) -> list:
+    """
+    `utility.algorithm.neville_many()`, the points split across the workers.
+    """
+    precisions = _precisions()
+    x, y = pack(arr_x), pack(arr_y)
+    chunks = _run(
+        workers,
+        _neville_kernel,
+        [(precisions, x, y, pack(arr_z[start:stop])) for start, stop in _chunks(len(arr_z))],
+        progress
+    )
+    return [value for chunk in chunks for value in unpack(chunk)]
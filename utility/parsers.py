@@ -9,6 +9,9 @@ for formatting the output data right before writing it to the output widget.
 Functions
 ---------
 
+All three parsing functions are built on the single-pass streaming tokenizer of `utility.tokenizer`,
+which reports formatting errors with their line and column.
+
     - ``parse_real(s)``
         Converts numeric array string into an ``mp.mpf`` list
     - ``parse_singleton(s)``
@@ -20,18 +23,29 @@ Functions
         feedback display directly to the output widget.
     - ``sci_str(x, prec)``
         Converts an ``mp.mpf`` number into a numeric string in the scientific format, with defined digital precision.
+    - ``interval_sci_str(x, prec)``
+        Converts an ``iv.mpf`` interval into its outward-rounded endpoints and width in the same format.
+    - ``float_sci_str(x, prec)``
+        Same as ``sci_str()``, for plain float64 numbers of the 'fast_real' mode.
     - ``prettify(data)``
         Formats the output data of any of the 3 algorithms implemented in the project into human-readable text
         ready to be printed in the output widget.
+
+The formatters work on the raw binary endpoints of the numbers with exact integer arithmetic, without
+any string round-trips or ``mp.mpf`` logarithms, and build list output with a single join.
 """
 
 
+import math
+
 import mpmath
 from mpmath import iv, mp
+from mpmath.libmp import finf, fnan, fninf, fzero, mpf_sub, round_ceiling
 
+from utility import precision, tokenizer  # precision sets the default precision of both mpmath contexts
 
-iv.prec = 64
-mp.prec = 64
+
+_LOG10_2 = math.log10(2)
 
 
 def ulp(x: mp.mpf) -> mp.mpf:
@@ -43,7 +57,7 @@ def ulp(x: mp.mpf) -> mp.mpf:
     if x == 0:
         return mp.mpf(2)**(-mp.prec)
     else:
-        e = mpmath.floor(mpmath.log(x, 2))
+        e = mpmath.floor(mpmath.log(abs(x), 2))
         return mpmath.mpf(2)**(e - mp.prec + 1)
 
 
@@ -56,27 +70,15 @@ def next_above(x: mp.mpf) -> mp.mpf:
 
 
 def parse_real(s: str) -> list:
-    s = s.replace(' ', '').replace('\n', '')
-    args = s.split(',')
-    return [mp.mpf(x) for x in args]
+    return list(tokenizer.iter_real(s))
 
 
 def parse_singleton(s: str) -> list:
-    return [iv.mpf([next_below(x), next_above(x)]) for x in parse_real(s)]
+    return [iv.mpf([next_below(x), next_above(x)]) for x in tokenizer.iter_real(s)]
 
 
 def parse_interval(s: str) -> list:
-    s = s.replace(' ', '').replace('\n', '')
-    s = s.replace('[', '').replace(']', '').replace(';', ',')
-    args = s.split(',')
-    args = [mp.mpf(x) for x in args]
-    return [
-        iv.mpf([
-            min(args[i], args[i+1]),
-            max(args[i], args[i+1])
-        ])
-        for i in range(0, len(args), 2)
-    ]
+    return list(tokenizer.iter_interval(s))
 
 
 def safe_parse(parser_func,
@@ -89,6 +91,10 @@ def safe_parse(parser_func,
             error_command(error_message.format(data_str)+'\'')
             return None
         return data
+    except tokenizer.ParseError as e:
+        # Already holds the exact location of the error
+        error_command(error_message.format(e))
+        return None
     except Exception as e:
         e = str(e)
         e = e[:e.rfind("'")]
@@ -102,57 +108,128 @@ def safe_parse(parser_func,
         return None
 
 
+def _decimal_digits(raw: tuple, digits: int, rounding: str = 'n') -> tuple:
+    """
+    Round a raw ``mpmath.libmp`` value (``(sign, mantissa, exponent, bitcount)``) to the given number of
+    significant decimal digits, using exact integer arithmetic.
+
+    The decimal exponent is derived from the binary exponent and bit count, so no logarithms or powers
+    of ``mp.mpf`` numbers are computed.
+
+    :param raw: Finite, nonzero raw value
+    :param digits: Number of significant digits
+    :param rounding: ``'n'`` to nearest, ``'f'`` toward minus infinity or ``'c'`` toward plus infinity
+    :return: Tuple of the sign (0 or 1), the digit string and the decimal exponent of the first digit
+    """
+    sign, man, exp, bc = raw
+
+    # floor(log10(|x|)) is either e10 or e10 + 1, as 2**(exp + bc - 1) <= |x| < 2**(exp + bc),
+    # unless the float product rounds up to the next integer, which the loop below corrects exactly
+    e10 = math.floor((exp + bc - 1) * _LOG10_2)
+    while True:
+        shift = digits - 1 - e10
+        if exp >= 0:
+            num, den = man << exp, 1
+        else:
+            num, den = man, 1 << -exp
+        if shift >= 0:
+            num *= 10 ** shift
+        else:
+            den *= 10 ** -shift
+        q, r = divmod(num, den)
+        if q >= 10 ** (digits - 1):
+            break
+        e10 -= 1
+
+    limit = 10 ** digits
+    if q >= limit:
+        q, last = divmod(q, 10)
+        r += last * den
+        den *= 10
+        e10 += 1
+
+    if rounding == 'n':
+        q += 2 * r >= den
+    elif r and (rounding == 'c') != bool(sign):
+        q += 1
+    if q >= limit:
+        q //= 10
+        e10 += 1
+
+    return sign, str(q), e10
+
+
+def _sci_raw(raw: tuple, prec: int = 18, rounding: str = 'n') -> str:
+    """
+    Format a raw ``mpmath.libmp`` value in the same form as ``sci_str()``.
+    """
+    if raw == fzero:
+        return "0." + '0'*prec + 'E+0000'
+    if raw == finf:
+        return '+inf'
+    if raw == fninf:
+        return '-inf'
+    if raw == fnan:
+        return 'nan'
+
+    sign, digits, e10 = _decimal_digits(raw, prec + 1, rounding)
+    return f"{'-' if sign else ''}{digits[0]}.{digits[1:]}E{e10:+05d}"
+
+
 def sci_str(x, prec: int = 18):
     """
     Convert mpmath.mpf to string in the form 1.234E+0001
     """
-    # mantissa and exponent (in base 10)
+    raw = getattr(x, '_mpf_', None)
+    if raw is None:
+        raw = mp.mpf(x)._mpf_
+    return _sci_raw(raw, prec)
 
-    if x == 0:
-        return "0." + '0'*prec + 'E+0000'
 
-    exp = mp.floor(mp.log10(abs(x))) if x != 0 else 0
-    mant = x / mp.power(10, exp)
+def interval_sci_str(x: iv.mpf, prec: int = 18) -> str:
+    """
+    Convert iv.mpf to string in the form [1.234E+0001, 1.235E+0001], width=1.000E-0003
 
-    # round mantissa to desired digits
-    mant_str = mp.nstr(mant, n=prec + 1, strip_zeros=False)
+    The endpoints are read directly from the interval and rounded outward (the width upward),
+    so the printed interval still encloses the computed one. The width is subtracted exactly, so the output
+    does not depend on the working precision of the thread formatting it.
+    """
+    a, b = x._mpi_
+    width = mpf_sub(b, a, 0, round_ceiling)
+    return (f'[{_sci_raw(a, prec, "f")}, {_sci_raw(b, prec, "c")}], '
+            f'width={_sci_raw(width, prec, "c")}')
 
-    # format exponent padded to 4 digits with sign
-    exp_str = f"{int(exp):+05d}"
 
-    return f"{mant_str}E{exp_str}"
+def float_sci_str(x: float, prec: int = 16) -> str:
+    """
+    Convert a Python (or NumPy) float to string in the same form as ``sci_str()``, e.g. 1.234E+0001
+    """
+    mant_str, exp_str = f'{x:.{prec}e}'.split('e')
+    return f"{mant_str}E{int(exp_str):+05d}"
 
 
-def prettify(data: iv.mpf | mp.mpf | list) -> str:
+def prettify(data: iv.mpf | mp.mpf | float | list) -> str:
     if isinstance(data, mp.mpf):
-        output = sci_str(data)
-        return output
+        return sci_str(data)
+
+    elif isinstance(data, float):
+        return float_sci_str(data)
 
     elif isinstance(data, iv.mpf):
-        output = str(data)
-
-        outA, outB = output[1:-1].split(', ')
-        outA, outB = mp.mpf(outA), mp.mpf(outB)
-        outDiff = outB - outA
-        outA = sci_str(outA)
-        outB = sci_str(outB)
-        outDiff = sci_str(outDiff)
-        output = f'[{outA}, {outB}], width={outDiff}'
-
-        return output
-
-    elif isinstance(data, list) and \
-        (isinstance(data[0], mp.mpf) or
-         isinstance(data[0], iv.mpf)):
-        output = '[\n'
-        for val in data:
-            val = prettify(val)
-            if val.startswith('T'):
-                return 'Type error at utility.parsers.prettify():\n'+str(type(data))+' is an incorrect type.'
-
-            output += f' {val},\n'
-        output = output[:-2] + '\n]'
-        return output
+        return interval_sci_str(data)
+
+    elif isinstance(data, list) and data and isinstance(data[0], (mp.mpf, iv.mpf, float)):
+        item_type = type(data[0])
+        if not all(isinstance(val, item_type) for val in data):
+            return 'Type error at utility.parsers.prettify():\n'+str(type(data))+' is an incorrect type.'
+
+        if item_type is float:
+            format_item = float_sci_str
+        elif issubclass(item_type, iv.mpf):
+            format_item = interval_sci_str
+        else:
+            format_item = sci_str
+        return '[\n ' + ',\n '.join(map(format_item, data)) + '\n]'
 
     else: return 'Type error at utility.parsers.prettify():\n'+str(type(data))+' is an incorrect type.'
 
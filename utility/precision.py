@@ -0,0 +1,250 @@
+"""
+Working precision module holding the precision settings of both ``mpmath`` contexts.
+
+The real (``mp``) and interval (``iv``) contexts are always kept at the same precision, which is set
+in this module only. Besides the fixed default precision, the module provides an adaptive mode: a computation
+is first run at a cheap starting precision, and rerun at a doubled precision only while its result
+misses a user-set tolerance.
+
+    - Interval results are checked by their width (the largest one, for lists of results).
+    - Real results have no width, so their error is estimated as the largest difference between
+      the results of two consecutive precisions.
+
+The precision of the ``mpmath`` contexts is shared by all threads. `working_precision()` therefore changes it
+only while no other thread relies on it: threads parsing, fitting or evaluating in the background hold
+the current precision with `stable_precision()`, and a change waits for them (and holds off new ones) until
+the precision is restored.
+
+Functions
+---------
+
+    - ``set_precision(bits)``
+        Sets the precision of both ``mpmath`` contexts
+    - ``get_precision()``
+        Returns the current precision
+    - ``working_precision(bits, wait)``
+        Context manager temporarily changing the precision, exclusively
+    - ``stable_precision(wait)``
+        Context manager keeping the current precision unchanged by other threads
+    - ``error_estimate(result, previous)``
+        Estimates the error of a (possibly nested) result
+    - ``adaptive(compute, tolerance, start, max_prec, wait)``
+        Runs a computation at increasing precisions until its result meets the tolerance
+"""
+
+
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+from mpmath import iv, mp
+
+
+DEFAULT_PRECISION = 64
+
+# Starting and largest precision of the adaptive mode, in bits
+ADAPTIVE_START_PRECISION = 32
+ADAPTIVE_MAX_PRECISION = 4096
+
+
+AdaptiveResult = namedtuple('AdaptiveResult', ['result', 'precision', 'error', 'converged'])
+AdaptiveResult.__doc__ = """
+Outcome of `adaptive()`: the result, the precision (in bits) it was computed at, its error estimate
+and whether the estimate meets the tolerance.
+"""
+
+
+class _PrecisionLock:
+    """
+    Readers-writer lock of the precision. Any number of threads may rely on the current precision at once,
+    while changing it waits for all of them. Both sides are reentrant within a thread, and the thread changing
+    the precision may also rely on it.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+
+
+    def _wait(self, wait) -> None:
+        # Polls, so that the wait callback can stop waiting by raising
+        if not self._condition.wait(0.05) and wait is not None:
+            wait()
+
+
+    def acquire_shared(self, wait=None) -> None:
+        me = threading.get_ident()
+        with self._condition:
+            depth = getattr(self._local, 'depth', 0)
+            if depth or self._writer == me:
+                self._local.depth = depth + 1
+                return
+            while self._writer is not None or self._writers_waiting:
+                self._wait(wait)
+            self._readers += 1
+            self._local.depth = 1
+
+
+    def release_shared(self) -> None:
+        with self._condition:
+            self._local.depth -= 1
+            if self._local.depth == 0 and self._writer != threading.get_ident():
+                self._readers -= 1
+                self._condition.notify_all()
+
+
+    def acquire_exclusive(self, wait=None) -> None:
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if getattr(self._local, 'depth', 0):
+                raise RuntimeError('The precision cannot be changed by a thread relying on it.')
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._wait(wait)
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+
+    def release_exclusive(self) -> None:
+        with self._condition:
+            self._writer_depth -= 1
+            if self._writer_depth == 0:
+                self._writer = None
+                self._condition.notify_all()
+
+
+_lock = _PrecisionLock()
+
+
+def set_precision(bits: int) -> None:
+    mp.prec = bits
+    iv.prec = bits
+
+
+def get_precision() -> int:
+    return mp.prec
+
+
+@contextmanager
+def working_precision(bits: int, wait=None):
+    """
+    Temporarily set the precision of both ``mpmath`` contexts, restoring the previous one afterwards.
+
+    The change waits until no other thread is inside `stable_precision()`, and holds new ones off
+    until the previous precision is restored.
+
+    :param bits: Precision, in bits
+    :param wait: Optional callable, called repeatedly while waiting for other threads. It may raise
+        an exception to stop waiting.
+    """
+    _lock.acquire_exclusive(wait)
+    try:
+        previous = get_precision()
+        set_precision(bits)
+        try:
+            yield
+        finally:
+            set_precision(previous)
+    finally:
+        _lock.release_exclusive()
+
+
+@contextmanager
+def stable_precision(wait=None):
+    """
+    Keep the current precision from being changed by `working_precision()` in another thread, e.g. while
+    parsing or fitting in the background. Waits while another thread has the precision changed.
+
+    :param wait: Optional callable, called repeatedly while waiting. It may raise an exception to stop waiting.
+    :return: Context manager yielding the current precision, in bits
+    """
+    _lock.acquire_shared(wait)
+    try:
+        yield get_precision()
+    finally:
+        _lock.release_shared()
+
+
+def _flatten(result):
+    if isinstance(result, (list, tuple)):
+        for item in result:
+            yield from _flatten(item)
+    else:
+        yield result
+
+
+def error_estimate(result, previous=None) -> mp.mpf:
+    """
+    Estimate the error of a result, which may be a single value or a (nested) list or tuple of values.
+
+    :param result: ``iv.mpf`` or ``mp.mpf`` values
+    :param previous: The same result computed at a lower precision, only used for ``mp.mpf`` values
+    :return: The largest interval width, or the largest difference from ``previous`` for real values
+        (infinity if there is no previous result)
+    """
+
+    values = list(_flatten(result))
+    if values and isinstance(values[0], iv.mpf):
+        return max(mp.mpf(value.delta.b) for value in values)
+
+    if previous is None:
+        return mp.inf
+    return max(
+        abs(value - other)
+        for value, other in zip(values, _flatten(previous))
+    )
+
+
+def adaptive(compute,
+             tolerance,
+             start: int = ADAPTIVE_START_PRECISION,
+             max_prec: int = ADAPTIVE_MAX_PRECISION,
+             wait=None) -> AdaptiveResult:
+    """
+    Run a computation at increasing precisions until its error estimate meets the tolerance.
+
+    The computation is run inside `working_precision()`, so it has to parse its input itself, at the
+    current precision. The precision doubles after every miss, up to ``max_prec``. It also stops once
+    doubling the precision no longer at least halves the error estimate, as the error is then dominated
+    by the data itself (e.g. the widths of the input intervals) rather than by rounding.
+
+    :param compute: Callable without arguments returning the result
+    :param tolerance: Largest acceptable error estimate, see `error_estimate()`
+    :param start: Starting precision, in bits
+    :type start: int
+    :param max_prec: Largest precision tried, in bits
+    :type max_prec: int
+    :param wait: Optional callable, called repeatedly while other threads still rely on the current precision,
+        see `working_precision()`
+    :return: The last result with its precision and error estimate
+    """
+
+    tolerance = mp.mpf(tolerance)
+    bits = start
+    previous = None
+    previous_error = None
+    while True:
+        with working_precision(bits, wait):
+            result = compute()
+            error = error_estimate(result, previous)
+            converged = error <= tolerance
+            stalled = previous_error is not None and error > previous_error / 2
+
+        if converged or stalled or bits >= max_prec:
+            return AdaptiveResult(result, bits, error, converged)
+        previous = result
+        previous_error = error
+        bits = min(bits * 2, max_prec)
+
+
+set_precision(DEFAULT_PRECISION)
@@ -0,0 +1,189 @@
+"""
+Dense-grid sampling module evaluating the interpolation polynomial over a whole range for plotting.
+
+The polynomial is evaluated at every point of an evenly spaced grid (up to `MAX_POINTS` points) with the
+NumPy float64 second barycentric form (`utility.fastreal.evaluate_barycentric()`), using the float weights
+cached by the fitted `utility.algorithm.BarycentricInterpolant` (`BarycentricInterpolant.float_data()`),
+so a dense grid costs O(n) vectorized operations per point instead of O(n) ``mpmath`` operations.
+
+For the interval modes, the rigorous enclosure of the polynomial (the envelope) is evaluated with the
+vectorized `utility.intervalvector.IntervalVector` path of `BarycentricInterpolant.evaluate_many()`.
+As it still costs O(n) interval operations per point, it uses a coarser grid of at most `ENVELOPE_MAX_POINTS`
+points, which is about the resolution of a screen anyway.
+
+Before drawing, `decimate()` reduces any number of samples to the minimum and maximum of every pixel column,
+which keeps the drawn curve faithful (no spikes get lost) while the number of drawn points stays constant.
+
+Classes
+-------
+
+    - ``Samples``
+        Grid, curve values and optional envelope of a sampled polynomial
+
+Functions
+---------
+
+    - ``sample_interpolant(interpolant, start, stop, points, progress)``
+        Samples a fitted interpolant, with its envelope in the interval modes
+    - ``sample_fast_real(arr_x, arr_y, start, stop, points)``
+        Samples the polynomial through float64 nodes
+    - ``decimate(grid, lower, upper, start, stop, columns)``
+        Reduces samples to the extremes of every pixel column
+"""
+
+
+import numpy as np
+from mpmath import iv, mp
+from mpmath.libmp import to_float
+
+from utility import fastreal
+from utility.instrumentation import instrumented
+from utility.intervalvector import IntervalVector
+
+
+DEFAULT_POINTS = 10_000
+MAX_POINTS = 1_000_000
+
+# Largest grid of the interval envelope, evaluated in interval arithmetic
+ENVELOPE_MAX_POINTS = 2048
+
+
+class Samples:
+    """
+    Values of the polynomial on an evenly spaced grid, and optionally its interval envelope on a coarser grid.
+    """
+
+    __slots__ = ('start', 'stop', 'grid', 'values', 'envelope_grid', 'lower', 'upper')
+
+    def __init__(self, start: float, stop: float, grid: np.ndarray, values: np.ndarray,
+                 envelope_grid: np.ndarray = None, lower: np.ndarray = None, upper: np.ndarray = None):
+        """
+        Initialize a utility.sampling.Samples instance.
+
+        :param start: First point of the grid
+        :param stop: Last point of the grid
+        :param grid: Points of the grid
+        :param values: Values of the polynomial at the points of the grid
+        :param envelope_grid: Points of the envelope's grid, if there is an envelope
+        :param lower: Lower endpoints of the polynomial's enclosure at the points of the envelope's grid
+        :param upper: Upper endpoints of the polynomial's enclosure at the points of the envelope's grid
+        """
+
+        self.start = start
+        self.stop = stop
+        self.grid = grid
+        self.values = values
+        self.envelope_grid = envelope_grid
+        self.lower = lower
+        self.upper = upper
+
+
+    @property
+    def has_envelope(self) -> bool:
+        return self.envelope_grid is not None
+
+
+def _grid(start: float, stop: float, points: int) -> np.ndarray:
+    if not 2 <= points <= MAX_POINTS:
+        raise ValueError(f'The number of grid points must be between 2 and {MAX_POINTS}.')
+    if not start < stop:
+        raise ValueError('The start of the range must be smaller than its end.')
+    return np.linspace(start, stop, points)
+
+
+def _float_bounds(raws: list) -> tuple:
+    """
+    Returns float64 arrays bounding a list of raw ``mpmath.libmp`` values from below and from above.
+
+    The mantissas are cut to 53 bits and scaled by their exponents all at once, which is at most one float off
+    (also when the values overflow or underflow), so the results are moved one float outward.
+    """
+    signs, mantissas, exponents, bitcounts = zip(*raws)
+    bitcounts = np.array(bitcounts, dtype=np.int64)
+    shifts = np.maximum(bitcounts - 53, 0)
+    top = (np.array(mantissas, dtype=object) >> shifts).astype(np.float64)
+    # Beyond these exponents, a mantissa of at most 53 bits overflows or underflows anyway
+    exponents = np.clip(np.array(exponents, dtype=np.int64) + shifts, -1200, 1100)
+    with np.errstate(over='ignore', under='ignore'):
+        values = np.ldexp(np.where(np.array(signs, dtype=bool), -top, top), exponents)
+
+    # Infinities and NaN have negative bit counts (and no mantissa)
+    for k in np.flatnonzero(bitcounts < 0):
+        values[k] = to_float(raws[k])
+    return np.nextafter(values, -np.inf), np.nextafter(values, np.inf)
+
+
+@instrumented()
+def sample_interpolant(interpolant, start: float, stop: float, points: int = DEFAULT_POINTS,
+                       progress=None) -> Samples:
+    """
+    Sample a fitted interpolant on an evenly spaced grid.
+
+    :param interpolant: Fitted `utility.algorithm.BarycentricInterpolant`
+    :param start: First point of the grid
+    :param stop: Last point of the grid
+    :param points: Number of points of the grid
+    :param progress: Optional progress callback of the envelope's evaluation
+    :return: Samples, with the envelope if the interpolant works on intervals
+    """
+
+    grid = _grid(start, stop, points)
+    arr_x, weights, arr_y = (np.array(data) for data in interpolant.float_data())
+    values = fastreal.evaluate_barycentric(arr_x, weights, arr_y, grid)
+
+    if interpolant.dtype is not iv.mpf:
+        return Samples(start, stop, grid, values)
+
+    envelope_grid = _grid(start, stop, min(points, ENVELOPE_MAX_POINTS))
+    # The float grid points are exact binary numbers, so they become degenerate intervals
+    enclosure = interpolant.evaluate_many(IntervalVector.from_intervals(envelope_grid), progress=progress)
+    lower = _float_bounds(enclosure.lower)[0]
+    upper = _float_bounds(enclosure.upper)[1]
+    return Samples(start, stop, grid, values, envelope_grid, lower, upper)
+
+
+@instrumented()
+def sample_fast_real(arr_x: np.ndarray, arr_y: np.ndarray, start: float, stop: float,
+                     points: int = DEFAULT_POINTS) -> Samples:
+    """
+    Sample the polynomial through float64 nodes on an evenly spaced grid.
+
+    :param arr_x: Interpolation nodes
+    :param arr_y: Values at the nodes
+    :param start: First point of the grid
+    :param stop: Last point of the grid
+    :param points: Number of points of the grid
+    :return: Samples, without an envelope
+    """
+
+    grid = _grid(start, stop, points)
+    weights = fastreal.barycentric_weights(arr_x)
+    return Samples(start, stop, grid, fastreal.evaluate_barycentric(arr_x, weights, arr_y, grid))
+
+
+def decimate(grid: np.ndarray, lower: np.ndarray, upper: np.ndarray, start: float, stop: float,
+             columns: int) -> tuple:
+    """
+    Reduce samples to the smallest lower and the largest upper value within every pixel column.
+
+    For a plain curve, pass its values as both ``lower`` and ``upper``. NaN values are ignored.
+
+    :param grid: Sorted points of the samples
+    :param lower: Lower values at the points
+    :param upper: Upper values at the points
+    :param start: Value of the grid at the left edge of the first column
+    :param stop: Value of the grid at the right edge of the last column
+    :param columns: Number of pixel columns
+    :return: Tuple of the indices of the non-empty columns, and the minima and maxima within them
+    """
+
+    column = ((grid - start) * (columns / (stop - start))).astype(np.int64)
+    np.clip(column, 0, columns - 1, out=column)
+
+    # The grid is sorted, so every column is a contiguous run of samples
+    firsts = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+    return (
+        column[firsts],
+        np.fmin.reduceat(lower, firsts),
+        np.fmax.reduceat(upper, firsts)
+    )
@@ -0,0 +1,193 @@
+"""
+Startup module keeping the numeric stack (NumPy, ``mpmath`` and the modules built on them) out of the GUI's
+cold start.
+
+Importing NumPy and ``mpmath`` takes most of the time before the window can be shown. The GUI modules
+therefore refer to the numeric modules through `LazyModule` proxies, which import their module on the first
+attribute access, and the App imports them in a background thread with `preload()` once its window is shown.
+A numeric module needed before the preload is done is simply imported right away (or waited for, if
+the preload is importing it at that moment).
+
+Running ``python main.py --profile-startup`` records the time of every import (`ImportProfiler`) and of the
+startup phases, and prints a `report()` of where the cold start went once the window is shown and the numeric
+stack is loaded.
+
+Classes
+-------
+
+    - ``LazyModule(name)``
+        Proxy of a module imported on first attribute access
+    - ``ImportProfiler()``
+        Records the time spent importing every module
+
+Functions
+---------
+
+    - ``preload(names, on_done)``
+        Imports modules in a background thread
+    - ``report(profiler, phases, limit)``
+        Formats the startup phases and the slowest imports
+"""
+
+
+import builtins
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+
+
+# Modules the GUI preloads in the background once its window is shown
+NUMERIC_MODULES = (
+    'numpy',
+    'mpmath',
+    'utility.parsers',
+    'utility.algorithm',
+    'utility.fastreal',
+    'utility.validation',
+    'utility.cache',
+    'utility.instrumentation',
+    'utility.floatinterval',
+    'utility.datafile',
+    'utility.columnfile',
+    'utility.sampling',
+)
+
+
+class LazyModule:
+    """
+    Proxy of a module, imported on the first access to any of its attributes.
+
+    Importing goes through the regular import system, so it is thread-safe, and a module already imported
+    elsewhere is just looked up.
+    """
+
+    __slots__ = ('_name', '_module')
+
+    def __init__(self, name: str):
+        """
+        Initialize a utility.startup.LazyModule instance.
+
+        :param name: Absolute name of the module, e.g. ``'utility.algorithm'``
+        """
+
+        self._name = name
+        self._module = None
+
+
+    def __getattr__(self, attribute: str):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attribute)
+
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f'<lazy module {self._name!r} ({state})>'
+
+
+def preload(names=NUMERIC_MODULES, on_done=None) -> threading.Thread:
+    """
+    Import the given modules in a background thread.
+
+    :param names: Absolute names of the modules
+    :param on_done: Optional callable, called from the background thread once all modules are imported
+    :return: The started thread
+    """
+
+    def run():
+        for name in names:
+            # Through __import__ rather than importlib, so that an active ImportProfiler records the module
+            __import__(name)
+        if on_done is not None:
+            on_done()
+
+    thread = threading.Thread(target=run, name='preload', daemon=True)
+    thread.start()
+    return thread
+
+
+class ImportProfiler:
+    """
+    Records the time spent importing every module while active, like ``python -X importtime``.
+
+    Used as a context manager, it wraps ``builtins.__import__``. Every import of a module that is not imported
+    yet is recorded with its cumulative time (including the modules it imports) and its self time. Modules
+    imported through ``importlib.import_module()`` or as submodules in ``from package import module``
+    count towards the module importing them.
+    """
+
+    def __init__(self):
+        """
+        Initialize a utility.startup.ImportProfiler instance.
+        """
+
+        self.records = []
+        self._local = threading.local()
+        self._original_import = None
+
+
+    def __enter__(self) -> 'ImportProfiler':
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        builtins.__import__ = self._original_import
+
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if level:
+            package = (globals or {}).get('__package__') or ''
+            try:
+                module_name = importlib.util.resolve_name('.' * level + name, package)
+            except (ImportError, ValueError):
+                module_name = name
+        else:
+            module_name = name
+        if module_name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        depth = len(stack)
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self.records.append((module_name, elapsed - children, elapsed, depth,
+                                 threading.current_thread().name))
+
+
+def report(profiler: ImportProfiler, phases: list, limit: int = 15) -> str:
+    """
+    Format the startup phases and the slowest imports.
+
+    :param profiler: The profiler active during the startup
+    :param phases: List of ``(label, seconds)`` pairs, the time of every phase since the start of the process
+    :param limit: Number of imports listed in each table
+    :return: Report text
+    """
+
+    lines = ['Startup phases (seconds since start):']
+    lines += [f'  {seconds:8.3f}  {label}' for label, seconds in phases]
+
+    top_level = [record for record in profiler.records if record[3] == 0]
+    lines.append(f'Slowest top-level imports (cumulative, of {len(top_level)}):')
+    for name, _, cumulative, _, thread in sorted(top_level, key=lambda record: -record[2])[:limit]:
+        lines.append(f'  {cumulative:8.3f}  {name} [{thread}]')
+
+    lines.append(f'Slowest modules (self time, of {len(profiler.records)}):')
+    for name, self_time, _, _, thread in sorted(profiler.records, key=lambda record: -record[1])[:limit]:
+        lines.append(f'  {self_time:8.3f}  {name} [{thread}]')
+    return '\n'.join(lines)
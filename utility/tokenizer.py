@@ -0,0 +1,159 @@
+"""
+Streaming tokenizer module converting numeric array strings into numbers in a single pass.
+
+The tokenizer walks the input string once, matching one whole item (a number, or an interval) with its
+trailing separator at a time, and yields the converted values lazily. No intermediate copies of the input
+and no lists of substrings are created, which keeps memory usage flat for multi-megabyte inputs.
+Whitespace (including newlines) is allowed anywhere between tokens.
+
+Errors are reported with a `ParseError`, which holds the offset, line and column of the offending character.
+
+Functions
+---------
+
+    - ``iter_number_strings(s)``
+        Yields the numbers of a comma-separated numeric array string as substrings
+    - ``iter_real(s)``
+        Yields the numbers of a comma-separated numeric array string as ``mp.mpf`` values
+    - ``iter_interval(s)``
+        Yields the intervals of a numeric interval array string as ``iv.mpf`` values
+"""
+
+
+import re
+
+from mpmath import iv, mp
+
+
+_NUMBER = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+
+# A whole item with its trailing separator (or the end of the input), matched in one step
+_REAL_ITEM = re.compile(rf'\s*({_NUMBER})\s*(?:,|\Z)')
+_INTERVAL_ITEM = re.compile(rf'\s*(\[)?\s*({_NUMBER})\s*[;,]\s*({_NUMBER})\s*(\])?\s*(?:,|\Z)')
+
+# Single tokens, only used to pinpoint errors
+_WHITESPACE = re.compile(r'\s*')
+_NUMBER_TOKEN = re.compile(_NUMBER)
+
+
+class ParseError(ValueError):
+    """
+    Raised when a numeric array string is not correctly formatted.
+
+    :ivar offset: Index of the offending character in the input string
+    :ivar line: Line number of the offending character, counted from 1
+    :ivar column: Column of the offending character, counted from 1
+    """
+
+    def __init__(self, message: str, text: str, offset: int):
+        self.message = message
+        self.offset = offset
+        self.line = text.count('\n', 0, offset) + 1
+        self.column = offset - (text.rfind('\n', 0, offset) + 1) + 1
+        found = repr(text[offset]) if offset < len(text) else 'end of input'
+        super().__init__(
+            f'{message}, found {found} at line {self.line}, column {self.column} (offset {offset})'
+        )
+
+
+def _skip_whitespace(s: str, pos: int) -> int:
+    return _WHITESPACE.match(s, pos).end()
+
+
+def _expect_number(s: str, pos: int) -> int:
+    pos = _skip_whitespace(s, pos)
+    match = _NUMBER_TOKEN.match(s, pos)
+    if match is None:
+        raise ParseError('Expected a number', s, pos)
+    return match.end()
+
+
+def _expect(s: str, pos: int, symbols: str, message: str) -> int:
+    pos = _skip_whitespace(s, pos)
+    if pos >= len(s) or s[pos] not in symbols:
+        raise ParseError(message, s, pos)
+    return pos + 1
+
+
+def _real_error(s: str, pos: int) -> ParseError:
+    """
+    Find the exact position of the error in a real item starting at ``pos``.
+    """
+    pos = _expect_number(s, pos)
+    pos = _skip_whitespace(s, pos)
+    return ParseError('Expected \',\'', s, pos)
+
+
+def _interval_error(s: str, pos: int) -> ParseError:
+    """
+    Find the exact position of the error in an interval item starting at ``pos``.
+    """
+    pos = _skip_whitespace(s, pos)
+    bracket = pos < len(s) and s[pos] == '['
+    if bracket:
+        pos += 1
+    pos = _expect_number(s, pos)
+    pos = _expect(s, pos, ';,', 'Expected \';\' or \',\' between interval endpoints')
+    pos = _expect_number(s, pos)
+    if bracket:
+        pos = _expect(s, pos, ']', 'Expected \']\'')
+    pos = _skip_whitespace(s, pos)
+    if pos < len(s) and s[pos] == ']':
+        return ParseError('Unmatched \']\'', s, pos)
+    return ParseError('Expected \',\'', s, pos)
+
+
+def iter_number_strings(s: str):
+    """
+    Lazily yield the numbers of a comma-separated numeric array string, as substrings of ``s``.
+
+    :param s: Numeric array string, e.g. ``'0,\\n1,2, 3'``
+    :raises ParseError: If the string is not correctly formatted.
+    :return: Generator of strings
+    """
+    pos = 0
+    while True:
+        match = _REAL_ITEM.match(s, pos)
+        if match is None:
+            raise _real_error(s, pos)
+        yield match.group(1)
+        pos = match.end()
+        # The item ended at the end of the input rather than at a separator
+        if s[pos - 1] != ',':
+            return
+
+
+def iter_real(s: str):
+    """
+    Lazily yield the numbers of a comma-separated numeric array string as ``mp.mpf`` values.
+
+    :param s: Numeric array string, e.g. ``'0,\\n1,2, 3'``
+    :raises ParseError: If the string is not correctly formatted.
+    :return: Generator of ``mp.mpf``
+    """
+    for number in iter_number_strings(s):
+        yield mp.mpf(number)
+
+
+def iter_interval(s: str):
+    """
+    Lazily yield the intervals of a numeric interval array string as ``iv.mpf`` values.
+
+    Every interval consists of two endpoints separated by ``';'`` or ``','``, optionally enclosed in
+    square brackets. Endpoints may be given in any order.
+
+    :param s: Numeric interval array string, e.g. ``'[0;1],\\n[2.34; 5], [6.7, 8]'``
+    :raises ParseError: If the string is not correctly formatted.
+    :return: Generator of ``iv.mpf``
+    """
+    pos = 0
+    while True:
+        match = _INTERVAL_ITEM.match(s, pos)
+        if match is None or (match.group(1) is None) != (match.group(4) is None):
+            raise _interval_error(s, pos)
+        a, b = mp.mpf(match.group(2)), mp.mpf(match.group(3))
+        yield iv.mpf([min(a, b), max(a, b)])
+        pos = match.end()
+        # The item ended at the end of the input rather than at a separator
+        if s[pos - 1] != ',':
+            return
@@ -0,0 +1,245 @@
+"""
+Dataset validation module shared by the GUI and the headless batch mode.
+
+This module checks parsed datasets for the conditions the interpolation algorithms rely on, before any
+of the algorithms is run. Every check returns a human-readable error message ready for the output widget
+(or the batch output), or ``None`` if the dataset is valid.
+
+The X values are sorted once, so the checks of the nodes cost O(n log n) next to the O(n^2) algorithms:
+
+    - Duplicate real nodes, and interval nodes that overlap (their difference contains zero, which makes
+      every result infinitely wide only after the whole computation), are rejected.
+    - Nodes much closer to each other than the rest of the dataset (or than their own widths, for interval
+      nodes) are only warned about, since they make the results inaccurate or wide, but still finite.
+
+The nodes can also be reordered before the computation. The interpolating polynomial does not depend on
+the order of the nodes, but the widening of interval results (and the rounding of real results) does:
+
+    - ``'input'`` keeps the order of the entry field,
+    - ``'sorted'`` sorts the nodes in ascending order, so every column of Neville's tableau combines
+      neighbouring nodes only, which keeps its interval results by far the narrowest,
+    - ``'leja'`` uses the Leja ordering, every next node being the one farthest from the nodes before it
+      (maximizing the product of the distances to them), which keeps the partial products of the
+      coefficients small and their intervals somewhat narrower.
+
+Functions
+---------
+
+    - ``validate_dataset(data_x, data_y, data_z, warnings)``
+        Checks sizes of the parsed X, Y and Z data and looks for duplicate or overlapping X values.
+    - ``check_nodes(data_x)``
+        Looks for duplicate, overlapping and too close X values with a single sort.
+    - ``sorted_order(data_x)``
+        Returns the indices of the X values in ascending order
+    - ``leja_order(data_x)``
+        Returns the indices of the X values in Leja order
+    - ``node_order(data_x, order)``
+        Returns the indices of the X values in the requested order
+    - ``reorder(values, indices)``
+        Returns the values rearranged by the given indices
+"""
+
+
+import numpy as np
+from mpmath import iv, mp
+
+
+NODE_ORDERS = ('input', 'sorted', 'leja')
+
+# Number of offending node pairs listed in a warning
+MAX_REPORTED_PAIRS = 5
+
+
+def _is_interval(data_x) -> bool:
+    return len(data_x) > 0 and isinstance(data_x[0], iv.mpf)
+
+
+def _bounds(x) -> tuple:
+    """
+    Returns the endpoints of an interval node as exact ``mp.mpf`` values.
+    """
+    lower, upper = x._mpi_
+    return mp.make_mpf(lower), mp.make_mpf(upper)
+
+
+def _midpoints(data_x) -> np.ndarray:
+    """
+    Returns the X values (midpoints of interval nodes) as float64, for the ordering heuristics.
+    """
+    if _is_interval(data_x):
+        return np.array([float((lower + upper) / 2) for lower, upper in map(_bounds, data_x)])
+    return np.array([float(x) for x in data_x], dtype=np.float64)
+
+
+def sorted_order(data_x) -> list:
+    """
+    Returns the indices of the X values in ascending order, interval nodes sorted by their lower endpoints.
+
+    :param data_x: Parsed X values
+    :return: List of indices
+    """
+
+    if isinstance(data_x, np.ndarray):
+        return data_x.argsort(kind='stable').tolist()
+    if _is_interval(data_x):
+        lower = [_bounds(x)[0] for x in data_x]
+        return sorted(range(len(data_x)), key=lower.__getitem__)
+    return sorted(range(len(data_x)), key=data_x.__getitem__)
+
+
+def check_nodes(data_x) -> tuple:
+    """
+    Look for duplicate, overlapping and too close X values.
+
+    The nodes are sorted once. Sorted by their lower endpoints, any two overlapping intervals imply
+    an overlap of two neighbours, so only neighbours need to be compared.
+
+        - Real nodes closer than ``2^(-precision/2)`` times the span of the dataset (``2^-26`` for float64)
+          are too close.
+        - Interval nodes closer than the sum of their widths are too close, the difference of such nodes
+          is wider than its own magnitude.
+
+    :param data_x: Parsed X values
+    :return: Tuple of the error message (or ``None``) and the list of warning messages
+    """
+
+    order = sorted_order(data_x)
+    close = []
+
+    if _is_interval(data_x):
+        bounds = [_bounds(data_x[k]) for k in order]
+        for k in range(len(order) - 1):
+            i, j = order[k], order[k + 1]
+            (lower_i, upper_i), (lower_j, upper_j) = bounds[k], bounds[k + 1]
+            # [Error] Overlapping interval nodes
+            if upper_i >= lower_j:
+                return (f'The X intervals #{i + 1} and #{j + 1} overlap, so their difference contains zero '
+                        'and the results would be infinitely wide.'), []
+            if lower_j - upper_i < (upper_i - lower_i) + (upper_j - lower_j):
+                close.append((i, j))
+        reason = 'closer to each other than the sum of their widths, expect wide results'
+
+    elif isinstance(data_x, np.ndarray):
+        values = data_x[order]
+        gaps = np.diff(values)
+        # [Error] X dataset contains duplicates
+        if (gaps == 0).any():
+            return 'The X values contain duplicates, which is forbidden.', []
+        if len(values) > 2:
+            threshold = (values[-1] - values[0]) * 2.0 ** -26
+            close = [(order[k], order[k + 1]) for k in np.flatnonzero(gaps < threshold)]
+        reason = 'much closer to each other than the rest of the nodes, expect inaccurate results'
+
+    else:
+        values = [data_x[k] for k in order]
+        # [Error] X dataset contains duplicates
+        for k in range(len(values) - 1):
+            if values[k] == values[k + 1]:
+                return 'The X values contain duplicates, which is forbidden.', []
+        if len(values) > 2:
+            threshold = (values[-1] - values[0]) * mp.ldexp(1, -(mp.prec // 2))
+            for k in range(len(values) - 1):
+                if values[k + 1] - values[k] < threshold:
+                    close.append((order[k], order[k + 1]))
+        reason = 'much closer to each other than the rest of the nodes, expect inaccurate results'
+
+    warnings = []
+    if close:
+        pairs = ', '.join(f'#{i + 1} and #{j + 1}' for i, j in close[:MAX_REPORTED_PAIRS])
+        more = f' (and {len(close) - MAX_REPORTED_PAIRS} more)' if len(close) > MAX_REPORTED_PAIRS else ''
+        warnings.append(f'Warning: the X values {pairs}{more} are {reason}.')
+    return None, warnings
+
+
+def validate_dataset(data_x, data_y, data_z, warnings: list = None) -> str | None:
+    """
+    Validate parsed X, Y and Z data.
+
+    :param data_x: Parsed X values
+    :param data_y: Parsed Y values
+    :param data_z: Parsed new points' x values
+    :param warnings: List the warnings about too close X values are appended to, not collected if not given
+    :return: Error message, or ``None`` if the dataset is valid
+    """
+
+    # [Error] Dataset sizes mismatch
+    if len(data_x) != len(data_y):
+        return ('The number of X values does not match that of the Y values.\n'
+                f'x.size() = {len(data_x)}, y.size() = {len(data_y)}')
+
+    # [Error] Empty dataset
+    if len(data_x) == 0 or len(data_z) == 0:
+        return 'The X values and new points must not be empty.'
+
+    # [Error] X dataset contains duplicates or overlapping intervals
+    error, node_warnings = check_nodes(data_x)
+    if error is not None:
+        return error
+    if warnings is not None:
+        warnings.extend(node_warnings)
+
+    return None
+
+
+def leja_order(data_x) -> list:
+    """
+    Returns the indices of the X values in Leja order.
+
+    The first node is the one farthest from the center of the dataset, every next node maximizes
+    the product of its distances to the nodes already chosen. The products are accumulated as sums
+    of logarithms of the (midpoint) distances in float64, which takes O(n^2) vectorized operations.
+
+    :param data_x: Parsed X values, without duplicates
+    :return: List of indices
+    """
+
+    points = _midpoints(data_x)
+    n = len(points)
+    if n == 0:
+        return []
+
+    center = (points.max() + points.min()) / 2
+    scores = np.zeros(n)
+    remaining = np.ones(n, dtype=bool)
+    current = int(np.argmax(np.abs(points - center)))
+    order = [current]
+    with np.errstate(divide='ignore'):
+        for _ in range(n - 1):
+            remaining[current] = False
+            scores += np.log(np.abs(points - points[current]))
+            current = int(np.argmax(np.where(remaining, scores, -np.inf)))
+            order.append(current)
+    return order
+
+
+def node_order(data_x, order: str = 'input') -> list | None:
+    """
+    Returns the indices of the X values in the requested order.
+
+    :param data_x: Parsed and validated X values
+    :param order: One of `NODE_ORDERS`
+    :return: List of indices, or ``None`` for the order of the input
+    """
+
+    if order == 'input':
+        return None
+    if order == 'sorted':
+        return sorted_order(data_x)
+    if order == 'leja':
+        return leja_order(data_x)
+    raise ValueError(f'Incorrect node order: {order}')
+
+
+def reorder(values, indices: list | None):
+    """
+    Returns the values rearranged by the given indices, see `node_order()`.
+
+    :param values: List or NumPy array of values
+    :param indices: List of indices, or ``None`` to keep the values as they are
+    """
+
+    if indices is None:
+        return values
+    if isinstance(values, np.ndarray):
+        return values[indices]
+    return [values[k] for k in indices]